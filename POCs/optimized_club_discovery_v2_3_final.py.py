@@ -16,16 +16,34 @@ Autor: AI Assistant
 Datum: Oktober 2025
 """
 
+import argparse
 import requests
+import gzip
 import json
+import os
 import time
 import re
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from collections import defaultdict
+import mmap
+import sqlite3
+import struct
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import Counter, defaultdict
+from collections.abc import Mapping
 from datetime import datetime
+import multiprocessing
 import threading
+import unicodedata
+from itertools import chain
+
+try:
+    import pyarrow as pa  # Optional: pip install pyarrow (Parquet-Export)
+    import pyarrow.dataset as pa_dataset
+except ImportError:
+    pa = None
+    pa_dataset = None
 
 @dataclass
 class TeamVariation:
@@ -57,11 +75,1406 @@ class LigaInfo:
     spielklasse: str
     ebene_name: str
     teams: List[Dict] = None
+    actual_match_day: Optional[int] = None  # actualMatchDay.spieltag aus der Liga-Liste (falls geliefert)
+
+# Snapshot der Verbände und Ligen (ändert sich innerhalb einer Saison kaum)
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = "club_discovery_snapshot.json"
+SNAPSHOT_MAX_AGE = 7 * 24 * 3600  # Sekunden, danach Refresh im Hintergrund
+
+# Crawl-Zustand pro Liga für inkrementelle Re-Crawls
+DEFAULT_CRAWL_STATE_PATH = "club_discovery_state.json"
+LIGA_STATE_MAX_AGE = 7 * 24 * 3600  # Sekunden, danach Tabelle auch ohne neue Spiele neu laden
+LIGA_PENDING_MAX_AGE = 24 * 3600  # Sekunden, danach Spielplan mit offenen Spielen neu prüfen (Vorverlegungen)
+
+# Arbeits-Journal für unterbrechbare (landesweite) Crawls
+JOURNAL_VERSION = 1
+DEFAULT_JOURNAL_PATH = "club_discovery_journal.ndjson"
+JOURNAL_FSYNC_EVERY = 50  # Einträge, danach fsync (Schutz auch gegen System-Absturz)
+PROGRESS_INTERVAL = 2.0  # Sekunden zwischen Fortschritts-Ausgaben
+
+# Höflichkeits-Limit gegenüber basketball-bund.net (gilt global über alle Prozesse)
+DEFAULT_REQUEST_RATE = 10.0  # Requests pro Sekunde
+SHARD_LIGA_CHUNK = 8  # Ligen pro Tabellen-Auftrag im Shard-Modus
+
+# Lokaler SQLite-Store (normalisiert, für Abfragen ohne Re-Crawl)
+DEFAULT_STORE_PATH = "club_discovery.sqlite"
+STORE_SCHEMA_VERSION = 1
+
+# Spaltenorientierter Export (Parquet, partitioniert nach season/verband_id)
+DEFAULT_PARQUET_DIR = "club_discovery_parquet"
+
+# Club-Namen-Ableitung aus Team-Namen
+TEAM_GENDER_SUFFIXES = [
+    ' Damen', ' Herren', ' Ladies', ' Men',
+    ' damen', ' herren', ' ladies', ' men'
+]
+CLUB_NAME_CACHE_SIZE = 50000  # Team-Namen im Memo-Cache
+
+# Fuzzy-Suche über Club- und Team-Namen
+SEARCH_MIN_SCORE = 0.5  # Anteil der Query-Trigramme, die ein Name enthalten muss
+SEARCH_LIMIT = 10
+
+# Binärer, memory-mappbarer Club-Index (Lookup nach ID, Verband, Bezirk)
+DEFAULT_CLUB_INDEX_PATH = "club_directory.idx"
+CLUB_INDEX_MAGIC = b'BBCLUBX1'
+CLUB_INDEX_HEADER = struct.Struct('<8sIIIIIIIIIIII')
+CLUBS_CHUNKS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'basketball-app', 'src', 'shared', 'data', 'clubs-chunks'
+)
+
+# Club-Analyse: Abschnitte (Default-Umfang in Ausgabe-Reihenfolge) und Zusatz-Abschnitte
+ANALYSIS_SECTIONS = (
+    'club_id', 'club_name', 'total_teams', 'total_ligen', 'team_variations',
+    'ligen_by_category', 'teams_detailed', 'geographic_distribution', 'best_teams'
+)
+EXTRA_ANALYSIS_SECTIONS = ('tabellen',)  # Tabellenplätze aller Teams, ohne Spielplan
+SPIELPLAN_SECTIONS = frozenset({'teams_detailed'})  # nur diese brauchen Spielpläne
+
+# Mitgelieferte Referenz-Antwort von /rest/wam/data (Fallback für die Verbände)
+REFERENCE_WAM_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'basketball-bund-api', 'wam-data.json'
+)
+
+
+def current_season(now: Optional[datetime] = None) -> int:
+    """Saison-Jahr (Saison 2025/2026 -> 2025), Saisonwechsel im August"""
+    now = now or datetime.now()
+    return now.year if now.month >= 8 else now.year - 1
+
+
+def extract_verbaende(response: Optional[Dict]) -> Optional[List[Dict]]:
+    """Verbände aus einer /rest/wam/data Antwort (mit oder ohne 'data'-Hülle)"""
+    if not response:
+        return None
+    if 'verbaende' in response:
+        return response['verbaende']
+    data = response.get('data')
+    if isinstance(data, dict) and 'verbaende' in data:
+        return data['verbaende']
+    return None
+
+
+class DiscoverySnapshot:
+    """
+    Versionierter Snapshot von Verbänden und Liga-Index pro Saison
+
+    Dateiformat (JSON):
+        {
+          "snapshot_version": 1,
+          "base_url": "...",
+          "seasons": {
+            "2025": {
+              "verbaende": [...], "verbaende_fetched_at": <epoch>,
+              "ligen": {"<verband_id>": [<LigaInfo ohne teams>, ...]},
+              "ligen_fetched_at": {"<verband_id>": <epoch>}
+            }
+          }
+        }
+
+    Einträge älter als max_age gelten als veraltet, werden aber trotzdem
+    geliefert - der Refresh passiert im Hintergrund.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, base_url: str = "", max_age: float = SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.base_url = base_url
+        self.max_age = max_age
+        self.lock = threading.RLock()
+        self.data = {'snapshot_version': SNAPSHOT_VERSION, 'base_url': base_url, 'seasons': {}}
+        self.load()
+
+    def load(self) -> bool:
+        """Lädt den Snapshot; inkompatible oder fremde Snapshots werden ignoriert"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('snapshot_version') != SNAPSHOT_VERSION or data.get('base_url') != self.base_url:
+            return False
+
+        with self.lock:
+            self.data = data
+        return True
+
+    def save(self):
+        """Schreibt den Snapshot atomar (tmp-Datei + rename)"""
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+
+    def _season(self, season: int) -> Dict:
+        return self.data['seasons'].setdefault(str(season), {
+            'verbaende': None, 'verbaende_fetched_at': 0, 'ligen': {}, 'ligen_fetched_at': {}
+        })
+
+    def get_verbaende(self, season: int) -> Optional[List[Dict]]:
+        with self.lock:
+            return self._season(season)['verbaende']
+
+    def put_verbaende(self, season: int, verbaende: List[Dict]):
+        with self.lock:
+            entry = self._season(season)
+            entry['verbaende'] = verbaende
+            entry['verbaende_fetched_at'] = time.time()
+
+    def get_ligen(self, season: int, verband_id: int) -> Optional[List[LigaInfo]]:
+        with self.lock:
+            ligen = self._season(season)['ligen'].get(str(verband_id))
+        if ligen is None:
+            return None
+        return [LigaInfo(**liga) for liga in ligen]
+
+    def put_ligen(self, season: int, verband_id: int, ligen: List[LigaInfo]):
+        with self.lock:
+            entry = self._season(season)
+            entry['ligen'][str(verband_id)] = [
+                {key: value for key, value in asdict(liga).items() if key != 'teams'} for liga in ligen
+            ]
+            entry['ligen_fetched_at'][str(verband_id)] = time.time()
+
+    def is_stale(self, season: int, verband_id: Optional[int] = None) -> bool:
+        """Prüft ob Verbände (verband_id=None) bzw. die Ligen eines Verbands veraltet sind"""
+        with self.lock:
+            entry = self._season(season)
+            if verband_id is None:
+                fetched_at = entry['verbaende_fetched_at']
+            else:
+                fetched_at = entry['ligen_fetched_at'].get(str(verband_id), 0)
+        return time.time() - fetched_at > self.max_age
+
+
+def pending_kickoff_dates(spielplan: Optional[Dict]) -> List[str]:
+    """Anstoß-Daten (YYYY-MM-DD) aller noch nicht gewerteten, nicht abgesagten Spiele"""
+    if not spielplan:
+        return []
+    matches = spielplan.get('matches') or spielplan.get('games') or []
+    return sorted({
+        match['kickoffDate'] for match in matches
+        if match.get('kickoffDate') and not match.get('result') and not match.get('abgesagt')
+    })
+
+
+class LigaCrawlState:
+    """
+    Persistenter Crawl-Zustand pro Liga und Saison
+
+    Pro Liga: Zeitpunkt des letzten Tabellen-Abrufs, actualMatchDay, die Teams
+    der Tabelle und die Anstoß-Daten der noch offenen Spiele (aus dem Spielplan).
+    Eine Liga muss nur neu geladen werden, wenn seit dem letzten Abruf ein
+    offenes Spiel angestanden hat (gespielt oder verlegt), die Liga-Liste einen
+    neueren Spieltag meldet oder der Zustand älter als max_age ist. Ein auf einen
+    früheren Termin vorverlegtes Spiel ist erst im neuen Spielplan sichtbar -
+    Ligen mit offenen Spielen werden deshalb spätestens nach pending_max_age
+    erneut geprüft.
+
+    Läufe ohne Spielplan-Abrufe (nur Tabellen) und Ligen ohne bekannte
+    Anstoß-Daten nutzen eine reine Tabellen-Regel: neu laden, wenn die
+    Liga-Liste einen neueren Spieltag meldet, seit dem letzten Abruf ein
+    bekanntes offenes Spiel angestanden hat oder der Zustand älter als max_age
+    ist. Die Anstoß-Daten kommen beim nächsten Refresh der Liga oder aus jedem
+    ohnehin geladenen Spielplan (z.B. einer Analyse) hinzu.
+    """
+
+    def __init__(self, path: str = DEFAULT_CRAWL_STATE_PATH, base_url: str = "", max_age: float = LIGA_STATE_MAX_AGE,
+                 pending_max_age: float = LIGA_PENDING_MAX_AGE):
+        self.path = path
+        self.base_url = base_url
+        self.max_age = max_age
+        self.pending_max_age = pending_max_age
+        self.lock = threading.RLock()
+        self.data = {'snapshot_version': SNAPSHOT_VERSION, 'base_url': base_url, 'seasons': {}}
+        self.load()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('snapshot_version') != SNAPSHOT_VERSION or data.get('base_url') != self.base_url:
+            return False
+
+        with self.lock:
+            self.data = data
+        return True
+
+    def save(self):
+        """Schreibt den Zustand atomar (tmp-Datei + rename)"""
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+
+    def _liga(self, season: int, liga_id: int) -> Dict:
+        ligen = self.data['seasons'].setdefault(str(season), {})
+        return ligen.setdefault(str(liga_id), {
+            'crawled_at': 0, 'actual_match_day': None, 'teams': None,
+            'pending_kickoffs': None, 'spielplan_fetched_at': 0
+        })
+
+    def get_teams(self, season: int, liga_id: int) -> Optional[List[Dict]]:
+        with self.lock:
+            return self._liga(season, liga_id)['teams']
+
+    def needs_refresh(self, season: int, liga_id: int, today: Optional[str] = None,
+                      listed_match_day: Optional[int] = None, with_spielplan: bool = True) -> bool:
+        """
+        Prüft ob die Tabelle einer Liga neu geladen werden muss
+
+        Args:
+            listed_match_day: actualMatchDay der Liga laut Liga-Liste (None = unbekannt)
+            with_spielplan: False wenn der Lauf keine Spielpläne lädt (reine Tabellen-Regel)
+        """
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        with self.lock:
+            state = self._liga(season, liga_id)
+            if state['teams'] is None:
+                return True
+            if time.time() - state['crawled_at'] > self.max_age:
+                return True
+            if listed_match_day is not None and (state['actual_match_day'] is None
+                                                 or listed_match_day > state['actual_match_day']):
+                return True
+            if not with_spielplan or state['pending_kickoffs'] is None:
+                return self._kickoff_since_crawl(state, today)
+            return self._pending_due(state, today)
+
+    def needs_spielplan(self, season: int, liga_id: int, today: Optional[str] = None) -> bool:
+        """Spielplan neu laden, wenn unbekannt oder offene Spiele angestanden haben"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        with self.lock:
+            state = self._liga(season, liga_id)
+            return state['pending_kickoffs'] is None or self._pending_due(state, today)
+
+    def _kickoff_since_crawl(self, state: Dict, today: str) -> bool:
+        # Ohne neuen Spielplan bleiben die Anstoß-Daten stehen -> nur Spiele seit dem letzten Tabellen-Abruf zählen
+        crawled_day = datetime.fromtimestamp(state['crawled_at']).strftime('%Y-%m-%d')
+        return any(crawled_day <= kickoff <= today for kickoff in state['pending_kickoffs'] or [])
+
+    def _pending_due(self, state: Dict, today: str) -> bool:
+        pending = state['pending_kickoffs']
+        # Offene Spiele, deren Anstoß erreicht ist -> Ergebnis/Verlegung erwartet
+        if any(kickoff <= today for kickoff in pending):
+            return True
+        # Offene Spiele könnten vorverlegt worden sein -> Spielplan nicht beliebig alt werden lassen
+        return bool(pending) and time.time() - state['spielplan_fetched_at'] > self.pending_max_age
+
+    def record_table(self, season: int, liga_id: int, teams: List[Dict], actual_match_day: Optional[int]):
+        with self.lock:
+            state = self._liga(season, liga_id)
+            if actual_match_day is not None and actual_match_day != state['actual_match_day']:
+                # Neuer Spieltag -> gespeicherter Spielplan ist nicht mehr aktuell
+                state['pending_kickoffs'] = None
+            state['teams'] = teams
+            state['actual_match_day'] = actual_match_day
+            state['crawled_at'] = time.time()
+
+    def record_spielplan(self, season: int, liga_id: int, spielplan: Dict):
+        with self.lock:
+            state = self._liga(season, liga_id)
+            state['pending_kickoffs'] = pending_kickoff_dates(spielplan)
+            state['spielplan_fetched_at'] = time.time()
+
+
+class CrawlJournal:
+    """
+    Append-only Arbeits-Journal eines Crawls (NDJSON, eine Zeile pro Schritt)
+
+    Zeilen:
+        {"t": "start", "journal_version": 1, "base_url": ..., "season": ..., "heimat": ...}
+        {"t": "page", "verband": 2, "next": 10, "more": true, "ligen": [<LigaInfo ohne teams>, ...]}
+        {"t": "table", "liga": 50001, "teams": [...]}
+
+    Jede Zeile wird sofort geschrieben, sodass ein Abbruch (Ctrl-C, Netzwerk,
+    Absturz) höchstens die gerade laufenden Requests kostet. Beim Fortsetzen
+    wird das Journal eingelesen: fertig paginierte Verbände und geladene
+    Tabellen werden nicht erneut angefragt, angefangene Verbände werden ab
+    dem nächsten startAtIndex weiter paginiert. Nach erfolgreichem Abschluss
+    wird das Journal gelöscht.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH, base_url: str = "", season: int = 0,
+                 heimat_verband_id: int = 0, fsync_every: int = JOURNAL_FSYNC_EVERY):
+        self.path = path
+        self.header = {
+            't': 'start', 'journal_version': JOURNAL_VERSION, 'base_url': base_url,
+            'season': season, 'heimat': heimat_verband_id
+        }
+        self.fsync_every = fsync_every
+        self.lock = threading.Lock()
+        self.pages: Dict[int, Dict] = {}  # verband_id -> {'next', 'done', 'ligen'}
+        self.tables: Dict[int, List[Dict]] = {}
+        self.resumed = False
+        self.file = None
+        self._unsynced = 0
+
+    def open(self) -> bool:
+        """
+        Öffnet das Journal zum Anhängen
+
+        Returns:
+            True wenn ein passendes Journal fortgesetzt wird
+        """
+        valid_end = self._replay()
+        if valid_end:
+            self.file = open(self.path, 'r+b')
+            # Abgeschnittene letzte Zeile (Absturz beim Schreiben) verwerfen
+            self.file.truncate(valid_end)
+            self.file.seek(valid_end)
+            self.resumed = True
+        else:
+            self.pages.clear()
+            self.tables.clear()
+            self.file = open(self.path, 'wb')
+            self._append(self.header, sync=True)
+        return self.resumed
+
+    def _replay(self) -> int:
+        """Liest ein vorhandenes Journal ein, liefert das Byte-Ende der letzten gültigen Zeile"""
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return 0
+
+        valid_end = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+
+                if valid_end == 0:
+                    if {k: record.get(k) for k in self.header} != self.header:
+                        return 0  # Anderer Crawl (Saison, Server, Heimatverband)
+                elif record['t'] == 'page':
+                    entry = self.pages.setdefault(record['verband'], {'next': 0, 'done': False, 'ligen': []})
+                    entry['ligen'].extend(record['ligen'])
+                    entry['next'] = record['next']
+                    entry['done'] = not record['more']
+                elif record['t'] == 'table':
+                    self.tables[record['liga']] = record['teams']
+                valid_end += len(line)
+
+        return valid_end
+
+    def _append(self, record: Dict, sync: bool = False):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            self._unsynced += 1
+            if sync or self._unsynced >= self.fsync_every:
+                os.fsync(self.file.fileno())
+                self._unsynced = 0
+
+    def get_ligen(self, verband_id: int) -> Optional[List[LigaInfo]]:
+        """Ligen eines vollständig paginierten Verbands (sonst None)"""
+        entry = self.pages.get(verband_id)
+        if not entry or not entry['done']:
+            return None
+        return [LigaInfo(**liga) for liga in entry['ligen']]
+
+    def resume_point(self, verband_id: int) -> Tuple[int, List[LigaInfo]]:
+        """startAtIndex und bereits paginierte Ligen eines angefangenen Verbands"""
+        entry = self.pages.get(verband_id)
+        if not entry:
+            return 0, []
+        return entry['next'], [LigaInfo(**liga) for liga in entry['ligen']]
+
+    def record_page(self, verband_id: int, next_start: int, ligen: List[LigaInfo], has_more: bool):
+        page = [{key: value for key, value in asdict(liga).items() if key != 'teams'} for liga in ligen]
+        entry = self.pages.setdefault(verband_id, {'next': 0, 'done': False, 'ligen': []})
+        entry['ligen'].extend(page)
+        entry['next'] = next_start
+        entry['done'] = not has_more
+        self._append({'t': 'page', 'verband': verband_id, 'next': next_start, 'more': has_more, 'ligen': page})
+
+    def get_table(self, liga_id: int) -> Optional[List[Dict]]:
+        return self.tables.get(liga_id)
+
+    def record_table(self, liga_id: int, teams: List[Dict]):
+        self.tables[liga_id] = teams
+        self._append({'t': 'table', 'liga': liga_id, 'teams': teams})
+
+    def close(self):
+        if self.file:
+            with self.lock:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+
+    def complete(self):
+        """Crawl vollständig -> Journal wird nicht mehr gebraucht"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class CrawlProgress:
+    """Live-Fortschritt einer Crawl-Phase: Durchsatz, Requests/s und ETA"""
+
+    def __init__(self, label: str, total: int, request_counter=None, interval: float = PROGRESS_INTERVAL):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.request_counter = request_counter
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests_at_start = request_counter() if request_counter else 0
+        self.last_report = self.started
+
+    def update(self, count: int = 1):
+        with self.lock:
+            self.done += count
+            now = time.time()
+            if now - self.last_report < self.interval and self.done < self.total:
+                return
+            self.last_report = now
+        print(f"   ⏳ {self.format()}")
+
+    def format(self) -> str:
+        elapsed = max(time.time() - self.started, 1e-6)
+        rate = self.done / elapsed
+        text = f"{self.done}/{self.total} {self.label}"
+        if self.total:
+            text += f" ({100 * self.done / self.total:.0f}%)"
+        text += f" · {rate:.1f}/s"
+        if self.request_counter:
+            text += f" · {(self.request_counter() - self.requests_at_start) / elapsed:.1f} Req/s"
+        remaining = self.total - self.done
+        if remaining > 0 and rate > 0:
+            eta = int(remaining / rate)
+            text += f" · ETA {eta // 60}m{eta % 60:02d}s"
+        return text
+
+
+class ClubStore:
+    """
+    Normalisierter SQLite-Store für Verbände, Ligen, Clubs, Teams und Spiele
+
+    Wird von OptimizedClubDiscovery bei jedem Crawl per Upsert gefüllt
+    (Verbände beim Laden, Ligen/Clubs/Teams nach der Discovery, Spiele pro
+    geladenem Spielplan). Teams und Spiele, die in der neuesten Tabelle bzw.
+    im neuesten Spielplan einer Liga fehlen, werden entfernt.
+
+    Beispiel-Abfragen (Millisekunden statt Re-Crawl):
+        store.upcoming_matches(club_id, altersklasse='U10')
+        store.clubs_in_bezirk('Oberpfalz')
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS verbaende (
+            verband_id INTEGER PRIMARY KEY,
+            name TEXT,
+            updated_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS ligen (
+            liga_id INTEGER PRIMARY KEY,
+            season INTEGER,
+            liga_name TEXT,
+            verband_id INTEGER,
+            verband_name TEXT,
+            bezirk_name TEXT,
+            kreis_name TEXT,
+            altersklasse TEXT,
+            geschlecht TEXT,
+            spielklasse TEXT,
+            ebene_name TEXT,
+            updated_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_ligen_verband ON ligen (verband_id);
+        CREATE INDEX IF NOT EXISTS idx_ligen_bezirk ON ligen (bezirk_name);
+        CREATE TABLE IF NOT EXISTS clubs (
+            club_id INTEGER PRIMARY KEY,
+            club_name TEXT,
+            updated_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS teams (
+            season_team_id INTEGER PRIMARY KEY,
+            team_permanent_id INTEGER,
+            club_id INTEGER,
+            liga_id INTEGER,
+            teamname TEXT,
+            teamname_small TEXT,
+            rang INTEGER,
+            total_teams INTEGER,
+            anzspiele INTEGER,
+            gewinnpunkte INTEGER,
+            verlustpunkte INTEGER,
+            siege INTEGER,
+            niederlagen INTEGER,
+            koerbe INTEGER,
+            gegen_koerbe INTEGER,
+            korbdiff INTEGER,
+            updated_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_teams_club ON teams (club_id);
+        CREATE INDEX IF NOT EXISTS idx_teams_permanent ON teams (team_permanent_id);
+        CREATE INDEX IF NOT EXISTS idx_teams_liga ON teams (liga_id);
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id INTEGER PRIMARY KEY,
+            liga_id INTEGER,
+            match_day INTEGER,
+            match_no INTEGER,
+            kickoff_date TEXT,
+            kickoff_time TEXT,
+            home_team_id INTEGER,
+            home_team_name TEXT,
+            guest_team_id INTEGER,
+            guest_team_name TEXT,
+            result TEXT,
+            abgesagt INTEGER,
+            verzicht INTEGER,
+            updated_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_matches_liga ON matches (liga_id);
+        CREATE INDEX IF NOT EXISTS idx_matches_kickoff ON matches (kickoff_date);
+        CREATE INDEX IF NOT EXISTS idx_matches_home ON matches (home_team_id);
+        CREATE INDEX IF NOT EXISTS idx_matches_guest ON matches (guest_team_id);
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] != STORE_SCHEMA_VERSION:
+                self.conn.executescript(self.SCHEMA)
+                self.conn.execute(f"PRAGMA user_version={STORE_SCHEMA_VERSION}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def upsert_verbaende(self, verbaende: List[Dict]):
+        now = time.time()
+        rows = [
+            (v['id'], v.get('label', v.get('name')), now)
+            for v in verbaende if 'id' in v
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO verbaende (verband_id, name, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (verband_id) DO UPDATE SET name = excluded.name, updated_at = excluded.updated_at
+            """, rows)
+
+    def upsert_discovery(self, season: int, ligen: List[LigaInfo], clubs: List[ClubInfo]):
+        """Ligen, Clubs und Teams eines Discovery-Laufs in einer Transaktion"""
+        now = time.time()
+        liga_rows = [
+            (liga.liga_id, season, liga.liga_name, liga.verband_id, liga.verband_name, liga.bezirk_name,
+             liga.kreis_name, liga.altersklasse, liga.geschlecht, liga.spielklasse, liga.ebene_name, now)
+            for liga in ligen
+        ]
+        club_rows = [(club.club_id, club.club_name, now) for club in clubs]
+        team_rows = []
+        for liga in ligen:
+            for team in liga.teams or []:
+                season_team_id = team.get('seasonTeamId') or team.get('teamCompetitionId')
+                if not season_team_id:
+                    continue
+                team_rows.append((
+                    season_team_id, team.get('teamPermanentId'), team.get('clubId'), liga.liga_id,
+                    team.get('teamname'), team.get('teamnameSmall'), team.get('rang'), team.get('total_teams'),
+                    team.get('anzspiele'), team.get('anzGewinnpunkte'), team.get('anzVerlustpunkte'),
+                    team.get('s'), team.get('n'), team.get('koerbe'), team.get('gegenKoerbe'),
+                    team.get('korbdiff'), now
+                ))
+
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO ligen (liga_id, season, liga_name, verband_id, verband_name, bezirk_name, kreis_name,
+                                   altersklasse, geschlecht, spielklasse, ebene_name, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (liga_id) DO UPDATE SET
+                    season = excluded.season, liga_name = excluded.liga_name, verband_id = excluded.verband_id,
+                    verband_name = excluded.verband_name, bezirk_name = excluded.bezirk_name,
+                    kreis_name = excluded.kreis_name, altersklasse = excluded.altersklasse,
+                    geschlecht = excluded.geschlecht, spielklasse = excluded.spielklasse,
+                    ebene_name = excluded.ebene_name, updated_at = excluded.updated_at
+            """, liga_rows)
+            self.conn.executemany("""
+                INSERT INTO clubs (club_id, club_name, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (club_id) DO UPDATE SET club_name = excluded.club_name, updated_at = excluded.updated_at
+            """, club_rows)
+            self.conn.executemany("""
+                INSERT INTO teams (season_team_id, team_permanent_id, club_id, liga_id, teamname, teamname_small,
+                                   rang, total_teams, anzspiele, gewinnpunkte, verlustpunkte, siege, niederlagen,
+                                   koerbe, gegen_koerbe, korbdiff, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (season_team_id) DO UPDATE SET
+                    team_permanent_id = excluded.team_permanent_id, club_id = excluded.club_id,
+                    liga_id = excluded.liga_id, teamname = excluded.teamname,
+                    teamname_small = excluded.teamname_small, rang = excluded.rang,
+                    total_teams = excluded.total_teams, anzspiele = excluded.anzspiele,
+                    gewinnpunkte = excluded.gewinnpunkte, verlustpunkte = excluded.verlustpunkte,
+                    siege = excluded.siege, niederlagen = excluded.niederlagen, koerbe = excluded.koerbe,
+                    gegen_koerbe = excluded.gegen_koerbe, korbdiff = excluded.korbdiff,
+                    updated_at = excluded.updated_at
+            """, team_rows)
+            # Teams, die nicht mehr in der Tabelle ihrer (neu geladenen) Liga stehen
+            self.conn.executemany(
+                "DELETE FROM teams WHERE liga_id = ? AND updated_at < ?",
+                [(liga.liga_id, now) for liga in ligen if liga.teams]
+            )
+
+    def upsert_matches(self, liga_id: int, spielplan: Dict):
+        """Spiele eines Spielplans (matches[] der REST-API)"""
+        now = time.time()
+        rows = []
+        for match in spielplan.get('matches') or []:
+            if not match.get('matchId'):
+                continue
+            home_team = match.get('homeTeam') or {}
+            guest_team = match.get('guestTeam') or {}
+            rows.append((
+                match['matchId'], liga_id, match.get('matchDay'), match.get('matchNo'),
+                match.get('kickoffDate'), match.get('kickoffTime'),
+                home_team.get('seasonTeamId') or home_team.get('teamCompetitionId'), home_team.get('teamname'),
+                guest_team.get('seasonTeamId') or guest_team.get('teamCompetitionId'), guest_team.get('teamname'),
+                match.get('result'), int(bool(match.get('abgesagt'))), int(bool(match.get('verzicht'))), now
+            ))
+
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO matches (match_id, liga_id, match_day, match_no, kickoff_date, kickoff_time,
+                                     home_team_id, home_team_name, guest_team_id, guest_team_name,
+                                     result, abgesagt, verzicht, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (match_id) DO UPDATE SET
+                    liga_id = excluded.liga_id, match_day = excluded.match_day, match_no = excluded.match_no,
+                    kickoff_date = excluded.kickoff_date, kickoff_time = excluded.kickoff_time,
+                    home_team_id = excluded.home_team_id, home_team_name = excluded.home_team_name,
+                    guest_team_id = excluded.guest_team_id, guest_team_name = excluded.guest_team_name,
+                    result = excluded.result, abgesagt = excluded.abgesagt, verzicht = excluded.verzicht,
+                    updated_at = excluded.updated_at
+            """, rows)
+            self.conn.execute("DELETE FROM matches WHERE liga_id = ? AND updated_at < ?", (liga_id, now))
+
+    def upcoming_matches(self, club_id: int, altersklasse: Optional[str] = None,
+                         today: Optional[str] = None) -> List[Dict]:
+        """Anstehende (nicht gewertete, nicht abgesagte) Spiele aller Teams eines Clubs"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        query = """
+            SELECT m.*, l.liga_name, l.altersklasse, t.teamname AS club_team,
+                   m.home_team_id = t.season_team_id AS is_home
+            FROM teams t
+            JOIN ligen l ON l.liga_id = t.liga_id
+            JOIN matches m ON m.home_team_id = t.season_team_id OR m.guest_team_id = t.season_team_id
+            WHERE t.club_id = ? AND m.kickoff_date >= ? AND m.result IS NULL AND m.abgesagt = 0
+        """
+        params: List = [club_id, today]
+        if altersklasse:
+            query += " AND l.altersklasse = ?"
+            params.append(altersklasse)
+        query += " ORDER BY m.kickoff_date, m.kickoff_time"
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def clubs_in_bezirk(self, bezirk_name: str) -> List[Dict]:
+        """Alle Clubs mit mindestens einem Team in einer Liga des Bezirks"""
+        with self.lock:
+            return [dict(row) for row in self.conn.execute("""
+                SELECT c.club_id, c.club_name, COUNT(t.season_team_id) AS team_count
+                FROM ligen l
+                JOIN teams t ON t.liga_id = l.liga_id
+                JOIN clubs c ON c.club_id = t.club_id
+                WHERE l.bezirk_name = ?
+                GROUP BY c.club_id
+                ORDER BY team_count DESC, c.club_name
+            """, (bezirk_name,))]
+
+    def teams_of_club(self, club_id: int) -> List[Dict]:
+        """Teams eines Clubs mit Liga und Tabellenplatz"""
+        with self.lock:
+            return [dict(row) for row in self.conn.execute("""
+                SELECT t.*, l.liga_name, l.altersklasse, l.geschlecht
+                FROM teams t JOIN ligen l ON l.liga_id = t.liga_id
+                WHERE t.club_id = ?
+                ORDER BY l.altersklasse, t.teamname
+            """, (club_id,))]
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Klein, ohne Akzente/Umlaute, nur [0-9a-z] und einfache Leerzeichen
+
+    Umlaute und ihre Umschreibung werden gleich behandelt:
+    "Würzburg", "Wuerzburg" und "wurzburg" ergeben "wurzburg".
+    """
+    text = text.casefold().replace('ae', 'a').replace('oe', 'o').replace('ue', 'u')
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text).split())
+
+
+def search_trigrams(normalized: str, prefix_last_word: bool = False) -> Set[str]:
+    """
+    Trigramme pro Wort, vorne mit zwei und hinten mit einem Leerzeichen aufgefüllt
+
+    Mit prefix_last_word=True bleibt das letzte Wort hinten offen, sodass eine
+    halb getippte Eingabe ("würz") als Präfix trifft. Das Trigramm "  x" wird
+    nur für einbuchstabige Wörter erzeugt - sonst ist es in " xy" enthalten und
+    hätte nur sehr lange Posting-Listen.
+    """
+    grams = set()
+    words = normalized.split()
+    for i, word in enumerate(words):
+        padded = f"  {word}" if prefix_last_word and i == len(words) - 1 else f"  {word} "
+        first = 1 if len(word) > 1 else 0
+        grams.update(padded[j:j + 3] for j in range(first, len(padded) - 2))
+    return grams
+
+
+class ClubSearchIndex:
+    """
+    Trigramm-Index über club_name und alle Team-Namen (team_variations)
+
+    Suche ist case- und umlaut-insensitiv; Treffer werden nach Abdeckung der
+    Query-Trigramme, Treffer im Club-Namen, Jaccard-Ähnlichkeit und
+    Team-Anzahl sortiert. Das
+    Zählen der Treffer pro Name läuft über Counter (C-Schleife), damit eine
+    Suche über die landesweite Club-Liste unter 1 ms bleibt.
+    """
+
+    def __init__(self, clubs: List[ClubInfo]):
+        self._build(clubs, [
+            (club, [club.club_name, *club.team_variations], len(club.teams)) for club in clubs
+        ])
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'ClubSearchIndex':
+        """Index über Club-Records (club_records_from_chunks / club_records_from_discovery)"""
+        index = cls.__new__(cls)
+        index._build(list(records), [
+            (record, [record['name'], *record.get('team_names', [])], record.get('team_count', 0))
+            for record in records
+        ])
+        return index
+
+    def _build(self, items: List, entries: List[Tuple[object, List[str], int]]):
+        self.items = items
+        self.team_counts: List[int] = []
+        self.entry_item: List[int] = []
+        self.entry_gram_count: List[int] = []
+        self.entry_text: List[str] = []
+        self.entry_is_club_name: List[bool] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+
+        for item_idx, (_, names, team_count) in enumerate(entries):
+            self.team_counts.append(team_count)
+            seen = set()
+            for name_idx, name in enumerate(names):
+                normalized = normalize_search_text(name or '')
+                if not normalized or normalized in seen:
+                    continue
+                seen.add(normalized)
+                grams = search_trigrams(normalized)
+                entry_idx = len(self.entry_item)
+                self.entry_item.append(item_idx)
+                self.entry_gram_count.append(len(grams))
+                self.entry_text.append(normalized)
+                self.entry_is_club_name.append(name_idx == 0)
+                for gram in grams:
+                    postings[gram].append(entry_idx)
+
+        self.postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT,
+               min_score: float = SEARCH_MIN_SCORE) -> List[Tuple[object, float]]:
+        """
+        Returns:
+            Liste (Club bzw. Record, Score 0..1), beste zuerst
+        """
+        normalized = normalize_search_text(query)
+        if not normalized:
+            return []
+
+        query_grams = search_trigrams(normalized, prefix_last_word=True)
+        shared_counts = Counter(chain.from_iterable(
+            self.postings[gram] for gram in query_grams if gram in self.postings
+        ))
+
+        needed = min_score * len(query_grams)
+        best: Dict[int, Tuple[float, bool, float]] = {}
+        for entry_idx, shared in shared_counts.items():
+            if shared < needed:
+                continue
+            coverage = shared / len(query_grams)
+            if coverage < 1.0 and normalized in self.entry_text[entry_idx]:
+                coverage = 1.0  # Teilstring (z.B. Einzelbuchstaben-Wörter)
+            jaccard = shared / (len(query_grams) + self.entry_gram_count[entry_idx] - shared)
+            item_idx = self.entry_item[entry_idx]
+            score = (coverage, self.entry_is_club_name[entry_idx], jaccard)
+            if item_idx not in best or score > best[item_idx]:
+                best[item_idx] = score
+
+        # Abdeckung, Treffer im Club-Namen vor Team-Namen, Ähnlichkeit, Team-Anzahl
+        ranked = sorted(best.items(), key=lambda kv: (*kv[1], self.team_counts[kv[0]]), reverse=True)
+        return [(self.items[item_idx], round(score[0], 3)) for item_idx, score in ranked[:limit]]
+
+
+def club_records_from_chunks(chunk_dir: str = CLUBS_CHUNKS_DIR) -> List[Dict]:
+    """Club-Records aus den clubs-chunk-*.json der App (scripts/split-clubs-data.js)"""
+    records = []
+    for filename in sorted(os.listdir(chunk_dir)):
+        if not (filename.startswith('clubs-chunk-') and filename.endswith('.json')):
+            continue
+        with open(os.path.join(chunk_dir, filename), 'r', encoding='utf-8') as f:
+            chunk = json.load(f)
+        for club in chunk.get('clubs', []):
+            name = club.get('vereinsname') or ''
+            if len(name) > 1 and name.startswith('"') and name.endswith('"'):
+                name = name[1:-1]
+            records.append({
+                'club_id': int(club['clubId']),
+                'name': name,
+                'verband_ids': club.get('verbaende') or [],
+                'bezirke': [],
+                'team_count': len(club.get('teams') or []),
+                'team_names': sorted({team['teamname'] for team in club.get('teams') or [] if team.get('teamname')})
+            })
+    return records
+
+
+def club_records_from_discovery(clubs: List[ClubInfo]) -> List[Dict]:
+    """Club-Records aus einem Discovery-Lauf (inkl. Bezirke der Ligen)"""
+    return [{
+        'club_id': club.club_id,
+        'name': club.club_name,
+        'verband_ids': sorted({liga.verband_id for liga in club.ligen if liga.verband_id is not None}),
+        'bezirke': sorted({liga.bezirk_name for liga in club.ligen if liga.bezirk_name}),
+        'team_count': len(club.teams)
+    } for club in clubs]
+
+
+class ClubDirectoryIndex:
+    """
+    Binärer Club-Index, der per mmap ohne Parsen geöffnet wird
+
+    Layout (little-endian, alle Sektionen 4-Byte-aligned):
+        Header        magic, Version, Anzahl Clubs, Offsets/Längen der Sektionen
+        ids           u32[n]      clubIds, aufsteigend sortiert (binäre Suche)
+        records       u32[n * 5]  name_off, name_len, team_count, verband_off, verband_len
+        club_verbaende u32[]      Verbands-IDs pro Club (über verband_off/len)
+        verband_dir   u32[v * 3]  verband_id, postings_off, postings_len (nach ID sortiert)
+        bezirk_dir    u32[b * 4]  name_off, name_len, postings_off, postings_len (nach Name sortiert)
+        postings      u32[]       Positionen in ids (pro Verband/Bezirk sortiert)
+        strings       UTF-8       Club- und Bezirks-Namen
+
+    Mehrere Prozesse, die denselben Index öffnen, teilen sich die Seiten im
+    Page-Cache; Öffnen kostet nur mmap + Header.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str = DEFAULT_CLUB_INDEX_PATH):
+        if sys.byteorder != 'little':
+            raise RuntimeError("ClubDirectoryIndex setzt eine little-endian Plattform voraus")
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        (magic, version, self.count, ids_off, records_off, club_verbaende_off, club_verbaende_len,
+         verband_dir_off, self.verband_count, bezirk_dir_off, self.bezirk_count,
+         postings_off, strings_off) = CLUB_INDEX_HEADER.unpack_from(self._buffer, 0)
+        if magic != CLUB_INDEX_MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"Kein gültiger Club-Index: {path}")
+
+        self._ids = self._u32(ids_off, self.count)
+        self._records = self._u32(records_off, self.count * 5)
+        self._club_verbaende = self._u32(club_verbaende_off, club_verbaende_len)
+        self._verband_dir = self._u32(verband_dir_off, self.verband_count * 3)
+        self._bezirk_dir = self._u32(bezirk_dir_off, self.bezirk_count * 4)
+        self._postings_off = postings_off
+        self._strings_off = strings_off
+
+    def _u32(self, offset: int, length: int) -> memoryview:
+        return self._buffer[offset:offset + 4 * length].cast('I')
+
+    def close(self):
+        for view in ('_ids', '_records', '_club_verbaende', '_verband_dir', '_bezirk_dir'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_off + offset
+        return str(self._buffer[start:start + length], 'utf-8')
+
+    def _club(self, position: int) -> Dict:
+        name_off, name_len, team_count, verband_off, verband_len = self._records[position * 5:position * 5 + 5]
+        return {
+            'club_id': self._ids[position],
+            'name': self._string(name_off, name_len),
+            'team_count': team_count,
+            'verband_ids': list(self._club_verbaende[verband_off:verband_off + verband_len])
+        }
+
+    def _postings(self, offset: int, length: int) -> List[Dict]:
+        postings = self._u32(self._postings_off + 4 * offset, length)
+        try:
+            return [self._club(position) for position in postings]
+        finally:
+            postings.release()
+
+    def get(self, club_id: int) -> Optional[Dict]:
+        """Club per ID (binäre Suche im sortierten ID-Array)"""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._ids[mid] < club_id:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._ids[low] == club_id:
+            return self._club(low)
+        return None
+
+    def by_verband(self, verband_id: int) -> List[Dict]:
+        low, high = 0, self.verband_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._verband_dir[mid * 3] < verband_id:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.verband_count and self._verband_dir[low * 3] == verband_id:
+            return self._postings(self._verband_dir[low * 3 + 1], self._verband_dir[low * 3 + 2])
+        return []
+
+    def by_bezirk(self, bezirk_name: str) -> List[Dict]:
+        key = bezirk_name.encode('utf-8')
+        low, high = 0, self.bezirk_count
+        while low < high:
+            mid = (low + high) // 2
+            name_off, name_len = self._bezirk_dir[mid * 4:mid * 4 + 2]
+            start = self._strings_off + name_off
+            if bytes(self._buffer[start:start + name_len]) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.bezirk_count:
+            name_off, name_len, postings_off, postings_len = self._bezirk_dir[low * 4:low * 4 + 4]
+            if self._string(name_off, name_len) == bezirk_name:
+                return self._postings(postings_off, postings_len)
+        return []
+
+    @classmethod
+    def build(cls, records: List[Dict], path: str = DEFAULT_CLUB_INDEX_PATH) -> int:
+        """
+        Schreibt den Index atomar (tmp-Datei + rename)
+
+        Args:
+            records: Dicts mit club_id, name, verband_ids, bezirke, team_count
+                     (club_records_from_chunks / club_records_from_discovery);
+                     doppelte clubIds werden zusammengeführt
+
+        Returns:
+            Anzahl Clubs im Index
+        """
+        merged: Dict[int, Dict] = {}
+        for record in records:
+            club = merged.setdefault(int(record['club_id']), {
+                'name': record['name'], 'verband_ids': set(), 'bezirke': set(), 'team_count': 0
+            })
+            club['verband_ids'].update(record.get('verband_ids') or [])
+            club['bezirke'].update(record.get('bezirke') or [])
+            club['team_count'] = max(club['team_count'], record.get('team_count') or 0)
+
+        ids = sorted(merged)
+        strings = bytearray()
+        string_offsets: Dict[str, Tuple[int, int]] = {}
+
+        def intern(text: str) -> Tuple[int, int]:
+            if text not in string_offsets:
+                encoded = text.encode('utf-8')
+                string_offsets[text] = (len(strings), len(encoded))
+                strings.extend(encoded)
+            return string_offsets[text]
+
+        records_data = []
+        club_verbaende = []
+        verband_postings: Dict[int, List[int]] = defaultdict(list)
+        bezirk_postings: Dict[str, List[int]] = defaultdict(list)
+        for position, club_id in enumerate(ids):
+            club = merged[club_id]
+            verband_ids = sorted(club['verband_ids'])
+            records_data.extend((*intern(club['name']), club['team_count'], len(club_verbaende), len(verband_ids)))
+            club_verbaende.extend(verband_ids)
+            for verband_id in verband_ids:
+                verband_postings[verband_id].append(position)
+            for bezirk in club['bezirke']:
+                bezirk_postings[bezirk].append(position)
+
+        postings = []
+        verband_dir = []
+        for verband_id in sorted(verband_postings):
+            verband_dir.extend((verband_id, len(postings), len(verband_postings[verband_id])))
+            postings.extend(verband_postings[verband_id])
+        bezirk_dir = []
+        for bezirk in sorted(bezirk_postings, key=lambda name: name.encode('utf-8')):
+            bezirk_dir.extend((*intern(bezirk), len(postings), len(bezirk_postings[bezirk])))
+            postings.extend(bezirk_postings[bezirk])
+
+        sections = [ids, records_data, club_verbaende, verband_dir, bezirk_dir, postings]
+        offsets = []
+        offset = CLUB_INDEX_HEADER.size
+        for section in sections:
+            offsets.append(offset)
+            offset += 4 * len(section)
+        strings_off = offset
+
+        header = CLUB_INDEX_HEADER.pack(
+            CLUB_INDEX_MAGIC, cls.VERSION, len(ids), offsets[0], offsets[1], offsets[2], len(club_verbaende),
+            offsets[3], len(verband_dir) // 3, offsets[4], len(bezirk_dir) // 4, offsets[5], strings_off
+        )
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            for section in sections:
+                f.write(struct.pack(f'<{len(section)}I', *section))
+            f.write(strings)
+        os.replace(tmp_path, path)
+
+        return len(ids)
+
+
+class RateLimiter:
+    """
+    Gleichmäßiger Request-Takt: mindestens 1/rate Sekunden zwischen zwei Requests
+
+    Mit shared=True liegt der nächste freie Zeitpunkt in Shared Memory, sodass
+    sich alle Prozesse eines Shard-Crawls ein gemeinsames Budget teilen (der
+    Limiter wird den Worker-Prozessen beim Start übergeben).
+    """
+
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, shared: bool = False):
+        self.rate = rate
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        if shared:
+            ctx = multiprocessing.get_context()
+            self._next_slot = ctx.Value('d', 0.0, lock=False)
+            self._lock = ctx.Lock()
+        else:
+            self._next_slot = None
+            self._local_next_slot = 0.0
+            self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserviert den nächsten freien Zeitpunkt und wartet bis dahin"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            if self._next_slot is not None:
+                slot = max(now, self._next_slot.value)
+                self._next_slot.value = slot + self.interval
+            else:
+                slot = max(now, self._local_next_slot)
+                self._local_next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def build_match_index(spielplan: Optional[Dict], liga_name: str = '') -> Dict[int, List[Dict]]:
+    """
+    Spiele eines Spielplans nach Team (seasonTeamId/teamCompetitionId) gruppiert
+
+    Versteht die REST-Form (matches[], homeTeam/guestTeam, result, kickoffDate)
+    und die ältere Form (games[], homeTeam/awayTeam). Jeder Eintrag ist eine
+    Kopie des Spiels mit 'is_home' und 'liga_name'.
+    """
+    index = defaultdict(list)
+    if not spielplan:
+        return index
+
+    games = (spielplan.get('matches') or spielplan.get('games')
+             or (spielplan.get('spielplan') or {}).get('games') or [])
+
+    for game in games:
+        home_team = game.get('homeTeam') or {}
+        away_team = game.get('guestTeam') or game.get('awayTeam') or {}
+
+        home_id = home_team.get('seasonTeamId') or home_team.get('teamCompetitionId')
+        away_id = away_team.get('seasonTeamId') or away_team.get('teamCompetitionId')
+
+        game_liga_name = game.get('liga_name') or liga_name
+        if home_id:
+            index[home_id].append({**game, 'is_home': True, 'liga_name': game_liga_name})
+        if away_id and away_id != home_id:
+            index[away_id].append({**game, 'is_home': False, 'liga_name': game_liga_name})
+
+    return index
+
+
+class ClubNameDeriver:
+    """
+    Leitet Club-Namen aus Team-Namen ab - ein vorkompilierter Matcher plus Memo-Cache
+
+    Die Team-Nummern-Muster und Geschlechts-Suffixe werden zu einem einzigen
+    Regex zusammengefasst: (Basis)(Suffix)?(Nummer)? - das entspricht der
+    bisherigen Reihenfolge (erst Nummer am Ende entfernen, dann Suffix).
+    Ergebnisse werden pro rohem Team-Namen gecacht (begrenzt, älteste
+    Einträge fliegen zuerst), da dieselben Namen in vielen Ligen und
+    Saisons vorkommen.
+    """
+
+    def __init__(self, number_patterns: List[str], gender_suffixes: List[str] = TEAM_GENDER_SUFFIXES,
+                 cache_size: int = CLUB_NAME_CACHE_SIZE):
+        # Muster sind am Ende verankert ($) - für fullmatch wird der Anker entfernt
+        number_alternatives = '|'.join(f'(?:{pattern.rstrip("$")})' for pattern in number_patterns)
+        suffix_alternatives = '|'.join(re.escape(suffix) for suffix in gender_suffixes)
+        self.matcher = re.compile(
+            rf'(?P<base>.*?)(?:{suffix_alternatives})?\s*(?:{number_alternatives})?', re.DOTALL
+        )
+        self.whitespace = re.compile(r'\s+')
+        self.cache: Dict[str, str] = {}
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def derive(self, team_name: str) -> str:
+        club_name = self.cache.get(team_name)
+        if club_name is not None:
+            self.hits += 1
+            return club_name
+
+        self.misses += 1
+        original_name = team_name.strip()
+        club_name = self.whitespace.sub(' ', self.matcher.fullmatch(original_name).group('base').strip())
+
+        # Fallback
+        if len(club_name) < 3:
+            club_name = original_name
+
+        if len(self.cache) >= self.cache_size:
+            del self.cache[next(iter(self.cache))]
+        self.cache[team_name] = club_name
+        return club_name
+
+    def derive_many(self, team_names: Iterable[str]) -> List[str]:
+        """Batch-API: Club-Namen für eine ganze Team-Liste (Duplikate nur einmal berechnet)"""
+        derive = self.derive
+        return [derive(team_name) for team_name in team_names]
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'cached': len(self.cache)
+        }
+
+
+def analysis_needs_spielplaene(fields: Optional[Iterable[str]] = None) -> bool:
+    """Ob eine Analyse mit diesen Feldern (None = Default-Umfang) Spielpläne braucht"""
+    return any(section in SPIELPLAN_SECTIONS for section in (ANALYSIS_SECTIONS if fields is None else fields))
+
+
+class ClubAnalysis(Mapping):
+    """
+    Lazy Club-Analyse: jeder Abschnitt wird erst beim ersten Zugriff berechnet
+
+    fields projiziert die Analyse auf einzelne Abschnitte (Default:
+    ANALYSIS_SECTIONS). Spielpläne werden nur geladen, wenn ein
+    spielplanabhängiger Abschnitt (teams_detailed) abgefragt wird - reine
+    Tabellen-Abfragen (tabellen, best_teams, ...) kommen ohne einen
+    einzigen Spielplan-Request aus. Verhält sich wie ein read-only Dict.
+    """
+
+    def __init__(self, discovery: 'OptimizedClubDiscovery', club: ClubInfo,
+                 fields: Optional[Iterable[str]] = None, max_workers: int = 5):
+        fields = tuple(dict.fromkeys(ANALYSIS_SECTIONS if fields is None else fields))
+        unknown = [section for section in fields if section not in ANALYSIS_SECTIONS + EXTRA_ANALYSIS_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unbekannte Analyse-Felder: {', '.join(unknown)} "
+                             f"(erlaubt: {', '.join(ANALYSIS_SECTIONS + EXTRA_ANALYSIS_SECTIONS)})")
+
+        self.discovery = discovery
+        self.club = club
+        self.fields = fields
+        self.max_workers = max_workers
+        self.liga_lookup = {liga.liga_id: liga for liga in club.ligen}
+        self._values: Dict[str, object] = {}
+
+    def __getitem__(self, section: str):
+        if section not in self.fields:
+            raise KeyError(section)
+        if section not in self._values:
+            value = getattr(self, f'_compute_{section}')()
+            self._values[section] = list(value) if section == 'teams_detailed' else value
+        return self._values[section]
+
+    def __contains__(self, section) -> bool:
+        # Ohne Berechnung (Mapping.__contains__ ginge über __getitem__)
+        return section in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    @property
+    def needs_spielplaene(self) -> bool:
+        return analysis_needs_spielplaene(self.fields)
+
+    def load_spielplaene(self):
+        """Lädt die noch nicht gecachten Spielpläne der Club-Ligen (parallel)"""
+        missing = [liga for liga in self.club.ligen if liga.liga_id not in self.discovery.spielplan_cache]
+        if missing:
+            self.discovery._load_spielplaene(missing, self.max_workers)
+
+    def iter_sections(self):
+        """
+        (Abschnitt, Wert)-Paare in Feld-Reihenfolge; ein noch nicht
+        berechnetes teams_detailed kommt als Generator (Team für Team)
+        """
+        for section in self.fields:
+            if section == 'teams_detailed' and section not in self._values:
+                yield section, self._compute_teams_detailed()
+            else:
+                yield section, self[section]
+
+    def to_dict(self) -> Dict:
+        return {section: self[section] for section in self.fields}
+
+    def _compute_club_id(self):
+        return self.club.club_id
+
+    def _compute_club_name(self):
+        return self.club.club_name
+
+    def _compute_total_teams(self):
+        return len(self.club.teams)
+
+    def _compute_total_ligen(self):
+        return len(self.club.ligen)
+
+    def _compute_team_variations(self):
+        return [
+            {
+                'teamname': team_name,
+                'teamPermanentIds': sorted(list(variation.team_permanent_ids)),
+                'teamCompetitionIds': sorted(list(variation.team_competition_ids))
+            }
+            for team_name, variation in sorted(self.club.team_variations.items())
+        ]
+
+    def _compute_ligen_by_category(self):
+        ligen_by_category = {}
+        for liga in self.club.ligen:
+            category = f"{liga.altersklasse} {liga.geschlecht}"
+            if category not in ligen_by_category:
+                ligen_by_category[category] = []
+
+            ligen_by_category[category].append({
+                'liga_id': liga.liga_id,
+                'liga_name': liga.liga_name,
+                'spielklasse': liga.spielklasse,
+                'ebene': liga.ebene_name,
+                'verband': liga.verband_name,
+                'bezirk': liga.bezirk_name
+            })
+        return ligen_by_category
+
+    def _compute_tabellen(self):
+        return [self.discovery._team_table_entry(team, self.liga_lookup) for team in self.club.teams]
+
+    def _compute_teams_detailed(self):
+        # ERWEITERT: Teams detailliert mit Spielplan
+        self.load_spielplaene()
+        return (self.discovery._team_detail(team, self.liga_lookup) for team in self.club.teams)
+
+    def _compute_geographic_distribution(self):
+        verband_count = {}
+        bezirk_count = {}
+        ebene_count = {}
+
+        for liga in self.club.ligen:
+            verband = liga.verband_name
+            bezirk = liga.bezirk_name or "Verbandsebene"
+            ebene = liga.ebene_name
+
+            verband_count[verband] = verband_count.get(verband, 0) + 1
+            bezirk_count[bezirk] = bezirk_count.get(bezirk, 0) + 1
+            ebene_count[ebene] = ebene_count.get(ebene, 0) + 1
+
+        return {
+            'verbaende': verband_count,
+            'bezirke': bezirk_count,
+            'ebenen': ebene_count
+        }
+
+    def _compute_best_teams(self):
+        teams_with_games = [
+            t for t in self.club.teams
+            if t.get('anzspiele', 0) > 0 and t.get('rang') is not None
+        ]
+
+        teams_with_games.sort(key=lambda t: (t.get('rang', 999), -t.get('anzGewinnpunkte', 0)))
+
+        best_teams = []
+        for team in teams_with_games[:5]:
+            liga = self.liga_lookup.get(team.get('liga_id'))
+            liga_name = liga.liga_name if liga else "Unbekannte Liga"
+
+            best_teams.append({
+                'team_name': team.get('teamname'),
+                'liga_name': liga_name,
+                'rang': team.get('rang'),
+                'total_teams': team.get('total_teams'),
+                'punkte': team.get('anzGewinnpunkte'),
+                'bilanz': f"{team.get('s', 0)}:{team.get('n', 0)}",
+                'korbdifferenz': team.get('korbdiff')
+            })
+        return best_teams
+
 
 class OptimizedClubDiscovery:
     """Optimierter Club-Discovery v2.3 (FINAL)"""
 
-    def __init__(self, base_url: str = "https://www.basketball-bund.net"):
+    def __init__(self, base_url: str = "https://www.basketball-bund.net",
+                 snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH,
+                 crawl_state_path: Optional[str] = DEFAULT_CRAWL_STATE_PATH,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 store_path: Optional[str] = DEFAULT_STORE_PATH):
         self.base_url = base_url
         self.session = requests.Session()
         self.session.headers.update({
@@ -74,10 +1487,24 @@ class OptimizedClubDiscovery:
         self.liga_cache = {}
         self.team_cache = {}
         self.spielplan_cache = {}
+        self.match_index_cache: Dict[int, Dict[int, List[Dict]]] = {}  # liga_id -> team_id -> Spiele
         self.verband_cache = None
         self.verband_map = {}  # ID -> Name Mapping
         self.request_lock = threading.Lock()
         self.request_count = 0
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # Persistenter Snapshot (None = immer aus der API laden)
+        self.season = current_season()
+        self.snapshot = DiscoverySnapshot(snapshot_path, base_url) if snapshot_path else None
+        self.refresh_thread: Optional[threading.Thread] = None
+        self._stale_verbaende: Set[Optional[int]] = set()
+
+        # Crawl-Zustand pro Liga (None = jede Tabelle bei jedem Lauf neu laden)
+        self.crawl_state = LigaCrawlState(crawl_state_path, base_url) if crawl_state_path else None
+
+        # SQLite-Store (None = Ergebnisse nur im Speicher)
+        self.store = ClubStore(store_path) if store_path else None
 
         # KORRIGIERT: Keine hardcoded Suffixe mehr für Club-Namen
         self.team_number_patterns = [
@@ -86,9 +1513,21 @@ class OptimizedClubDiscovery:
             r'\s+(\d+)\.$',
             r'\s+([A-Z])$'
         ]
+        self.club_name_deriver = ClubNameDeriver(self.team_number_patterns)
 
-    def discover_clubs_by_verband(self, heimat_verband_id: int, max_workers: int = 5) -> List[ClubInfo]:
-        """Hauptmethode: Entdeckt alle Clubs in einem Verband"""
+    def discover_clubs_by_verband(self, heimat_verband_id: int, max_workers: int = 5,
+                                  incremental: bool = True, journal_path: Optional[str] = None,
+                                  fetch_spielplaene: bool = True) -> List[ClubInfo]:
+        """
+        Hauptmethode: Entdeckt alle Clubs in einem Verband
+
+        Mit incremental=True (und Crawl-Zustand) werden nur Ligen mit neuen
+        Spielen seit dem letzten Lauf neu geladen, alle anderen kommen aus dem Store.
+        Mit journal_path wird jeder Schritt in ein Arbeits-Journal geschrieben;
+        ein abgebrochener Crawl setzt beim nächsten Aufruf genau dort fort.
+        fetch_spielplaene=False verzichtet auf die Spielplan-Abrufe für den
+        Crawl-Zustand (z.B. wenn danach nur Tabellen-Felder analysiert werden).
+        """
         print(f"🏀 Club-Discovery v2.3 (FINAL) - Verband {heimat_verband_id}")
         print("=" * 70)
 
@@ -100,40 +1539,35 @@ class OptimizedClubDiscovery:
             print("❌ Keine Verbände gefunden")
             return []
 
-        # Phase 2: Liga-Discovery
-        print(f"\n🔍 Phase 2: Liga-Discovery ({len(target_verbaende)} Verbände)")
-        all_ligen = []
+        journal = None
+        if journal_path:
+            journal = CrawlJournal(journal_path, self.base_url, self.season, heimat_verband_id)
+            if journal.open():
+                print(f"   ⏯️ Setze Crawl fort: {len(journal.pages)} Verbände, "
+                      f"{len(journal.tables)} Tabellen aus Journal ({journal.path})")
 
-        for verband_id in target_verbaende:
-            ligen = self._discover_ligen_paginated(verband_id)
-            if ligen:
-                all_ligen.extend(ligen)
-                verband_name = self.verband_map.get(verband_id, f"Verband {verband_id}")
-                print(f"   ✅ {verband_name}: {len(ligen)} Liga(s)")
+        try:
+            all_ligen = self._discover_all_ligen(target_verbaende, journal)
 
-        print(f"\n📊 Insgesamt {len(all_ligen)} Liga(s) gefunden")
+            if self.refresh_snapshot_in_background():
+                print("   🔄 Snapshot veraltet - Aktualisierung läuft im Hintergrund")
 
-        if not all_ligen:
-            print("❌ Keine Ligen gefunden")
-            return []
+            if not all_ligen:
+                print("❌ Keine Ligen gefunden")
+                return []
 
-        # Phase 3: Team-Extraction
-        print(f"\n🏀 Phase 3: Team-Extraction (parallel, max_workers={max_workers})")
+            self._extract_all_teams(all_ligen, max_workers, incremental, journal, fetch_spielplaene)
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_liga = {
-                executor.submit(self._extract_teams_from_liga, liga.liga_id): liga 
-                for liga in all_ligen
-            }
+        except KeyboardInterrupt:
+            if self.crawl_state:
+                self.crawl_state.save()
+            if journal:
+                journal.close()
+                print(f"\n⏸️ Crawl unterbrochen - Fortschritt gesichert in {journal.path}")
+            raise
 
-            for future in as_completed(future_to_liga):
-                liga = future_to_liga[future]
-                try:
-                    teams = future.result()
-                    if teams:
-                        liga.teams = teams
-                except Exception as e:
-                    pass
+        if journal:
+            journal.complete()
 
         all_teams = []
         ligen_with_teams = []
@@ -151,34 +1585,294 @@ class OptimizedClubDiscovery:
         # Phase 4: Club-Derivation
         print("\n🏢 Phase 4: Club-Derivation")
         clubs = self._derive_clubs_from_teams(all_teams)
+        name_stats = self.club_name_deriver.stats()
+        print(f"   🧠 Club-Namen: {name_stats['misses']} abgeleitet, "
+              f"{name_stats['hits']} aus Cache ({name_stats['hit_rate']:.0%})")
+
+        if self.store:
+            self.store.upsert_discovery(self.season, all_ligen, clubs)
 
         print(f"\n✅ Discovery abgeschlossen: {len(clubs)} Club(s) gefunden")
         print(f"📊 API-Requests: {self.request_count}")
 
         return clubs
 
-    def _setup_target_verbaende_from_api(self, heimat_verband_id: int) -> List[int]:
-        """Lädt Verbände aus API und erstellt Mapping"""
-        if not self.verband_cache:
-            print("   🔄 Lade Verbände aus API...")
-            try:
-                response = self._make_request('POST', '/rest/wam/data', {})
-                if response and 'verbaende' in response:
-                    self.verband_cache = response['verbaende']
+    def discover_clubs_sharded(self, heimat_verband_id: int, processes: Optional[int] = None,
+                               max_workers: int = 5, rate: float = DEFAULT_REQUEST_RATE) -> List[ClubInfo]:
+        """
+        Discovery verteilt auf mehrere Prozesse
+
+        Phase 2 wird pro Verband, Phase 3 in Blöcken von SHARD_LIGA_CHUNK Ligen
+        auf Worker-Prozesse verteilt, sodass JSON-Decoding, LigaInfo-Aufbau und
+        Club-Ableitung nicht mit den Netzwerk-Threads um den GIL konkurrieren.
+        Jeder Worker hat eine eigene Session; alle teilen sich über einen
+        prozessübergreifenden RateLimiter das Budget von `rate` Requests/s.
+        Die Teil-Ergebnisse werden per clubId zusammengeführt.
+
+        Der Snapshot wird genutzt und aktualisiert; Crawl-Zustand und Journal
+        gelten nur für discover_clubs_by_verband.
+        """
+        processes = processes or os.cpu_count() or 1
+        print(f"🏀 Club-Discovery v2.3 (FINAL) - Verband {heimat_verband_id} ({processes} Prozesse, {rate:g} Req/s)")
+        print("=" * 70)
+
+        print("\n📍 Phase 1: Verband-Setup")
+        target_verbaende = self._setup_target_verbaende_from_api(heimat_verband_id)
+
+        if not target_verbaende:
+            print("❌ Keine Verbände gefunden")
+            return []
+
+        rate_limiter = RateLimiter(rate, shared=True)
+        self.rate_limiter = rate_limiter
+
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_shard_worker,
+                                 initargs=(self.base_url, self.season, rate_limiter, max_workers)) as pool:
+            # Phase 2: Liga-Listen pro Verband
+            print(f"\n🔍 Phase 2: Liga-Discovery ({len(target_verbaende)} Verbände)")
+            ligen_by_verband: Dict[int, List[LigaInfo]] = {}
+            future_to_verband = {}
+
+            for verband_id in target_verbaende:
+                ligen = self.snapshot.get_ligen(self.season, verband_id) if self.snapshot else None
+                if ligen is not None:
+                    if self.snapshot.is_stale(self.season, verband_id):
+                        self._stale_verbaende.add(verband_id)
+                    ligen_by_verband[verband_id] = ligen
+                else:
+                    future_to_verband[pool.submit(_shard_fetch_ligen, verband_id)] = verband_id
+
+            failed_verbaende = []
+            for future in as_completed(future_to_verband):
+                verband_id = future_to_verband[future]
+                try:
+                    ligen, complete, request_count = future.result()
+                except Exception as e:
+                    # z.B. BrokenProcessPool oder Pickling-Fehler im Worker
+                    print(f"   ❌ Verband {verband_id}: Liga-Discovery fehlgeschlagen ({type(e).__name__}: {e})")
+                    failed_verbaende.append(verband_id)
+                    continue
+                self.request_count += request_count
+                ligen_by_verband[verband_id] = ligen
+                if not complete:
+                    print(f"   ⚠️ Verband {verband_id}: Liga-Liste unvollständig ({len(ligen)} Ligen), "
+                          f"nicht im Snapshot gespeichert")
+                elif self.snapshot and ligen:
+                    self.snapshot.put_ligen(self.season, verband_id, ligen)
+
+            if self.snapshot and future_to_verband:
+                self.snapshot.save()
+
+            all_ligen = []
+            for verband_id in target_verbaende:
+                ligen = ligen_by_verband.get(verband_id)
+                if ligen:
+                    all_ligen.extend(ligen)
+                    verband_name = self.verband_map.get(verband_id, f"Verband {verband_id}")
+                    print(f"   ✅ {verband_name}: {len(ligen)} Liga(s)")
+
+            print(f"\n📊 Insgesamt {len(all_ligen)} Liga(s) gefunden")
+
+            if self.refresh_snapshot_in_background():
+                print("   🔄 Snapshot veraltet - Aktualisierung läuft im Hintergrund")
+
+            if not all_ligen:
+                print("❌ Keine Ligen gefunden")
+                return []
+
+            # Phase 3 + 4: Tabellen und Club-Ableitung pro Liga-Block
+            print(f"\n🏀 Phase 3: Team-Extraction ({processes} Prozesse x {max_workers} Threads)")
+            chunks = [all_ligen[i:i + SHARD_LIGA_CHUNK] for i in range(0, len(all_ligen), SHARD_LIGA_CHUNK)]
+            progress = CrawlProgress("Tabellen", len(all_ligen), lambda: self.request_count)
+            liga_lookup = {liga.liga_id: liga for liga in all_ligen}
+            partial_clubs = []
+
+            failed_ligen = 0
+            future_to_chunk = {pool.submit(_shard_extract_clubs, chunk): chunk for chunk in chunks}
+            for future in as_completed(future_to_chunk):
+                chunk = future_to_chunk[future]
+                try:
+                    tables, clubs, request_count = future.result()
+                except Exception as e:
+                    liga_ids = ', '.join(str(liga.liga_id) for liga in chunk)
+                    print(f"   ❌ Tabellen-Block fehlgeschlagen (Ligen {liga_ids}): {type(e).__name__}: {e}")
+                    failed_ligen += len(chunk)
+                    progress.update(len(chunk))
+                    continue
+                self.request_count += request_count
+                for liga_id, teams in tables.items():
+                    liga_lookup[liga_id].teams = teams
+                    self.team_cache[liga_id] = teams
+                partial_clubs.append(clubs)
+                progress.update(len(chunk))
 
-                    # Erstelle ID -> Name Mapping
-                    for verband in self.verband_cache:
-                        self.verband_map[verband['id']] = verband.get('label', verband.get('name', f"Verband {verband['id']}"))
+        team_count = sum(len(liga.teams) for liga in all_ligen if liga.teams)
+        print(f"   📋 {team_count} Team(s) aus {len(self.team_cache)} Liga(s) extrahiert")
 
-                    print(f"   ✅ {len(self.verband_cache)} Verbände geladen")
-                    print(f"   📋 Heimatverband: {self.verband_map.get(heimat_verband_id, 'Unbekannt')}")
+        if failed_verbaende or failed_ligen:
+            print(f"   ⚠️ Ergebnis unvollständig: {len(failed_verbaende)} Verband/Verbände und "
+                  f"{failed_ligen} Liga(s) fehlgeschlagen")
+
+        print("\n🏢 Phase 4: Club-Merge")
+        clubs = merge_club_infos(partial_clubs, liga_lookup)
+
+        if self.store:
+            self.store.upsert_discovery(self.season, all_ligen, clubs)
+
+        print(f"\n✅ Discovery abgeschlossen: {len(clubs)} Club(s) gefunden")
+        print(f"📊 API-Requests: {self.request_count}")
+
+        return clubs
+
+    def _discover_all_ligen(self, target_verbaende: List[int],
+                            journal: Optional[CrawlJournal] = None) -> List[LigaInfo]:
+        """Phase 2: Ligen aller Ziel-Verbände"""
+        print(f"\n🔍 Phase 2: Liga-Discovery ({len(target_verbaende)} Verbände)")
+        all_ligen = []
+        progress = CrawlProgress("Verbände", len(target_verbaende), lambda: self.request_count)
+
+        for verband_id in target_verbaende:
+            ligen = self._discover_ligen_paginated(verband_id, journal)
+            if ligen:
+                all_ligen.extend(ligen)
+                verband_name = self.verband_map.get(verband_id, f"Verband {verband_id}")
+                print(f"   ✅ {verband_name}: {len(ligen)} Liga(s)")
+            progress.update()
+
+        print(f"\n📊 Insgesamt {len(all_ligen)} Liga(s) gefunden")
+        return all_ligen
+
+    def _extract_all_teams(self, all_ligen: List[LigaInfo], max_workers: int, incremental: bool,
+                           journal: Optional[CrawlJournal] = None, fetch_spielplaene: bool = True):
+        """Phase 3: Tabellen laden (Journal -> Store -> API) und liga.teams setzen"""
+        print(f"\n🏀 Phase 3: Team-Extraction (parallel, max_workers={max_workers})")
+
+        ligen_to_fetch = []
+        for liga in all_ligen:
+            teams = journal.get_table(liga.liga_id) if journal else None
+            if teams is not None:
+                liga.teams = teams
+                self.team_cache[liga.liga_id] = teams
+            else:
+                ligen_to_fetch.append(liga)
+
+        if journal and len(ligen_to_fetch) < len(all_ligen):
+            print(f"   ⏯️ {len(all_ligen) - len(ligen_to_fetch)} Tabelle(n) aus Journal")
+
+        if incremental and self.crawl_state:
+            today = datetime.now().strftime('%Y-%m-%d')
+            stale_ligen = []
+            for liga in ligen_to_fetch:
+                if self.crawl_state.needs_refresh(self.season, liga.liga_id, today, liga.actual_match_day,
+                                                  with_spielplan=fetch_spielplaene):
+                    stale_ligen.append(liga)
                 else:
-                    print("   ❌ Keine Verbände in API-Response")
-                    return [heimat_verband_id]
+                    liga.teams = self.crawl_state.get_teams(self.season, liga.liga_id)
+                    self.team_cache[liga.liga_id] = liga.teams
+            stored = len(ligen_to_fetch) - len(stale_ligen)
+            ligen_to_fetch = stale_ligen
+
+            print(f"   ♻️ {stored} Liga(s) aus Store, "
+                  f"{len(ligen_to_fetch)} mit neuen Spielen werden geladen")
+
+        progress = CrawlProgress("Tabellen", len(ligen_to_fetch), lambda: self.request_count)
+
+        def crawl_liga(liga_id: int) -> Optional[List[Dict]]:
+            teams = self._refresh_liga(liga_id, fetch_spielplan=incremental and fetch_spielplaene)
+            # Im Worker journalisieren: auch beim Abbruch fertig geladene Tabellen bleiben erhalten
+            if journal and teams is not None:
+                journal.record_table(liga_id, teams)
+            progress.update()
+            return teams
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            future_to_liga = {
+                executor.submit(crawl_liga, liga.liga_id): liga
+                for liga in ligen_to_fetch
+            }
+
+            for future in as_completed(future_to_liga):
+                liga = future_to_liga[future]
+                try:
+                    teams = future.result()
+                    if teams:
+                        liga.teams = teams
+                except Exception as e:
+                    pass
+        finally:
+            # Bei Ctrl-C keine weiteren Tabellen starten, laufende noch abschließen
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.crawl_state and ligen_to_fetch:
+            self.crawl_state.save()
+
+    def load_verbaende(self) -> bool:
+        """
+        Lädt die Verbände: Snapshot -> API -> mitgelieferte Referenz (wam-data.json)
+
+        Returns:
+            True wenn Verbände verfügbar sind
+        """
+        if self.verband_cache:
+            return True
+
+        verbaende = self.snapshot.get_verbaende(self.season) if self.snapshot else None
+        if verbaende:
+            print(f"   ⚡ {len(verbaende)} Verbände aus Snapshot ({self.snapshot.path})")
+            if self.snapshot.is_stale(self.season):
+                self._stale_verbaende.add(None)
+        else:
+            print("   🔄 Lade Verbände aus API...")
+            try:
+                verbaende = extract_verbaende(self._make_request('POST', '/rest/wam/data', {}))
             except Exception as e:
                 print(f"   ❌ Fehler beim Laden der Verbände: {e}")
+
+            if verbaende and self.snapshot:
+                self.snapshot.put_verbaende(self.season, verbaende)
+                self.snapshot.save()
+            elif not verbaende:
+                verbaende = self._load_reference_verbaende()
+
+        if not verbaende:
+            return False
+
+        self._set_verbaende(verbaende)
+        return True
+
+    def _set_verbaende(self, verbaende: List[Dict]):
+        self.verband_cache = verbaende
+
+        # Erstelle ID -> Name Mapping
+        for verband in self.verband_cache:
+            self.verband_map[verband['id']] = verband.get('label', verband.get('name', f"Verband {verband['id']}"))
+
+        if self.store:
+            self.store.upsert_verbaende(verbaende)
+
+    def _load_reference_verbaende(self) -> Optional[List[Dict]]:
+        """Fallback: Verbände aus der mitgelieferten API-Referenz"""
+        try:
+            with open(REFERENCE_WAM_DATA_PATH, 'r', encoding='utf-8') as f:
+                verbaende = extract_verbaende(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+        if verbaende:
+            print(f"   📄 {len(verbaende)} Verbände aus Referenz-Datei (API nicht erreichbar)")
+        return verbaende
+
+    def _setup_target_verbaende_from_api(self, heimat_verband_id: int) -> List[int]:
+        """Lädt Verbände (Snapshot oder API) und erstellt Mapping"""
+        if not self.verband_cache:
+            if not self.load_verbaende():
+                print("   ❌ Keine Verbände verfügbar")
                 return [heimat_verband_id]
 
+            print(f"   ✅ {len(self.verband_cache)} Verbände geladen")
+            print(f"   📋 Heimatverband: {self.verband_map.get(heimat_verband_id, 'Unbekannt')}")
+
         all_verband_ids = [v['id'] for v in self.verband_cache if 'id' in v]
 
         # Heimat + Sonstige (id > 20, exkl. 29-33, 40, 100 = Spezial-Verbände)
@@ -194,10 +1888,55 @@ class OptimizedClubDiscovery:
 
         return target_verbaende
 
-    def _discover_ligen_paginated(self, verband_id: int) -> List[LigaInfo]:
-        """Entdeckt alle Ligen eines Verbands mit Paginierung"""
+    def _discover_ligen_paginated(self, verband_id: int, journal: Optional[CrawlJournal] = None) -> List[LigaInfo]:
+        """Entdeckt alle Ligen eines Verbands (aus Journal, Snapshot oder per Paginierung)"""
+        if journal:
+            ligen = journal.get_ligen(verband_id)
+            if ligen is not None:
+                return ligen
+
+        if self.snapshot:
+            ligen = self.snapshot.get_ligen(self.season, verband_id)
+            if ligen is not None:
+                if self.snapshot.is_stale(self.season, verband_id):
+                    self._stale_verbaende.add(verband_id)
+                return ligen
+
+        if journal:
+            start_index, ligen = journal.resume_point(verband_id)
+            fetched, complete = self._fetch_ligen_paginated(
+                verband_id, start_index,
+                on_page=lambda next_start, page, has_more: journal.record_page(verband_id, next_start, page, has_more)
+            )
+            ligen += fetched
+        else:
+            ligen, complete = self._fetch_ligen_paginated(verband_id)
+
+        # Abgebrochene Paginierung nie als vollständige Liga-Liste in den Snapshot übernehmen
+        if self.snapshot and ligen and complete:
+            self.snapshot.put_ligen(self.season, verband_id, ligen)
+            self.snapshot.save()
+        elif not complete:
+            print(f"   ⚠️ Verband {verband_id}: Liga-Liste unvollständig ({len(ligen)} Ligen), nicht im Snapshot gespeichert")
+
+        return ligen
+
+    def _fetch_ligen_paginated(self, verband_id: int, start_index: int = 0,
+                               on_page: Optional[Callable[[int, List[LigaInfo], bool], None]] = None
+                               ) -> Tuple[List[LigaInfo], bool]:
+        """
+        Lädt alle Ligen eines Verbands aus der API mit Paginierung
+
+        Args:
+            start_index: startAtIndex der ersten Seite (Fortsetzen eines Crawls)
+            on_page: Callback (nächster startAtIndex, Ligen der Seite, hasMoreData) pro Seite
+
+        Returns:
+            (Ligen, vollständig) - vollständig nur, wenn die letzte Seite
+            hasMoreData == False gemeldet hat (wie CrawlJournal.record_page)
+        """
         ligen = []
-        start_index = 0
+        complete = False
 
         while True:
             payload = {
@@ -219,6 +1958,7 @@ class OptimizedClubDiscovery:
 
                 data = response['data']
                 current_ligen = data.get('ligen', [])
+                page_ligen = []
 
                 for liga_data in current_ligen:
                     liga = LigaInfo(
@@ -231,23 +1971,85 @@ class OptimizedClubDiscovery:
                         altersklasse=liga_data.get('akName', ''),
                         geschlecht=liga_data.get('geschlecht', ''),
                         spielklasse=liga_data.get('skName', ''),
-                        ebene_name=liga_data.get('skEbeneName', '')
+                        ebene_name=liga_data.get('skEbeneName', ''),
+                        actual_match_day=(liga_data.get('actualMatchDay') or {}).get('spieltag')
                     )
-                    ligen.append(liga)
-
-                if not data.get('hasMoreData', False):
-                    break
+                    page_ligen.append(liga)
 
+                ligen.extend(page_ligen)
+                has_more = data.get('hasMoreData', False)
                 current_size = data.get('size', len(current_ligen))
                 start_index += current_size
 
+                if on_page:
+                    on_page(start_index, page_ligen, has_more)
+
+                if not has_more:
+                    complete = True
+                    break
+
                 if start_index > 5000:
                     break
 
             except Exception as e:
                 break
 
-        return ligen
+        return ligen, complete
+
+    def refresh_snapshot_in_background(self) -> Optional[threading.Thread]:
+        """
+        Aktualisiert veraltete Snapshot-Einträge in einem Hintergrund-Thread
+
+        Die Discovery arbeitet derweil mit den (veralteten) Snapshot-Daten weiter;
+        die frischen Daten gelten ab dem nächsten Start.
+        """
+        if not self.snapshot or not self._stale_verbaende:
+            return None
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            return self.refresh_thread
+
+        stale = set(self._stale_verbaende)
+        self._stale_verbaende.clear()
+
+        def refresh():
+            if None in stale:
+                verbaende = extract_verbaende(self._make_request('POST', '/rest/wam/data', {}))
+                if verbaende:
+                    self.snapshot.put_verbaende(self.season, verbaende)
+            for verband_id in sorted(v for v in stale if v is not None):
+                ligen, complete = self._fetch_ligen_paginated(verband_id)
+                if ligen and complete:
+                    self.snapshot.put_ligen(self.season, verband_id, ligen)
+            self.snapshot.save()
+
+        self.refresh_thread = threading.Thread(target=refresh, name='snapshot-refresh', daemon=True)
+        self.refresh_thread.start()
+        return self.refresh_thread
+
+    def _refresh_liga(self, liga_id: int, fetch_spielplan: bool = True) -> Optional[List[Dict]]:
+        """
+        Lädt die Tabelle neu und bei Bedarf den Spielplan (für den Crawl-Zustand)
+
+        Der Spielplan wird nur mit fetch_spielplan (inkrementeller Crawl) und
+        nur für bereits bekannte Ligen geladen - der erste Crawl einer Liga
+        kostet so nur die Tabelle, die Anstoß-Daten folgen beim nächsten
+        Refresh der Liga (neuer Spieltag, max_age). Sonst wird nur ein bereits
+        gecachter Spielplan übernommen.
+        """
+        known = self.crawl_state is not None and self.crawl_state.get_teams(self.season, liga_id) is not None
+        self.team_cache.pop(liga_id, None)
+        teams = self._extract_teams_from_liga(liga_id)
+
+        if teams is None or not self.crawl_state or not self.crawl_state.needs_spielplan(self.season, liga_id):
+            return teams
+
+        if fetch_spielplan and known:
+            self.spielplan_cache.pop(liga_id, None)
+            self._get_spielplan_for_liga(liga_id)
+        elif self.spielplan_cache.get(liga_id):
+            self.crawl_state.record_spielplan(self.season, liga_id, self.spielplan_cache[liga_id])
+
+        return teams
 
     def _extract_teams_from_liga(self, liga_id: int) -> Optional[List[Dict]]:
         """Extrahiert Teams aus entries[].team"""
@@ -287,6 +2089,9 @@ class OptimizedClubDiscovery:
                         teams.append(team_with_stats)
 
                 self.team_cache[liga_id] = teams
+                if self.crawl_state:
+                    actual_match_day = (data.get('ligaData') or {}).get('actualMatchDay') or {}
+                    self.crawl_state.record_table(self.season, liga_id, teams, actual_match_day.get('spieltag'))
                 return teams
 
         except Exception as e:
@@ -304,6 +2109,11 @@ class OptimizedClubDiscovery:
 
             if response and 'data' in response:
                 self.spielplan_cache[liga_id] = response['data']
+                self.match_index_cache.pop(liga_id, None)
+                if self.crawl_state and response['data']:
+                    self.crawl_state.record_spielplan(self.season, liga_id, response['data'])
+                if self.store and response['data']:
+                    self.store.upsert_matches(liga_id, response['data'])
                 return response['data']
 
         except Exception as e:
@@ -318,7 +2128,12 @@ class OptimizedClubDiscovery:
         """
         club_map = {}
 
-        for team, liga in teams_with_ligen:
+        # KORRIGIERT: Behält wichtige Suffixe bei (Batch über alle Teams, gecacht)
+        club_names = self.club_name_deriver.derive_many(
+            (team.get('teamname') or '').strip() for team, _ in teams_with_ligen
+        )
+
+        for (team, liga), club_name in zip(teams_with_ligen, club_names):
             club_id = team.get('clubId')
             team_name = team.get('teamname', '').strip()
             team_permanent_id = team.get('teamPermanentId')
@@ -327,9 +2142,6 @@ class OptimizedClubDiscovery:
             if not club_id or not team_name:
                 continue
 
-            # KORRIGIERT: Behält wichtige Suffixe bei
-            club_name = self._derive_club_name_improved(team_name)
-
             if club_id not in club_map:
                 club_map[club_id] = ClubInfo(
                     club_id=club_id,
@@ -379,79 +2191,45 @@ class OptimizedClubDiscovery:
         - Baskets, Basketball (Teil des Club-Namens!)
         - e.V., e. V. (Vereinsform)
         """
-        original_name = team_name.strip()
-        club_name = original_name
-
-        # Entferne nur Team-Nummern
-        for pattern in self.team_number_patterns:
-            match = re.search(pattern, club_name)
-            if match:
-                club_name = club_name[:match.start()].strip()
-                break
-
-        # Entferne nur Team-Geschlechts-Suffixe (NICHT Baskets/Basketball!)
-        gender_suffixes = [
-            ' Damen', ' Herren', ' Ladies', ' Men',
-            ' damen', ' herren', ' ladies', ' men'
-        ]
-
-        for suffix in gender_suffixes:
-            if club_name.endswith(suffix):
-                club_name = club_name[:-len(suffix)].strip()
-                break
-
-        # Normalisiere Leerzeichen
-        club_name = re.sub(r'\s+', ' ', club_name)
-
-        # Fallback
-        if len(club_name) < 3:
-            club_name = original_name
-
-        return club_name
+        return self.club_name_deriver.derive(team_name)
 
     def select_club_interactive_paginated(self, clubs: List[ClubInfo], page_size: int = 30) -> Optional[ClubInfo]:
-        """Paginierte Club-Auswahl mit Navigation"""
+        """Paginierte Club-Auswahl mit Navigation und Suche über Club-/Team-Namen"""
         if not clubs:
             print("❌ Keine Clubs gefunden")
             return None
 
         current_page = 0
         total_pages = (len(clubs) + page_size - 1) // page_size
+        club_numbers = {id(club): idx for idx, club in enumerate(clubs, start=1)}
+        search_index = None
+        show_page = True
 
         while True:
-            start_idx = current_page * page_size
-            end_idx = min(start_idx + page_size, len(clubs))
-            page_clubs = clubs[start_idx:end_idx]
-
-            print(f"\n{'=' * 70}")
-            print(f"📋 Club-Auswahl - Seite {current_page + 1}/{total_pages}")
-            print(f"   Zeige Clubs {start_idx + 1}-{end_idx} von {len(clubs)}")
-            print(f"{'=' * 70}\n")
-
-            for i, club in enumerate(page_clubs, start=1):
-                global_idx = start_idx + i
-                team_count = len(club.teams)
-                liga_count = len(club.ligen)
-
-                example_teams = sorted(list(club.team_variations.keys()))[:3]
-                teams_str = ", ".join(example_teams)
-                if len(club.team_variations) > 3:
-                    teams_str += f" (+{len(club.team_variations) - 3} weitere)"
-
-                print(f"  {global_idx:3d}. {club.club_name} (ClubID: {club.club_id})")
-                print(f"       🏀 {team_count} Team(s) in {liga_count} Liga(s)")
-                print(f"       📝 Teams: {teams_str}")
-                print()
-
-            print("\n" + "=" * 70)
-            print("Navigation:")
-            if current_page > 0:
-                print("  [z] = Zurück (vorherige Seite)")
-            if current_page < total_pages - 1:
-                print("  [v] = Vor (nächste Seite)")
-            print("  [1-999] = Direkte Auswahl via Club-Nummer")
-            print("  [q] = Beenden")
-            print("=" * 70)
+            if show_page:
+                start_idx = current_page * page_size
+                end_idx = min(start_idx + page_size, len(clubs))
+                page_clubs = clubs[start_idx:end_idx]
+
+                print(f"\n{'=' * 70}")
+                print(f"📋 Club-Auswahl - Seite {current_page + 1}/{total_pages}")
+                print(f"   Zeige Clubs {start_idx + 1}-{end_idx} von {len(clubs)}")
+                print(f"{'=' * 70}\n")
+
+                for i, club in enumerate(page_clubs, start=1):
+                    self._print_club_choice(start_idx + i, club)
+
+                print("\n" + "=" * 70)
+                print("Navigation:")
+                if current_page > 0:
+                    print("  [z] = Zurück (vorherige Seite)")
+                if current_page < total_pages - 1:
+                    print("  [v] = Vor (nächste Seite)")
+                print("  [1-999] = Direkte Auswahl via Club-Nummer")
+                print("  [Text] = Suche nach Club- oder Team-Name (z.B. 'wurzburg')")
+                print("  [q] = Beenden")
+                print("=" * 70)
+            show_page = True
 
             try:
                 choice = input(f"\n🎯 Auswahl: ").strip().lower()
@@ -472,228 +2250,252 @@ class OptimizedClubDiscovery:
                         return selected_club
                     else:
                         print(f"❌ Ungültige Nummer. Bitte 1-{len(clubs)} eingeben.")
+                elif len(choice) >= 2:
+                    if search_index is None:
+                        search_index = ClubSearchIndex(clubs)
+                    results = search_index.search(choice)
+                    if results:
+                        print(f"\n🔎 {len(results)} Treffer für '{choice}':\n")
+                        for club, score in results:
+                            self._print_club_choice(club_numbers[id(club)], club)
+                        print("   Nummer eingeben zur Auswahl, Enter = zurück zur Liste")
+                    else:
+                        print(f"🔎 Keine Treffer für '{choice}'")
+                    show_page = False
+                elif not choice:
+                    continue
                 else:
-                    print("❌ Ungültige Eingabe. Bitte 'z', 'v', Nummer oder 'q' eingeben.")
+                    print("❌ Ungültige Eingabe. Bitte 'z', 'v', Nummer, Suchtext oder 'q' eingeben.")
 
             except (ValueError, KeyboardInterrupt):
                 print("\n🚫 Abgebrochen")
                 return None
 
-    def analyze_club_complete(self, club: ClubInfo) -> Dict:
+    def _print_club_choice(self, number: int, club: ClubInfo):
+        team_count = len(club.teams)
+        liga_count = len(club.ligen)
+
+        example_teams = sorted(list(club.team_variations.keys()))[:3]
+        teams_str = ", ".join(example_teams)
+        if len(club.team_variations) > 3:
+            teams_str += f" (+{len(club.team_variations) - 3} weitere)"
+
+        print(f"  {number:3d}. {club.club_name} (ClubID: {club.club_id})")
+        print(f"       🏀 {team_count} Team(s) in {liga_count} Liga(s)")
+        print(f"       📝 Teams: {teams_str}")
+        print()
+
+    def analyze_club(self, club: ClubInfo, fields: Optional[Iterable[str]] = None,
+                     max_workers: int = 5) -> ClubAnalysis:
+        """
+        Lazy Club-Analyse ohne Konsolen-Ausgabe
+
+        Abschnitte werden erst beim Zugriff berechnet, fields schränkt sie
+        ein (z.B. ['club_name', 'tabellen'] - ohne Spielplan-Request).
+        """
+        return ClubAnalysis(self, club, fields, max_workers)
+
+    def analyze_club_complete(self, club: ClubInfo, fields: Optional[Iterable[str]] = None) -> Dict:
         """
         ERWEITERT: Vollständige Club-Analyse mit Spielplan-Details
+
+        Mit fields nur die gewünschten Abschnitte; Spielpläne werden nur
+        geladen, wenn teams_detailed dabei ist.
         """
         print(f"\n📊 Vollständige Analyse: {club.club_name}")
         print("=" * 70)
-        print("\n🔄 Lade Spielpläne für alle Ligen...")
 
-        # Lade alle Spielpläne parallel
-        liga_lookup = {liga.liga_id: liga for liga in club.ligen}
+        lazy_analysis = self.analyze_club(club, fields)
+        if lazy_analysis.needs_spielplaene:
+            print("\n🔄 Lade Spielpläne für alle Ligen...")
+            lazy_analysis.load_spielplaene()
+            print("✅ Spielpläne geladen\n")
+
+        analysis = lazy_analysis.to_dict()
+        self._print_analysis_summary(analysis)
+        return analysis
+
+    def _print_analysis_summary(self, analysis: Dict):
+        """Konsolen-Zusammenfassung (nur für die enthaltenen Abschnitte)"""
+        print(f"📊 Zusammenfassung:")
+        if 'club_id' in analysis:
+            print(f"   🆔 Club-ID: {analysis['club_id']}")
+        if 'total_teams' in analysis:
+            print(f"   🏀 Teams: {analysis['total_teams']}")
+        if 'total_ligen' in analysis:
+            print(f"   🏆 Ligen: {analysis['total_ligen']}")
+        if 'team_variations' in analysis:
+            print(f"   📝 Team-Varianten: {len(analysis['team_variations'])}")
+
+        if 'best_teams' in analysis:
+            print(f"\n🏆 Top {min(5, len(analysis['best_teams']))} Teams:")
+            for team in analysis['best_teams']:
+                print(f"   {team['rang']:2d}/{team['total_teams']:2d}. {team['team_name']} ({team['liga_name']})")
+                print(f"       Bilanz: {team['bilanz']}, Punkte: {team['punkte']}, Korbdiff: {team['korbdifferenz']:+d}")
+
+        if 'ligen_by_category' in analysis:
+            print(f"\n🏀 Teams nach Kategorie:")
+            for category, ligen in sorted(analysis['ligen_by_category'].items()):
+                print(f"   {category}: {len(ligen)} Liga(s)")
+
+        if analysis.get('tabellen'):
+            print(f"\n📋 Tabellenplätze:")
+            for team in analysis['tabellen']:
+                print(f"   {team['tabelle']['position_text']:>7}  {team['team_name']} ({team['liga_name']})")
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
+        # Zeige Details für erstes Team als Beispiel
+        if analysis.get('teams_detailed'):
+            first_team = analysis['teams_detailed'][0]
+            print(f"\n📋 Beispiel Team-Details: {first_team['team_name']}")
+            print(f"   Tabelle: Rang {first_team['tabelle']['position_text']}")
+            print(f"   Spiele Gesamt: {first_team['spiele']['gesamt']['gespielt']} gespielt, {first_team['spiele']['gesamt']['anstehend']} anstehend")
+            print(f"   Spiele Heim: {first_team['spiele']['heim']['gespielt']} gespielt, {first_team['spiele']['heim']['anstehend']} anstehend")
+            print(f"   Spiele Auswärts: {first_team['spiele']['auswaerts']['gespielt']} gespielt, {first_team['spiele']['auswaerts']['anstehend']} anstehend")
+
+            if first_team['naechste_spiele']:
+                print(f"   Nächste Spiele:")
+                for game in first_team['naechste_spiele'][:2]:
+                    print(f"      • {game['date']} {game['time']}: {game['home_team']} vs {game['away_team']}")
+                    print(f"        Ort: {game['venue']}, Liga: {game['liga_name']}")
+
+
+    def _load_spielplaene(self, ligen: List[LigaInfo], max_workers: int = 5):
+        """Lädt die Spielpläne mehrerer Ligen parallel in den spielplan_cache"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_liga = {
                 executor.submit(self._get_spielplan_for_liga, liga.liga_id): liga.liga_id
-                for liga in club.ligen
+                for liga in ligen
             }
 
             for future in as_completed(future_to_liga):
                 pass  # Spielpläne werden gecacht
 
-        print("✅ Spielpläne geladen\n")
-
-        analysis = {
-            'club_id': club.club_id,
-            'club_name': club.club_name,
-            'total_teams': len(club.teams),
-            'total_ligen': len(club.ligen),
-            'team_variations': [],
-            'ligen_by_category': {},
-            'teams_detailed': [],  # ERWEITERT
-            'geographic_distribution': {},
-            'best_teams': []
-        }
+    def preload_spielplaene(self, clubs: List[ClubInfo], max_workers: int = 5) -> int:
+        """
+        Lädt die Spielpläne aller Ligen mehrerer Clubs in einer parallelen Welle
 
-        # Team-Variations
-        for team_name, variation in sorted(club.team_variations.items()):
-            analysis['team_variations'].append({
-                'teamname': team_name,
-                'teamPermanentIds': sorted(list(variation.team_permanent_ids)),
-                'teamCompetitionIds': sorted(list(variation.team_competition_ids))
-            })
+        Bildet die Vereinigung der Ligen, lädt jeden noch nicht gecachten
+        Spielplan genau einmal (statt einer Welle pro Club) und baut pro Liga
+        einmal den Match-Index. Ein ganzer Verband kostet so einen Request
+        pro Liga.
 
-        # Kategorisierung der Ligen
-        for liga in club.ligen:
-            category = f"{liga.altersklasse} {liga.geschlecht}"
-            if category not in analysis['ligen_by_category']:
-                analysis['ligen_by_category'][category] = []
+        Returns:
+            Anzahl neu geladener Spielpläne
+        """
+        ligen = list({liga.liga_id: liga for club in clubs for liga in club.ligen}.values())
+        missing = [liga for liga in ligen if liga.liga_id not in self.spielplan_cache]
 
-            analysis['ligen_by_category'][category].append({
-                'liga_id': liga.liga_id,
-                'liga_name': liga.liga_name,
-                'spielklasse': liga.spielklasse,
-                'ebene': liga.ebene_name,
-                'verband': liga.verband_name,
-                'bezirk': liga.bezirk_name
-            })
+        print(f"\n📊 Spielpläne: {len(clubs)} Club(s), {len(ligen)} Liga(s), {len(missing)} zu laden")
+        self._load_spielplaene(missing, max_workers)
 
-        # ERWEITERT: Teams detailliert mit Spielplan
-        for team in club.teams:
-            liga = liga_lookup.get(team.get('liga_id'))
-            spielplan = self.spielplan_cache.get(team.get('liga_id'))
+        for liga in ligen:
+            self._get_match_index(liga.liga_id, liga)
+        return len(missing)
 
-            # Extrahiere Team-Spiele aus Spielplan
-            team_matches = self._extract_team_matches(
-                team.get('seasonTeamId') or team.get('teamCompetitionId'),
-                spielplan
-            )
+    def analyze_clubs(self, clubs: List[ClubInfo], max_workers: int = 5,
+                      fields: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Batch-Analyse vieler Clubs mit gemeinsamem Spielplan-Abruf
 
-            # Analysiere Spiele
-            game_stats = self._analyze_team_games(team_matches)
+        Spielpläne werden vorab über preload_spielplaene in einer Welle geladen
+        (ohne teams_detailed in fields gar nicht); die Analysen werden danach
+        einzeln erzeugt, sodass nie alle gleichzeitig im Speicher liegen.
 
-            team_detail = {
-                'team_name': team.get('teamname'),
-                'team_name_small': team.get('teamnameSmall'),
-                'team_permanent_id': team.get('teamPermanentId'),
-                'season_team_id': team.get('seasonTeamId'),
-                'liga_id': team.get('liga_id'),
-                'liga_name': liga.liga_name if liga else None,
-
-                # Tabellen-Position
-                'tabelle': {
-                    'rang': team.get('rang'),
-                    'total_teams': team.get('total_teams'),
-                    'position_text': f"{team.get('rang')}/{team.get('total_teams')}"
-                },
-
-                # Spiel-Statistiken
-                'spiele': {
-                    'gesamt': {
-                        'gespielt': game_stats['played_total'],
-                        'anstehend': game_stats['upcoming_total']
-                    },
-                    'heim': {
-                        'gespielt': game_stats['played_home'],
-                        'anstehend': game_stats['upcoming_home']
-                    },
-                    'auswaerts': {
-                        'gespielt': game_stats['played_away'],
-                        'anstehend': game_stats['upcoming_away']
-                    }
-                },
-
-                # Nächste Spiele
-                'naechste_spiele': game_stats['next_games'],
-
-                # Tabellen-Stats
-                'statistik': {
-                    'siege': team.get('s'),
-                    'niederlagen': team.get('n'),
-                    'punkte': team.get('anzGewinnpunkte'),
-                    'koerbe': team.get('koerbe'),
-                    'gegen_koerbe': team.get('gegenKoerbe'),
-                    'korbdifferenz': team.get('korbdiff')
-                }
-            }
+        Returns:
+            Iterator über Analyse-Dicts in der Reihenfolge von clubs (Format wie analyze_club_complete)
+        """
+        if clubs and analysis_needs_spielplaene(fields):
+            self.preload_spielplaene(clubs, max_workers)
 
-            analysis['teams_detailed'].append(team_detail)
+        for club in clubs:
+            yield ClubAnalysis(self, club, fields, max_workers).to_dict()
 
-        # Beste Teams
-        teams_with_games = [
-            t for t in club.teams 
-            if t.get('anzspiele', 0) > 0 and t.get('rang') is not None
-        ]
+    def iter_club_analysis(self, club: ClubInfo, fields: Optional[Iterable[str]] = None,
+                           max_workers: int = 5):
+        """
+        Club-Analyse Abschnitt für Abschnitt: liefert (Abschnitt, Wert) in der
+        Reihenfolge des Analyse-Dicts (bzw. von fields)
 
-        teams_with_games.sort(key=lambda t: (t.get('rang', 999), -t.get('anzGewinnpunkte', 0)))
+        'teams_detailed' ist ein Generator (ein Team nach dem anderen), damit
+        Exporte (AnalysisStreamWriter) nie die komplette Analyse im Speicher
+        halten. Fehlende Spielpläne werden erst dafür geladen.
+        """
+        return ClubAnalysis(self, club, fields, max_workers).iter_sections()
 
-        for team in teams_with_games[:5]:
-            liga = liga_lookup.get(team.get('liga_id'))
-            liga_name = liga.liga_name if liga else "Unbekannte Liga"
+    def _team_table_entry(self, team: Dict, liga_lookup: Dict[int, LigaInfo]) -> Dict:
+        """Tabellen-Eintrag eines Teams (Rang, Bilanz) - braucht keinen Spielplan"""
+        liga = liga_lookup.get(team.get('liga_id'))
 
-            analysis['best_teams'].append({
-                'team_name': team.get('teamname'),
-                'liga_name': liga_name,
+        return {
+            'team_name': team.get('teamname'),
+            'team_name_small': team.get('teamnameSmall'),
+            'team_permanent_id': team.get('teamPermanentId'),
+            'season_team_id': team.get('seasonTeamId'),
+            'liga_id': team.get('liga_id'),
+            'liga_name': liga.liga_name if liga else None,
+
+            # Tabellen-Position
+            'tabelle': {
                 'rang': team.get('rang'),
                 'total_teams': team.get('total_teams'),
+                'position_text': f"{team.get('rang')}/{team.get('total_teams')}"
+            },
+
+            # Tabellen-Stats
+            'statistik': {
+                'siege': team.get('s'),
+                'niederlagen': team.get('n'),
                 'punkte': team.get('anzGewinnpunkte'),
-                'bilanz': f"{team.get('s', 0)}:{team.get('n', 0)}",
+                'koerbe': team.get('koerbe'),
+                'gegen_koerbe': team.get('gegenKoerbe'),
                 'korbdifferenz': team.get('korbdiff')
-            })
-
-        # Geografische Verteilung
-        verband_count = {}
-        bezirk_count = {}
-        ebene_count = {}
-
-        for liga in club.ligen:
-            verband = liga.verband_name
-            bezirk = liga.bezirk_name or "Verbandsebene"
-            ebene = liga.ebene_name
-
-            verband_count[verband] = verband_count.get(verband, 0) + 1
-            bezirk_count[bezirk] = bezirk_count.get(bezirk, 0) + 1
-            ebene_count[ebene] = ebene_count.get(ebene, 0) + 1
-
-        analysis['geographic_distribution'] = {
-            'verbaende': verband_count,
-            'bezirke': bezirk_count,
-            'ebenen': ebene_count
+            }
         }
 
-        # Ausgabe
-        print(f"📊 Zusammenfassung:")
-        print(f"   🆔 Club-ID: {analysis['club_id']}")
-        print(f"   🏀 Teams: {analysis['total_teams']}")
-        print(f"   🏆 Ligen: {analysis['total_ligen']}")
-        print(f"   📝 Team-Varianten: {len(analysis['team_variations'])}")
-
-        print(f"\n🏆 Top {min(5, len(analysis['best_teams']))} Teams:")
-        for team in analysis['best_teams']:
-            print(f"   {team['rang']:2d}/{team['total_teams']:2d}. {team['team_name']} ({team['liga_name']})")
-            print(f"       Bilanz: {team['bilanz']}, Punkte: {team['punkte']}, Korbdiff: {team['korbdifferenz']:+d}")
-
-        print(f"\n🏀 Teams nach Kategorie:")
-        for category, ligen in sorted(analysis['ligen_by_category'].items()):
-            print(f"   {category}: {len(ligen)} Liga(s)")
-
-        # Zeige Details für erstes Team als Beispiel
-        if analysis['teams_detailed']:
-            first_team = analysis['teams_detailed'][0]
-            print(f"\n📋 Beispiel Team-Details: {first_team['team_name']}")
-            print(f"   Tabelle: Rang {first_team['tabelle']['position_text']}")
-            print(f"   Spiele Gesamt: {first_team['spiele']['gesamt']['gespielt']} gespielt, {first_team['spiele']['gesamt']['anstehend']} anstehend")
-            print(f"   Spiele Heim: {first_team['spiele']['heim']['gespielt']} gespielt, {first_team['spiele']['heim']['anstehend']} anstehend")
-            print(f"   Spiele Auswärts: {first_team['spiele']['auswaerts']['gespielt']} gespielt, {first_team['spiele']['auswaerts']['anstehend']} anstehend")
-
-            if first_team['naechste_spiele']:
-                print(f"   Nächste Spiele:")
-                for game in first_team['naechste_spiele'][:2]:
-                    print(f"      • {game['date']} {game['time']}: {game['home_team']} vs {game['away_team']}")
-                    print(f"        Ort: {game['venue']}, Liga: {game['liga_name']}")
-
-        return analysis
-
-    def _extract_team_matches(self, team_id: int, spielplan: Optional[Dict]) -> List[Dict]:
-        """Extrahiert alle Spiele eines Teams aus Spielplan"""
-        if not spielplan or not team_id:
-            return []
-
-        matches = []
-        games = spielplan.get('games', []) or spielplan.get('spielplan', {}).get('games', [])
-
-        for game in games:
-            home_team = game.get('homeTeam', {})
-            away_team = game.get('awayTeam', {})
-
-            home_id = home_team.get('seasonTeamId') or home_team.get('teamCompetitionId')
-            away_id = away_team.get('seasonTeamId') or away_team.get('teamCompetitionId')
-
-            if team_id in [home_id, away_id]:
-                matches.append({
-                    **game,
-                    'is_home': (team_id == home_id)
-                })
+    def _team_detail(self, team: Dict, liga_lookup: Dict[int, LigaInfo]) -> Dict:
+        """Detail-Eintrag eines Teams (Tabelle, Spiele, nächste Spiele, Statistik)"""
+        liga = liga_lookup.get(team.get('liga_id'))
+
+        # Team-Spiele aus dem Match-Index der Liga (einmal pro Spielplan aufgebaut)
+        team_id = team.get('seasonTeamId') or team.get('teamCompetitionId')
+        team_matches = self._get_match_index(team.get('liga_id'), liga).get(team_id, []) if team_id else []
+
+        # Analysiere Spiele
+        game_stats = self._analyze_team_games(team_matches)
+
+        detail = self._team_table_entry(team, liga_lookup)
+        statistik = detail.pop('statistik')
+
+        # Spiel-Statistiken
+        detail['spiele'] = {
+            'gesamt': {
+                'gespielt': game_stats['played_total'],
+                'anstehend': game_stats['upcoming_total']
+            },
+            'heim': {
+                'gespielt': game_stats['played_home'],
+                'anstehend': game_stats['upcoming_home']
+            },
+            'auswaerts': {
+                'gespielt': game_stats['played_away'],
+                'anstehend': game_stats['upcoming_away']
+            }
+        }
 
-        return matches
+        # Nächste Spiele
+        detail['naechste_spiele'] = game_stats['next_games']
+        detail['statistik'] = statistik
+        return detail
+
+    def _get_match_index(self, liga_id: Optional[int], liga: Optional[LigaInfo] = None) -> Dict[int, List[Dict]]:
+        """Match-Index (team_id -> Spiele) einer Liga aus dem gecachten Spielplan"""
+        index = self.match_index_cache.get(liga_id)
+        if index is None:
+            spielplan = self.spielplan_cache.get(liga_id)
+            index = build_match_index(spielplan, liga.liga_name if liga else '')
+            if spielplan is not None:
+                self.match_index_cache[liga_id] = index
+        return index
 
     def _analyze_team_games(self, matches: List[Dict]) -> Dict:
         """
@@ -716,13 +2518,18 @@ class OptimizedClubDiscovery:
         for match in matches:
             is_home = match.get('is_home', False)
 
-            # Prüfe ob Spiel gespielt wurde
-            has_result = match.get('homeScore') is not None and match.get('awayScore') is not None
+            # Abgesagte Spiele zählen weder als gespielt noch als anstehend
+            if match.get('abgesagt'):
+                continue
+
+            # Prüfe ob Spiel gespielt wurde (REST: result "85:72")
+            has_result = (match.get('homeScore') is not None and match.get('awayScore') is not None) \
+                or bool(match.get('result'))
             status = match.get('status', '')
 
-            # Datum parsen
-            date_str = match.get('date', '')
-            time_str = match.get('time', '00:00')
+            # Datum parsen (REST: kickoffDate/kickoffTime)
+            date_str = match.get('date') or match.get('kickoffDate') or ''
+            time_str = match.get('time') or match.get('kickoffTime') or '00:00'
             game_datetime = None
 
             try:
@@ -754,10 +2561,10 @@ class OptimizedClubDiscovery:
                         'date': date_str,
                         'time': time_str,
                         'datetime': game_datetime,
-                        'home_team': match.get('homeTeam', {}).get('teamname', 'Unbekannt'),
-                        'away_team': match.get('awayTeam', {}).get('teamname', 'Unbekannt'),
-                        'venue': match.get('venue', {}).get('name', 'Unbekannt'),
-                        'venue_address': match.get('venue', {}).get('address', ''),
+                        'home_team': (match.get('homeTeam') or {}).get('teamname', 'Unbekannt'),
+                        'away_team': (match.get('guestTeam') or match.get('awayTeam') or {}).get('teamname', 'Unbekannt'),
+                        'venue': (match.get('venue') or {}).get('name', 'Unbekannt'),
+                        'venue_address': (match.get('venue') or {}).get('address', ''),
                         'liga_name': match.get('liga_name', ''),
                         'is_home': is_home
                     })
@@ -779,7 +2586,7 @@ class OptimizedClubDiscovery:
         """Request mit optimiertem Rate Limiting"""
         with self.request_lock:
             self.request_count += 1
-            time.sleep(0.1)
+        self.rate_limiter.acquire()
 
         try:
             if endpoint_or_url.startswith('http'):
@@ -798,14 +2605,361 @@ class OptimizedClubDiscovery:
         except requests.RequestException as e:
             return None
 
+# Shard-Worker (ein OptimizedClubDiscovery pro Prozess, eigene Session)
+_shard_discovery: Optional[OptimizedClubDiscovery] = None
+_shard_max_workers = 5
+
+
+def _init_shard_worker(base_url: str, season: int, rate_limiter: RateLimiter, max_workers: int):
+    global _shard_discovery, _shard_max_workers
+    _shard_discovery = OptimizedClubDiscovery(base_url, snapshot_path=None, crawl_state_path=None,
+                                              rate_limiter=rate_limiter, store_path=None)
+    _shard_discovery.season = season
+    _shard_max_workers = max_workers
+
+
+def _shard_fetch_ligen(verband_id: int) -> Tuple[List[LigaInfo], bool, int]:
+    """Worker: paginiert die Ligen eines Verbands -> (Ligen, vollständig, Anzahl Requests)"""
+    requests_before = _shard_discovery.request_count
+    ligen, complete = _shard_discovery._fetch_ligen_paginated(verband_id)
+    return ligen, complete, _shard_discovery.request_count - requests_before
+
+
+def _shard_extract_clubs(ligen: List[LigaInfo]) -> Tuple[Dict[int, List[Dict]], List[ClubInfo], int]:
+    """Worker: lädt die Tabellen eines Liga-Blocks und leitet daraus Clubs ab"""
+    discovery = _shard_discovery
+    requests_before = discovery.request_count
+
+    with ThreadPoolExecutor(max_workers=_shard_max_workers) as executor:
+        for liga, teams in zip(ligen, executor.map(discovery._extract_teams_from_liga,
+                                                   [liga.liga_id for liga in ligen])):
+            liga.teams = teams
+
+    tables = {liga.liga_id: liga.teams for liga in ligen if liga.teams}
+    clubs = discovery._derive_clubs_from_teams(
+        [(team, liga) for liga in ligen if liga.teams for team in liga.teams]
+    )
+    return tables, clubs, discovery.request_count - requests_before
+
+
+def merge_club_infos(partials: Iterable[List[ClubInfo]],
+                     liga_lookup: Optional[Dict[int, LigaInfo]] = None) -> List[ClubInfo]:
+    """
+    Führt Teil-Ergebnisse (z.B. aus Shard-Workern) per clubId zusammen
+
+    Regeln wie in _derive_clubs_from_teams: kürzester Club-Name gewinnt,
+    Team-Varianten werden vereinigt, Ligen nur einmal pro Club. Mit liga_lookup
+    werden die Ligen auf die LigaInfo-Objekte des Aufrufers abgebildet.
+    """
+    club_map: Dict[int, ClubInfo] = {}
+
+    for clubs in partials:
+        for club in clubs:
+            ligen = [liga_lookup.get(liga.liga_id, liga) for liga in club.ligen] if liga_lookup else club.ligen
+            merged = club_map.get(club.club_id)
+
+            if merged is None:
+                club_map[club.club_id] = ClubInfo(
+                    club_id=club.club_id,
+                    club_name=club.club_name,
+                    team_variations=dict(club.team_variations),
+                    ligen=list(ligen),
+                    teams=list(club.teams)
+                )
+                continue
+
+            if len(club.club_name) < len(merged.club_name):
+                merged.club_name = club.club_name
+
+            for team_name, variation in club.team_variations.items():
+                existing = merged.team_variations.get(team_name)
+                if existing is None:
+                    merged.team_variations[team_name] = variation
+                else:
+                    existing.team_permanent_ids |= variation.team_permanent_ids
+                    existing.team_competition_ids |= variation.team_competition_ids
+
+            merged.teams.extend(club.teams)
+            known_liga_ids = {liga.liga_id for liga in merged.ligen}
+            merged.ligen.extend(liga for liga in ligen if liga.liga_id not in known_liga_ids)
+
+    clubs = list(club_map.values())
+    clubs.sort(key=lambda c: len(c.teams), reverse=True)
+
+    return clubs
+
+def _parse_result(result: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """'85:72' -> (85, 72); ohne Ergebnis (None, None)"""
+    try:
+        home, guest = result.split(':')
+        return int(home), int(guest)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def _kickoff_date(value: Optional[str]):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def export_discovery_parquet(discovery: OptimizedClubDiscovery, clubs: List[ClubInfo],
+                             out_dir: str = DEFAULT_PARQUET_DIR) -> Dict[str, int]:
+    """
+    Exportiert einen Discovery-Lauf spaltenorientiert als Parquet-Datasets
+
+    Drei Datasets unter out_dir (Hive-partitioniert: season=.../verband_id=...):
+        ligen/    eine Zeile pro Liga
+        teams/    eine Zeile pro Team mit Club und Tabellen-Statistik
+        matches/  eine Zeile pro Spiel aus allen geladenen Spielplänen (mit Scores)
+
+    String-Spalten werden dictionary-kodiert, damit wiederholte Werte (Liga-,
+    Verbands-, Team-Namen) nur einmal gespeichert werden. Ein erneuter Export
+    ersetzt die betroffenen Partitionen.
+
+    Returns:
+        Zeilen pro Dataset
+    """
+    if pa is None:
+        raise RuntimeError("Parquet-Export benötigt pyarrow (pip install pyarrow)")
+
+    season = discovery.season
+    ligen: Dict[int, LigaInfo] = {}
+    club_names: Dict[int, str] = {}
+    for club in clubs:
+        club_names[club.club_id] = club.club_name
+        for liga in club.ligen:
+            ligen.setdefault(liga.liga_id, liga)
+
+    liga_columns = defaultdict(list)
+    for liga in ligen.values():
+        liga_columns['season'].append(season)
+        liga_columns['verband_id'].append(liga.verband_id)
+        liga_columns['liga_id'].append(liga.liga_id)
+        liga_columns['liga_name'].append(liga.liga_name)
+        liga_columns['verband_name'].append(liga.verband_name)
+        liga_columns['bezirk_name'].append(liga.bezirk_name)
+        liga_columns['kreis_name'].append(liga.kreis_name)
+        liga_columns['altersklasse'].append(liga.altersklasse)
+        liga_columns['geschlecht'].append(liga.geschlecht)
+        liga_columns['spielklasse'].append(liga.spielklasse)
+        liga_columns['ebene_name'].append(liga.ebene_name)
+        liga_columns['team_count'].append(len(liga.teams or []))
+
+    team_columns = defaultdict(list)
+    for club in clubs:
+        for team in club.teams:
+            liga = ligen.get(team.get('liga_id'))
+            team_columns['season'].append(season)
+            team_columns['verband_id'].append(liga.verband_id if liga else None)
+            team_columns['liga_id'].append(team.get('liga_id'))
+            team_columns['club_id'].append(club.club_id)
+            team_columns['club_name'].append(club.club_name)
+            team_columns['season_team_id'].append(team.get('seasonTeamId') or team.get('teamCompetitionId'))
+            team_columns['team_permanent_id'].append(team.get('teamPermanentId'))
+            team_columns['teamname'].append(team.get('teamname'))
+            team_columns['rang'].append(team.get('rang'))
+            team_columns['total_teams'].append(team.get('total_teams'))
+            team_columns['anzspiele'].append(team.get('anzspiele'))
+            team_columns['gewinnpunkte'].append(team.get('anzGewinnpunkte'))
+            team_columns['verlustpunkte'].append(team.get('anzVerlustpunkte'))
+            team_columns['siege'].append(team.get('s'))
+            team_columns['niederlagen'].append(team.get('n'))
+            team_columns['koerbe'].append(team.get('koerbe'))
+            team_columns['gegen_koerbe'].append(team.get('gegenKoerbe'))
+            team_columns['korbdiff'].append(team.get('korbdiff'))
+
+    match_columns = defaultdict(list)
+    for liga_id, liga in ligen.items():
+        spielplan = discovery.spielplan_cache.get(liga_id)
+        for match in (spielplan or {}).get('matches') or []:
+            home_team = match.get('homeTeam') or {}
+            guest_team = match.get('guestTeam') or {}
+            home_score, guest_score = _parse_result(match.get('result'))
+            match_columns['season'].append(season)
+            match_columns['verband_id'].append(liga.verband_id)
+            match_columns['liga_id'].append(liga_id)
+            match_columns['match_id'].append(match.get('matchId'))
+            match_columns['match_day'].append(match.get('matchDay'))
+            match_columns['kickoff_date'].append(_kickoff_date(match.get('kickoffDate')))
+            match_columns['kickoff_time'].append(match.get('kickoffTime'))
+            match_columns['home_team_id'].append(home_team.get('seasonTeamId') or home_team.get('teamCompetitionId'))
+            match_columns['home_team_name'].append(home_team.get('teamname'))
+            match_columns['guest_team_id'].append(guest_team.get('seasonTeamId') or guest_team.get('teamCompetitionId'))
+            match_columns['guest_team_name'].append(guest_team.get('teamname'))
+            match_columns['home_score'].append(home_score)
+            match_columns['guest_score'].append(guest_score)
+            match_columns['abgesagt'].append(bool(match.get('abgesagt')))
+            match_columns['verzicht'].append(bool(match.get('verzicht')))
+
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    schemas = {
+        'ligen': pa.schema([
+            ('season', pa.int16()), ('verband_id', pa.int32()), ('liga_id', pa.int64()),
+            ('liga_name', dict_string), ('verband_name', dict_string), ('bezirk_name', dict_string),
+            ('kreis_name', dict_string), ('altersklasse', dict_string), ('geschlecht', dict_string),
+            ('spielklasse', dict_string), ('ebene_name', dict_string), ('team_count', pa.int16()),
+        ]),
+        'teams': pa.schema([
+            ('season', pa.int16()), ('verband_id', pa.int32()), ('liga_id', pa.int64()),
+            ('club_id', pa.int64()), ('club_name', dict_string), ('season_team_id', pa.int64()),
+            ('team_permanent_id', pa.int64()), ('teamname', dict_string), ('rang', pa.int16()),
+            ('total_teams', pa.int16()), ('anzspiele', pa.int16()), ('gewinnpunkte', pa.int16()),
+            ('verlustpunkte', pa.int16()), ('siege', pa.int16()), ('niederlagen', pa.int16()),
+            ('koerbe', pa.int32()), ('gegen_koerbe', pa.int32()), ('korbdiff', pa.int32()),
+        ]),
+        'matches': pa.schema([
+            ('season', pa.int16()), ('verband_id', pa.int32()), ('liga_id', pa.int64()),
+            ('match_id', pa.int64()), ('match_day', pa.int16()), ('kickoff_date', pa.date32()),
+            ('kickoff_time', dict_string), ('home_team_id', pa.int64()), ('home_team_name', dict_string),
+            ('guest_team_id', pa.int64()), ('guest_team_name', dict_string), ('home_score', pa.int16()),
+            ('guest_score', pa.int16()), ('abgesagt', pa.bool_()), ('verzicht', pa.bool_()),
+        ]),
+    }
+
+    partitioning = pa_dataset.partitioning(
+        pa.schema([('season', pa.int16()), ('verband_id', pa.int32())]), flavor='hive'
+    )
+    write_options = pa_dataset.ParquetFileFormat().make_write_options(compression='zstd', use_dictionary=True)
+
+    row_counts = {}
+    for name, columns in (('ligen', liga_columns), ('teams', team_columns), ('matches', match_columns)):
+        schema = schemas[name]
+        table = pa.table({field.name: columns.get(field.name, []) for field in schema}, schema=schema)
+        pa_dataset.write_dataset(
+            table, os.path.join(out_dir, name), format='parquet', partitioning=partitioning,
+            file_options=write_options, basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching'
+        )
+        row_counts[name] = table.num_rows
+
+    return row_counts
+
+
+class AnalysisStreamWriter:
+    """
+    Schreibt Club-Analysen als kompaktes JSON (Array) oder NDJSON (eine Zeile pro Club)
+
+    Abschnitte werden geschrieben, sobald sie geliefert werden; Abschnitte,
+    deren Wert ein Iterator ist (teams_detailed aus iter_club_analysis),
+    werden Element für Element als Array gestreamt. Endet der Pfad auf .gz,
+    wird gzip-komprimiert (oder explizit über compress).
+    """
+
+    FORMATS = ('json', 'ndjson')
+
+    def __init__(self, path: str, fmt: str = 'ndjson', compress: Optional[bool] = None):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unbekanntes Format: {fmt} (erlaubt: {', '.join(self.FORMATS)})")
+        if compress is None:
+            compress = path.endswith('.gz')
+
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self.file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) if compress \
+            else open(path, 'w', encoding='utf-8')
+        # default=str: datetime in naechste_spiele
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+        if fmt == 'json':
+            self.file.write('[')
+
+    def write_club(self, sections: Iterable[Tuple[str, object]]):
+        """Schreibt eine Club-Analyse aus (Abschnitt, Wert)-Paaren"""
+        write = self.file.write
+        encode = self.encoder.encode
+
+        if self.fmt == 'json' and self.count:
+            write(',')
+        write('{')
+        for i, (section, value) in enumerate(sections):
+            if i:
+                write(',')
+            write(encode(section))
+            write(':')
+            if hasattr(value, '__next__'):
+                write('[')
+                for j, item in enumerate(value):
+                    if j:
+                        write(',')
+                    write(encode(item))
+                write(']')
+            else:
+                write(encode(value))
+        write('}')
+        if self.fmt == 'ndjson':
+            write('\n')
+        self.count += 1
+
+    def close(self):
+        if self.file:
+            if self.fmt == 'json':
+                self.file.write(']\n')
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_club_analyses(discovery: OptimizedClubDiscovery, clubs: List[ClubInfo], path: str,
+                         fmt: str = 'ndjson', compress: Optional[bool] = None,
+                         evict_spielplaene: bool = True, max_workers: int = 5,
+                         fields: Optional[Iterable[str]] = None) -> int:
+    """
+    Analysiert und exportiert beliebig viele Clubs mit konstantem Speicherbedarf
+
+    Die Spielpläne aller Clubs werden vorab in einer parallelen Welle geladen
+    (preload_spielplaene), danach wird jeder Club direkt nach seiner Analyse
+    geschrieben. Mit evict_spielplaene=True werden Spielpläne aus dem
+    spielplan_cache entfernt, sobald kein späterer Club der Liste sie mehr
+    braucht. fields beschränkt den Export auf einzelne Abschnitte (ohne
+    teams_detailed: keine Spielpläne).
+
+    Returns:
+        Anzahl exportierter Clubs
+    """
+    last_use = {}
+    for i, club in enumerate(clubs):
+        for liga in club.ligen:
+            last_use[liga.liga_id] = i
+
+    # Eine Lade-Welle für alle Clubs statt einer pro Club
+    if clubs and analysis_needs_spielplaene(fields):
+        discovery.preload_spielplaene(clubs, max_workers)
+
+    with AnalysisStreamWriter(path, fmt, compress) as writer:
+        for i, club in enumerate(clubs):
+            writer.write_club(discovery.iter_club_analysis(club, fields, max_workers))
+
+            if evict_spielplaene:
+                for liga in club.ligen:
+                    if last_use.get(liga.liga_id) == i:
+                        discovery.spielplan_cache.pop(liga.liga_id, None)
+                        discovery.match_index_cache.pop(liga.liga_id, None)
+
+        return writer.count
+
+
 # Hauptfunktion
 def main_discovery_flow():
     """Hauptflow für Club-Discovery"""
     print("🏀 Optimized Club Discovery v2.3 (FINAL)")
     print("=" * 50)
 
+    discovery = OptimizedClubDiscovery()
+
+    # Verbände sofort aus dem Snapshot anzeigen (nur beim allerersten Start aus der API)
+    if discovery.load_verbaende():
+        print("\n📋 Verbände:")
+        for verband_id, verband_name in sorted(discovery.verband_map.items()):
+            print(f"   {verband_id:3d} = {verband_name}")
+
     print("\n📍 Gib die Nummer deines Heimatverbands ein:")
-    print("   (Die korrekten IDs werden aus der API geladen)")
 
     try:
         heimat_verband = int(input("\n🏠 Heimatverband-ID: "))
@@ -816,12 +2970,10 @@ def main_discovery_flow():
         print("\n🚫 Abgebrochen")
         return
 
-    discovery = OptimizedClubDiscovery()
-
     try:
         start_time = time.time()
 
-        clubs = discovery.discover_clubs_by_verband(heimat_verband)
+        clubs = discovery.discover_clubs_by_verband(heimat_verband, journal_path=DEFAULT_JOURNAL_PATH)
 
         discovery_time = time.time() - start_time
         print(f"\n⏱️ Discovery-Zeit: {discovery_time:.1f}s")
@@ -837,24 +2989,165 @@ def main_discovery_flow():
             return
 
         analysis = discovery.analyze_club_complete(selected_club)
-
-        export_choice = input("\n💾 Analyse als JSON exportieren? (j/n): ").strip().lower()
-        if export_choice == 'j':
+        if discovery.crawl_state:
+            # Spielpläne aus der Analyse fließen in den Crawl-Zustand ein
+            discovery.crawl_state.save()
+
+        export_prompt = "\n💾 Analyse als JSON exportieren? (j/n"
+        if pa is not None:
+            export_prompt += ", p = alle Clubs als Parquet"
+        export_choice = input(export_prompt + "): ").strip().lower()
+        if export_choice == 'p' and pa is not None:
+            row_counts = export_discovery_parquet(discovery, clubs)
+            print(f"✅ Parquet exportiert nach {DEFAULT_PARQUET_DIR}/: "
+                  + ", ".join(f"{count} {name}" for name, count in row_counts.items()))
+        elif export_choice == 'j':
             timestamp = int(time.time())
             filename = f"club_analysis_{selected_club.club_name.replace(' ', '_').replace('.', '')}_{timestamp}.json"
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(analysis, f, ensure_ascii=False, indent=2)
+            # NDJSON mit einem Club = ein kompaktes JSON-Objekt (wie bisher, ohne Einrückung)
+            with AnalysisStreamWriter(filename, 'ndjson') as writer:
+                writer.write_club(analysis.items())
 
             print(f"✅ Exportiert: {filename}")
 
         total_time = time.time() - start_time
         print(f"\n⏱️ Gesamt-Zeit: {total_time:.1f}s")
 
+        if discovery.refresh_thread and discovery.refresh_thread.is_alive():
+            print("🔄 Warte auf Snapshot-Aktualisierung...")
+            discovery.refresh_thread.join()
+
+    except KeyboardInterrupt:
+        print("\n🚫 Abgebrochen (erneut starten setzt den Crawl fort)")
+
     except Exception as e:
         print(f"❌ Fehler: {e}")
         import traceback
         traceback.print_exc()
 
+
+def parse_analysis_fields(value: str) -> List[str]:
+    fields = [section.strip() for section in value.split(',') if section.strip()]
+    unknown = [section for section in fields if section not in ANALYSIS_SECTIONS + EXTRA_ANALYSIS_SECTIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unbekannte Analyse-Felder: {', '.join(unknown)}")
+    return fields
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Club-Discovery und -Analyse ohne Rückfragen (z.B. per cron). "
+                    "Ohne Argumente startet der interaktive Modus.")
+    parser.add_argument('--verband', type=int, required=True, help="Heimatverband-ID (z.B. 2 = Bayern)")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--club-ids', type=lambda value: [int(v) for v in value.split(',') if v.strip()],
+                           help="Komma-getrennte Club-IDs, die analysiert werden")
+    selection.add_argument('--all-clubs', action='store_true', help="Alle Clubs des Discovery-Laufs analysieren")
+    selection.add_argument('--discover-only', action='store_true',
+                           help="Nur Discovery (Snapshot, Store, Index), keine Analysen")
+    parser.add_argument('--output-dir', default='.', help="Zielverzeichnis für Exporte (Default: .)")
+    parser.add_argument('--format', choices=['json', 'ndjson', 'parquet'], default='ndjson',
+                        help="json = ein Array, ndjson = eine Zeile pro Club, parquet = spaltenorientiert")
+    parser.add_argument('--gzip', action='store_true', help="json/ndjson gzip-komprimiert schreiben")
+    parser.add_argument('--fields', type=parse_analysis_fields, default=None,
+                        help="Komma-getrennte Analyse-Abschnitte für json/ndjson (Default: alle außer tabellen; "
+                             f"möglich: {', '.join(ANALYSIS_SECTIONS + EXTRA_ANALYSIS_SECTIONS)}). "
+                             "Ohne teams_detailed werden keine Spielpläne geladen")
+    parser.add_argument('--club-index', action='store_true',
+                        help=f"Zusätzlich {DEFAULT_CLUB_INDEX_PATH} (mmap-Club-Index) ins Zielverzeichnis schreiben")
+    parser.add_argument('--concurrency', type=int, default=5, help="Parallele Requests (Threads) pro Prozess")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="> 1: Discovery auf mehrere Prozesse verteilen (discover_clubs_sharded, "
+                             "ohne Crawl-Zustand und Journal - nicht mit --full/--journal kombinierbar)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUEST_RATE,
+                        help=f"Max. Requests pro Sekunde über alle Prozesse (Default: {DEFAULT_REQUEST_RATE:g})")
+    parser.add_argument('--base-url', default="https://www.basketball-bund.net")
+    parser.add_argument('--full', action='store_true', help="Alle Tabellen neu laden (kein inkrementeller Crawl)")
+    parser.add_argument('--journal', default=None,
+                        help=f"Arbeits-Journal für fortsetzbare Crawls (Default: {DEFAULT_JOURNAL_PATH}, '' = aus)")
+    return parser
+
+
+def main_batch(argv: List[str]) -> int:
+    """
+    Nicht-interaktiver Lauf: Discovery + Analyse vieler Clubs in einem Prozess
+
+    Alle Analysen teilen sich Liga-, Tabellen- und Spielplan-Caches, dazu
+    kommen Snapshot, Crawl-Zustand und Store aus den vorigen Läufen - ein
+    erneuter Lauf für alle Clubs eines Verbands ist damit ein warmer Lauf.
+
+    Returns:
+        Exit-Code (0 = ok, 1 = keine Clubs / nichts gefunden)
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.processes > 1 and (args.full or args.journal is not None):
+        parser.error("--full und --journal gelten nur für die Discovery in einem Prozess (--processes 1)")
+    journal_path = DEFAULT_JOURNAL_PATH if args.journal is None else (args.journal or None)
+    start_time = time.time()
+
+    discovery = OptimizedClubDiscovery(base_url=args.base_url, rate_limiter=RateLimiter(args.rate))
+    if args.processes > 1:
+        clubs = discovery.discover_clubs_sharded(args.verband, processes=args.processes,
+                                                 max_workers=args.concurrency, rate=args.rate)
+    else:
+        # Nur Tabellen-Felder angefragt -> auch während der Discovery keine Spielpläne laden
+        analyzes_without_spielplaene = not args.discover_only and args.format != 'parquet' \
+            and not analysis_needs_spielplaene(args.fields)
+        clubs = discovery.discover_clubs_by_verband(args.verband, max_workers=args.concurrency,
+                                                    incremental=not args.full, journal_path=journal_path,
+                                                    fetch_spielplaene=not analyzes_without_spielplaene)
+    if not clubs:
+        print("❌ Keine Clubs gefunden")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+
+    if args.club_index:
+        index_path = os.path.join(args.output_dir, DEFAULT_CLUB_INDEX_PATH)
+        count = ClubDirectoryIndex.build(club_records_from_discovery(clubs), index_path)
+        print(f"✅ Club-Index: {index_path} ({count} Clubs)")
+
+    if args.discover_only:
+        selected = []
+    elif args.all_clubs:
+        selected = clubs
+    else:
+        clubs_by_id = {club.club_id: club for club in clubs}
+        selected = [clubs_by_id[club_id] for club_id in args.club_ids if club_id in clubs_by_id]
+        missing = [club_id for club_id in args.club_ids if club_id not in clubs_by_id]
+        if missing:
+            print(f"⚠️ Nicht im Verband {args.verband} gefunden: {', '.join(map(str, missing))}")
+        if not selected:
+            print("❌ Keiner der angegebenen Clubs gefunden")
+            return 1
+
+    if selected:
+        print(f"\n📊 Analysiere {len(selected)} Club(s)...")
+        if args.format == 'parquet':
+            discovery.preload_spielplaene(selected, args.concurrency)
+            out_dir = os.path.join(args.output_dir, DEFAULT_PARQUET_DIR)
+            row_counts = export_discovery_parquet(discovery, selected, out_dir)
+            print(f"✅ Parquet: {out_dir}/ (" + ", ".join(f"{count} {name}" for name, count in row_counts.items()) + ")")
+        else:
+            filename = f"club_analyses_verband{args.verband}_{timestamp}.{args.format}" + ('.gz' if args.gzip else '')
+            path = os.path.join(args.output_dir, filename)
+            count = export_club_analyses(discovery, selected, path, args.format,
+                                         max_workers=args.concurrency, fields=args.fields)
+            print(f"✅ {count} Analyse(n) exportiert: {path}")
+
+    if discovery.crawl_state:
+        discovery.crawl_state.save()
+    if discovery.refresh_thread and discovery.refresh_thread.is_alive():
+        discovery.refresh_thread.join()
+
+    print(f"\n⏱️ Gesamt-Zeit: {time.time() - start_time:.1f}s, API-Requests: {discovery.request_count}")
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main_batch(sys.argv[1:]))
     main_discovery_flow()
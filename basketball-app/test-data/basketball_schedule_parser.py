@@ -8,20 +8,717 @@ Datum: Oktober 2025
 """
 
 import re
+import gzip
+import hashlib
+import html
 import json
-import urllib.request
+import itertools
+import glob
+import math
+import os
+import signal
+import socket
+import time
+import threading
+import http.client
 import urllib.parse
-from datetime import datetime
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterator, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import sys
 
+try:
+    from bs4 import BeautifulSoup  # Nur als Referenz (--microbench, ParitÃ¤ts-Check in --test)
+except ImportError:
+    BeautifulSoup = None
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+# basketball-bund.net Endpunkte
+BBB_BASE_URL = 'https://www.basketball-bund.net'
+REST_SPIELPLAN_PATH = '/rest/competition/spielplan/id/{liga_id}'
+HTML_SPIELPLAN_PATH = '/public/spielplan_list.jsp?liga_id={liga_id}'
+
+# Upstream-Timeouts (Sekunden) und Verbindungs-Limit pro Host
+UPSTREAM_CONNECT_TIMEOUT = 5.0
+UPSTREAM_READ_TIMEOUT = 15.0
+UPSTREAM_MAX_CONNECTIONS_PER_HOST = 4
+
+# Gesamt-Deadline eines eingehenden Requests (Ã¼berschreibbar per X-Request-Timeout Header)
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Admission Control: parallele Upstream-Fetches, wartende Requests und maximale Wartezeit pro Worker
+DEFAULT_MAX_UPSTREAM = 8
+DEFAULT_MAX_QUEUE = 32
+ADMISSION_QUEUE_TIMEOUT = 5.0
+
+# Anzahl gemerkter Spielplan-Versionen pro Quelle (Basis fÃ¼r Delta-Antworten)
+VERSION_HISTORY_DEPTH = 16
+
+# iCalendar-Export: angenommene Spieldauer, Zeitzone der AnstoÃŸzeiten, Abruf-Intervall fÃ¼r Kalender-Clients
+ICS_GAME_DURATION = timedelta(hours=2)
+ICS_TIMEZONE = 'Europe/Berlin'
+ICS_REFRESH_INTERVAL = 'PT15M'
+
+# Bulk-Import: Dateimuster fÃ¼r --parse-dir und Anzahl Dokumente pro Worker-Auftrag
+BULK_FILE_PATTERNS = ('*.html', '*.htm', '*.jsp')
+BULK_MAX_PENDING_PER_WORKER = 4
+
+# Antworten unter dieser GrÃ¶ÃŸe werden nicht komprimiert
+MIN_COMPRESS_SIZE = 512
+
+# Vorkompilierte Extraktions-Patterns (einmal pro Prozess statt pro Zelle)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+DATETIME_PATTERN = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})\s+(\d{1,2}):(\d{2})')
+
+# Tokenizer fÃ¼r sportView-Tabellen: nur table/tr/td sind strukturell relevant,
+# Kommentare und Skripte werden Ã¼bersprungen, alle anderen Tags gehÃ¶ren zum Zellentext
+SCAN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b.*?</\1\s*>'
+    r'|<(/?)(table|tr|td)\b([^>]*)>',
+    re.IGNORECASE | re.DOTALL
+)
+CLASS_ATTR_PATTERN = re.compile(r'''\bclass\s*=\s*["']?([^"'>]*)''', re.IGNORECASE)
+
+
+class SportViewRowScanner:
+    """
+    Ereignisbasierter Scanner fÃ¼r sportView-Tabellen
+
+    Liefert pro <tr> die Texte aller enthaltenen <td> (wie find_all('td') +
+    get_text() in BeautifulSoup), ohne einen DOM-Baum aufzubauen.
+    Nicht geschlossene <tr>/<td> werden wie vom Browser implizit geschlossen.
+
+    Nicht wie BeautifulSoup behandelt (kommt in den DBB-Seiten nicht vor, --test
+    prÃ¼ft die ParitÃ¤t auf den gespeicherten Seiten in bbb/):
+    - Attribute ohne AnfÃ¼hrungszeichen: class=a sportViewTitle gilt als
+      Titel-Zelle; ebenso beendet ein '>' in einem Attributwert das Tag
+    - Verschachtelte Tabellen: innere Zeilen werden vor der Ã¤uÃŸeren geliefert,
+      nicht geschlossene innere Zellen verschieben die Zellen der Ã¤uÃŸeren Zeile
+    - Kommentare in Zellen: ein nicht geschlossenes <!-- bleibt als Zellentext
+      stehen, CDATA-Abschnitte werden samt Inhalt entfernt
+    """
+
+    def __init__(self, html_content: str):
+        self.html_content = html_content
+        self.league_info: Optional[str] = None
+        self._table_depth = 0
+        # (Tabellen-Tiefe, Zellen-Textteile)
+        self._open_rows: List[Tuple[int, List[List[str]]]] = []
+        # (Tabellen-Tiefe, Textteile, ist sportViewTitle)
+        self._open_cells: List[Tuple[int, List[str], bool]] = []
+        self._finished_rows: List[List[str]] = []
+
+    def iter_rows(self) -> Iterator[List[str]]:
+        """Liefert die Zellen-Texte jeder Tabellenzeile, sobald sie geschlossen ist"""
+        html_content = self.html_content
+        last_end = 0
+
+        for match in SCAN_PATTERN.finditer(html_content):
+            if self._open_cells and match.start() > last_end:
+                text = html_content[last_end:match.start()]
+                for _, parts, _ in self._open_cells:
+                    parts.append(text)
+            last_end = match.end()
+
+            tag = match.group(3)
+            if tag is None:
+                continue  # Kommentar oder Skript
+
+            tag = tag.lower()
+            if match.group(2):
+                self._handle_endtag(tag)
+            else:
+                self._handle_starttag(tag, match.group(4))
+
+            if self._finished_rows:
+                yield from self._finished_rows
+                self._finished_rows = []
+
+        self._close_rows(0)
+        yield from self._finished_rows
+        self._finished_rows = []
+
+    def _handle_starttag(self, tag: str, attrs: str):
+        if tag == 'td':
+            self._close_cells(self._table_depth)
+            parts: List[str] = []
+            is_title = False
+            if self.league_info is None and 'sportViewTitle' in attrs:
+                class_match = CLASS_ATTR_PATTERN.search(attrs)
+                is_title = bool(class_match) and 'sportViewTitle' in class_match.group(1).split()
+            for _, cells in self._open_rows:
+                cells.append(parts)
+            self._open_cells.append((self._table_depth, parts, is_title))
+        elif tag == 'tr':
+            self._close_rows(self._table_depth)
+            self._open_rows.append((self._table_depth, []))
+        else:
+            self._table_depth += 1
+
+    def _handle_endtag(self, tag: str):
+        if tag == 'td':
+            self._close_cells(self._table_depth)
+        elif tag == 'tr':
+            self._close_rows(self._table_depth)
+        elif self._table_depth > 0:
+            self._close_rows(self._table_depth)
+            self._table_depth -= 1
+
+    def _close_cells(self, depth: int):
+        while self._open_cells and self._open_cells[-1][0] >= depth:
+            _, parts, is_title = self._open_cells.pop()
+            if is_title and self.league_info is None:
+                self.league_info = self._cell_text(parts)
+
+    def _close_rows(self, depth: int):
+        self._close_cells(depth)
+        while self._open_rows and self._open_rows[-1][0] >= depth:
+            _, cells = self._open_rows.pop()
+            self._finished_rows.append([self._cell_text(parts) for parts in cells])
+
+    @staticmethod
+    def _cell_text(parts: List[str]) -> str:
+        """Setzt den Zellentext zusammen (innere Tags entfernt, Entities dekodiert)"""
+        text = ''.join(parts)
+        if '<' in text:
+            text = TAG_PATTERN.sub('', text)
+        if '&' in text:
+            text = html.unescape(text)
+        return text
+
+
+def compute_game_hashes(games: List[Dict]) -> Dict[str, str]:
+    """Content-Hash pro Spiel, indiziert nach game_number"""
+    return {
+        game['game_number']: hashlib.blake2b(
+            json.dumps(game, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8'),
+            digest_size=8
+        ).hexdigest()
+        for game in games
+    }
+
+
+def compute_schedule_version(game_hashes: Dict[str, str]) -> str:
+    """Version eines Spielplans: Hash Ã¼ber alle (game_number, Content-Hash) Paare"""
+    digest = hashlib.blake2b(digest_size=8)
+    for game_number in sorted(game_hashes):
+        digest.update(f"{game_number}:{game_hashes[game_number]};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _normalize_team_name(name: str) -> str:
+    return ' '.join(name.split()).casefold()
+
+
+def filter_games_for_team(games: List[Dict], team: Optional[str]) -> List[Dict]:
+    """
+    Filtert die Spiele eines Teams (Heim oder AuswÃ¤rts)
+
+    Exakte Treffer auf den Teamnamen haben Vorrang, sonst wird nach Teilstrings
+    gesucht (z.B. "Regensburg Baskets" fÃ¼r alle Regensburger Teams).
+    """
+    if not team:
+        return list(games)
+
+    needle = _normalize_team_name(team)
+    exact = [
+        game for game in games
+        if needle in (_normalize_team_name(game['home_team']), _normalize_team_name(game['away_team']))
+    ]
+    if exact:
+        return exact
+    return [
+        game for game in games
+        if needle in _normalize_team_name(game['home_team']) or needle in _normalize_team_name(game['away_team'])
+    ]
+
+
+def _ics_escape(text: str) -> str:
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ics_fold(line: str) -> str:
+    """Faltet Zeilen nach RFC 5545 auf max. 75 Oktette (ohne UTF-8 Zeichen zu zerteilen)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+
+    parts = []
+    current, current_len, limit = [], 0, 75
+    for char in line:
+        char_len = len(char.encode('utf-8'))
+        if current_len + char_len > limit:
+            parts.append(''.join(current))
+            current, current_len, limit = [], 0, 74
+        current.append(char)
+        current_len += char_len
+    parts.append(''.join(current))
+    return '\r\n '.join(parts)
+
+
+ICS_VTIMEZONE = [
+    'BEGIN:VTIMEZONE',
+    f'TZID:{ICS_TIMEZONE}',
+    'BEGIN:DAYLIGHT',
+    'TZOFFSETFROM:+0100',
+    'TZOFFSETTO:+0200',
+    'TZNAME:CEST',
+    'DTSTART:19700329T020000',
+    'RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU',
+    'END:DAYLIGHT',
+    'BEGIN:STANDARD',
+    'TZOFFSETFROM:+0200',
+    'TZOFFSETTO:+0100',
+    'TZNAME:CET',
+    'DTSTART:19701025T030000',
+    'RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU',
+    'END:STANDARD',
+    'END:VTIMEZONE',
+]
+
+
+def render_schedule_ics(result: Dict, games: List[Dict], team: Optional[str], uid_namespace: str) -> bytes:
+    """
+    Rendert Spiele als iCalendar (RFC 5545) mit einem VEVENT pro Spiel
+
+    Args:
+        result: Geparstes Spielplan-Ergebnis (fÃ¼r Liga-Name und Zeitstempel)
+        games: Bereits gefilterte Spiele
+        team: Teamname fÃ¼r den Kalender-Namen (optional)
+        uid_namespace: Stabiler Bezeichner der Quelle, damit UIDs Ã¼ber Updates gleich bleiben
+
+    Returns:
+        ICS-Datei als UTF-8 Bytes
+    """
+    extracted_at = datetime.fromisoformat(result['extracted_at'])
+    dtstamp = extracted_at.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    calendar_name = f"{team} - {result['league']}" if team else result['league']
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Basketball Schedule Parser//DE',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_ics_escape(calendar_name)}',
+        f'X-WR-TIMEZONE:{ICS_TIMEZONE}',
+        f'REFRESH-INTERVAL;VALUE=DURATION:{ICS_REFRESH_INTERVAL}',
+        f'X-PUBLISHED-TTL:{ICS_REFRESH_INTERVAL}',
+        *ICS_VTIMEZONE,
+    ]
+
+    for game in games:
+        if game.get('datetime_iso'):
+            start = datetime.fromisoformat(game['datetime_iso'])
+            timing = [
+                f"DTSTART;TZID={ICS_TIMEZONE}:{start.strftime('%Y%m%dT%H%M%S')}",
+                f"DTEND;TZID={ICS_TIMEZONE}:{(start + ICS_GAME_DURATION).strftime('%Y%m%dT%H%M%S')}",
+            ]
+        else:
+            # Ohne AnstoÃŸzeit als ganztÃ¤giger Termin, Spiele ohne Datum werden Ã¼bersprungen
+            try:
+                day = datetime.strptime(game.get('date', ''), '%d.%m.%Y')
+            except ValueError:
+                continue
+            timing = [
+                f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+                f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+            ]
+
+        lines.append('BEGIN:VEVENT')
+        lines.append(f"UID:{game['game_number']}-{uid_namespace}@basketball-schedule-parser")
+        lines.append(f'DTSTAMP:{dtstamp}')
+        lines.extend(timing)
+        lines.append(f"SUMMARY:{_ics_escape(game['home_team'] + ' - ' + game['away_team'])}")
+        if game.get('venue'):
+            lines.append(f"LOCATION:{_ics_escape(game['venue'])}")
+
+        description = [f"Spiel-Nr. {game['game_number']}", f"Spieltag {game['game_day']}", result['league']]
+        if game.get('referee'):
+            description.append(f"Schiedsrichter: {game['referee']}")
+        lines.append(f"DESCRIPTION:{_ics_escape(chr(10).join(description))}")
+        lines.append('END:VEVENT')
+
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(_ics_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+
+class UpstreamTimeout(Exception):
+    """Upstream hat nicht innerhalb der Deadline geantwortet"""
+
+
+class ServiceOverloaded(Exception):
+    """Zu viele wartende Upstream-Fetches - Request wird sofort mit 503 abgelehnt"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Begrenzt parallele Upstream-Fetches und die Warteschlange davor
+
+    HÃ¶chstens max_upstream Fetches laufen gleichzeitig, hÃ¶chstens max_queue
+    Requests warten auf einen freien Platz. Ist die Warteschlange voll oder
+    wird innerhalb von queue_timeout kein Platz frei, wird ServiceOverloaded
+    geworfen (503 mit Retry-After statt eines spÃ¤ten Timeouts).
+    """
+
+    def __init__(self, max_upstream: int = DEFAULT_MAX_UPSTREAM, max_queue: int = DEFAULT_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.max_upstream = max_upstream
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        # Gleitender Mittelwert der Fetch-Dauer fÃ¼r den Retry-After Header
+        self.avg_fetch_duration = 1.0
+
+    def acquire(self, deadline: Optional[float] = None):
+        """Reserviert einen Upstream-Platz oder wirft ServiceOverloaded"""
+        with self._condition:
+            if self.in_flight < self.max_upstream and self.queued == 0:
+                self.in_flight += 1
+                self.admitted += 1
+                return
+
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ServiceOverloaded("Service ausgelastet, Warteschlange voll", self.retry_after())
+
+            wait_until = time.monotonic() + self.queue_timeout
+            if deadline is not None:
+                wait_until = min(wait_until, deadline)
+
+            self.queued += 1
+            try:
+                while self.in_flight >= self.max_upstream:
+                    remaining = wait_until - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise ServiceOverloaded("Service ausgelastet, kein freier Upstream-Platz",
+                                                self.retry_after())
+                    self._condition.wait(remaining)
+            finally:
+                self.queued -= 1
+
+            self.in_flight += 1
+            self.admitted += 1
+
+    def release(self, duration: float):
+        with self._condition:
+            self.in_flight -= 1
+            self.avg_fetch_duration = 0.8 * self.avg_fetch_duration + 0.2 * duration
+            self._condition.notify()
+
+    def retry_after(self) -> int:
+        """GeschÃ¤tzte Sekunden bis die aktuelle Warteschlange abgearbeitet ist"""
+        return max(1, math.ceil(self.avg_fetch_duration * (self.queued + 1) / self.max_upstream))
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+class _FlightCall:
+    """Ergebnis eines laufenden Ladevorgangs"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    BÃ¼ndelt gleichzeitige LadevorgÃ¤nge fÃ¼r denselben SchlÃ¼ssel
+
+    Der erste Request (Leader) lÃ¤dt und parst, alle weiteren Requests fÃ¼r
+    denselben SchlÃ¼ssel warten auf dessen Ergebnis bzw. Fehler. Neben do()
+    gibt es join()/wait()/finish() fÃ¼r Leader, die schon wÃ¤hrend des Ladens
+    Teilergebnisse ausliefern (NDJSON-Stream).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _FlightCall] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, load, deadline: Optional[float] = None):
+        call, leader = self.join(key)
+        if not leader:
+            return self.wait(call, deadline)
+
+        try:
+            result = load()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return result
+
+    def join(self, key: str) -> Tuple[_FlightCall, bool]:
+        """Tritt einem laufenden Ladevorgang bei oder startet ihn -> (Call, ist Leader)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _FlightCall()
+            else:
+                self.coalesced += 1
+        return call, leader
+
+    def wait(self, call: _FlightCall, deadline: Optional[float] = None):
+        """Wartet als Follower auf das Ergebnis (oder den Fehler) des Leaders"""
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not call.done.wait(timeout):
+            raise UpstreamTimeout("Deadline des Requests Ã¼berschritten (wartet auf laufenden Fetch)")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def finish(self, key: str, call: _FlightCall, result=None, error: Optional[BaseException] = None):
+        """Beendet den Ladevorgang des Leaders und weckt alle Follower"""
+        call.result = result
+        call.error = error
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+
+def tee_ndjson_games(header: Dict, games: Iterator[Dict], write_line) -> Tuple[List[Dict], bool]:
+    """
+    Schreibt Header und Spiele als NDJSON-Zeilen, sobald sie vorliegen, und sammelt die Spiele
+
+    Bricht der Client ab (BrokenPipe/ConnectionReset), wird weiter gesammelt,
+    damit wartende Requests (SingleFlight) und der Cache das vollstÃ¤ndige
+    Ergebnis erhalten. Parse-Fehler werden an den Aufrufer weitergereicht.
+
+    Returns:
+        Tuple aus allen Spielen und ob der Client noch verbunden ist
+    """
+    connected = True
+    try:
+        write_line(header)
+    except (BrokenPipeError, ConnectionResetError):
+        connected = False
+
+    collected = []
+    for game in games:
+        collected.append(game)
+        if connected:
+            try:
+                write_line(game)
+            except (BrokenPipeError, ConnectionResetError):
+                connected = False
+    return collected, connected
+
+
+class UpstreamClient:
+    """
+    Connection-Pool fÃ¼r Upstream-Requests (Keep-Alive, Timeouts, Limit pro Host)
+
+    Verbindungen zu basketball-bund.net werden wiederverwendet, statt fÃ¼r jeden
+    Spielplan erneut TCP+TLS aufzubauen. Jeder Request respektiert eine optionale
+    Deadline (time.monotonic()), die vom eingehenden Request weitergereicht wird.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, connect_timeout: float = UPSTREAM_CONNECT_TIMEOUT,
+                 read_timeout: float = UPSTREAM_READ_TIMEOUT,
+                 max_connections_per_host: int = UPSTREAM_MAX_CONNECTIONS_PER_HOST):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections_per_host = max_connections_per_host
+        self._lock = threading.Lock()
+        # (scheme, host, port) -> freie Verbindungen / Semaphore fÃ¼r das Host-Limit
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._host_slots: Dict[Tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self.requests_total = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.timeouts = 0
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            deadline: Optional[float] = None) -> bytes:
+        """
+        FÃ¼hrt einen GET-Request aus und liefert den (dekomprimierten) Body
+
+        Args:
+            url: Ziel-URL (http oder https)
+            headers: ZusÃ¤tzliche Request-Header
+            deadline: Absoluter Zeitpunkt (time.monotonic()), bis zu dem die Antwort da sein muss
+
+        Returns:
+            Response-Body
+
+        Raises:
+            UpstreamTimeout: Deadline oder Timeout Ã¼berschritten
+            Exception: HTTP-Fehlerstatus oder Verbindungsfehler
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            status, reason, response_headers, body = self._request(url, headers or {}, deadline)
+
+            if status in (301, 302, 303, 307, 308) and response_headers.get('location'):
+                url = urllib.parse.urljoin(url, response_headers['location'])
+                continue
+            if status >= 400:
+                raise Exception(f"HTTP Error {status}: {reason}")
+
+            if response_headers.get('content-encoding') == 'gzip':
+                body = gzip.decompress(body)
+            return body
+
+        raise Exception(f"Zu viele Weiterleitungen fÃ¼r {url}")
+
+    def stats(self) -> Dict[str, float]:
+        """Liefert ZÃ¤hler fÃ¼r /metrics (inkl. Wiederverwendungs-Quote)"""
+        with self._lock:
+            idle = sum(len(connections) for connections in self._idle.values())
+            acquired = self.connections_opened + self.connections_reused
+            return {
+                'requests_total': self.requests_total,
+                'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+                'connections_idle': idle,
+                'timeouts': self.timeouts,
+                'reuse_ratio': self.connections_reused / acquired if acquired else 0.0,
+            }
+
+    def close(self):
+        """SchlieÃŸt alle freien Verbindungen"""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+    def _request(self, url: str, headers: Dict[str, str], deadline: Optional[float]):
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise Exception(f"Nicht unterstÃ¼tztes URL-Schema: {parsed.scheme}")
+
+        host_key = (scheme, parsed.hostname or '', parsed.port or (443 if scheme == 'https' else 80))
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+
+        request_headers = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive', **headers}
+
+        with self._lock:
+            self.requests_total += 1
+            slots = self._host_slots.setdefault(host_key, threading.BoundedSemaphore(self.max_connections_per_host))
+
+        # Host-Limit: auf einen freien Slot warten, aber nicht lÃ¤nger als die Deadline
+        if not slots.acquire(timeout=self._remaining(deadline, self.read_timeout)):
+            self._count_timeout()
+            raise UpstreamTimeout(f"Kein freier Upstream-Slot fÃ¼r {host_key[1]}")
+
+        try:
+            # Eine wiederverwendete Verbindung kann serverseitig schon geschlossen sein -> einmal neu versuchen
+            for attempt in range(2):
+                read_timeout = self._remaining(deadline, self.read_timeout)
+                connection, reused = self._acquire_connection(host_key, deadline)
+                try:
+                    connection.sock.settimeout(read_timeout)
+                    connection.request('GET', path, headers=request_headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                except socket.timeout:
+                    connection.close()
+                    self._count_timeout()
+                    raise UpstreamTimeout(f"Timeout beim Lesen von {host_key[1]}")
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    # IncompleteRead, SSLError, sonstige OSError, Deadline: Verbindung nie unverschlossen verwerfen
+                    connection.close()
+                    raise
+
+                response_headers = {name.lower(): value for name, value in response.getheaders()}
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._release_connection(host_key, connection)
+                return response.status, response.reason, response_headers, body
+        finally:
+            slots.release()
+
+    def _acquire_connection(self, host_key: Tuple[str, str, int], deadline: Optional[float]):
+        with self._lock:
+            idle = self._idle.get(host_key)
+            if idle:
+                self.connections_reused += 1
+                return idle.pop(), True
+
+        scheme, host, port = host_key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(host, port, timeout=self._remaining(deadline, self.connect_timeout))
+        try:
+            connection.connect()
+        except socket.timeout:
+            connection.close()
+            self._count_timeout()
+            raise UpstreamTimeout(f"Timeout beim Verbindungsaufbau zu {host}")
+        except BaseException:
+            connection.close()
+            raise
+
+        with self._lock:
+            self.connections_opened += 1
+        return connection, False
+
+    def _release_connection(self, host_key: Tuple[str, str, int], connection: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(host_key, [])
+            if len(idle) < self.max_connections_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _count_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def _remaining(self, deadline: Optional[float], limit: float) -> float:
+        """Verbleibende Zeit bis zur Deadline, begrenzt auf limit"""
+        if deadline is None:
+            return limit
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._count_timeout()
+            raise UpstreamTimeout("Deadline des Requests Ã¼berschritten")
+        return min(remaining, limit)
+
+
 class ScheduleParserService:
     """Service zum Parsen von Basketball-SpielplÃ¤nen aus HTML-Tabellen"""
 
-    def __init__(self):
-        pass
+    def __init__(self, base_url: str = BBB_BASE_URL, upstream: Optional[UpstreamClient] = None):
+        self.base_url = base_url.rstrip('/')
+        self.upstream = upstream or UpstreamClient()
 
     def parse_schedule_from_url(self, url: str) -> Dict[str, any]:
         """
@@ -34,15 +731,28 @@ class ScheduleParserService:
             Dictionary mit Spielplan-Daten
         """
         try:
-            # HTML von URL laden
-            with urllib.request.urlopen(url) as response:
-                html_content = response.read().decode('utf-8', errors='ignore')
-
+            html_content = self.fetch_html(url)
             return self.parse_schedule_from_html(html_content)
 
         except Exception as e:
             raise Exception(f"Fehler beim Laden der URL: {str(e)}")
 
+    def fetch_html(self, url: str) -> str:
+        """
+        LÃ¤dt den HTML-Inhalt einer Spielplan-Seite
+
+        Args:
+            url: URL zur HTML-Seite mit dem Spielplan
+
+        Returns:
+            HTML-String
+        """
+        return self.fetch_raw(url).decode('utf-8', errors='ignore')
+
+    def fetch_raw(self, url: str, deadline: Optional[float] = None) -> bytes:
+        """LÃ¤dt den unverÃ¤nderten Response-Body einer Spielplan-Seite (gepoolte Verbindung)"""
+        return self.upstream.get(url, deadline=deadline)
+
     def parse_schedule_from_html(self, html_content: str) -> Dict[str, any]:
         """
         Parst HTML-Inhalt und extrahiert Spielplan-Daten
@@ -53,70 +763,203 @@ class ScheduleParserService:
         Returns:
             Dictionary mit Spielplan-Daten
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        games = []
+        league_info, games_iter = self.stream_schedule_from_html(html_content)
 
-        # Extrahiere Liga-Informationen aus dem Titel
-        league_info = self._extract_league_info(soup)
-
-        # Finde alle Tabellenzeilen - direkter Ansatz
-        all_rows = soup.find_all('tr')
-
-        for row in all_rows:
-            cells = row.find_all('td')
-
-            # PrÃ¼fe ob es eine Spielzeile ist (mindestens 6 Zellen + erste Zelle ist Nummer)
-            if len(cells) >= 6:
-                first_cell_text = cells[0].get_text().strip()
-                if first_cell_text.isdigit() and len(first_cell_text) >= 3:
-                    try:
-                        game_data = self._extract_game_data(cells)
-                        if game_data:
-                            games.append(game_data)
-                    except Exception as e:
-                        continue
+        return self.build_result(league_info, list(games_iter))
 
+    def build_result(self, league_info: str, games: List[Dict]) -> Dict[str, any]:
+        """
+        Baut das Spielplan-Ergebnis inkl. Version
+
+        Die Version ist ein Hash Ã¼ber die Content-Hashes aller Spiele (nach game_number)
+        und Ã¤ndert sich nur, wenn sich mindestens ein Spiel Ã¤ndert.
+
+        Args:
+            league_info: Liga-Bezeichnung
+            games: Liste der Spieldaten
+
+        Returns:
+            Dictionary mit Spielplan-Daten
+        """
         return {
             "league": league_info,
             "source": "Deutscher Basketball-Bund e.V.",
             "extracted_at": datetime.now().isoformat(),
+            "version": compute_schedule_version(compute_game_hashes(games)),
             "games_count": len(games),
             "games": games
         }
 
-    def _extract_league_info(self, soup) -> str:
-        """Extrahiert Liga-Informationen aus dem HTML"""
-        title_element = soup.find('td', {'class': 'sportViewTitle'})
-        if title_element:
-            return self._clean_text(title_element.get_text())
-        return "Unbekannte Liga"
+    def parse_schedule_from_liga_id(self, liga_id: int) -> Dict[str, any]:
+        """
+        LÃ¤dt den Spielplan einer Liga Ã¼ber die JSON REST-API
+
+        Args:
+            liga_id: Liga-ID (wie in /rest/competition/spielplan/id/{ligaId})
+
+        Returns:
+            Dictionary mit Spielplan-Daten (gleiches Format wie beim HTML-Parsing)
+        """
+        try:
+            return self.parse_schedule_from_rest_json(self.fetch_rest_spielplan(liga_id))
+
+        except Exception as e:
+            raise Exception(f"Fehler beim Laden des REST-Spielplans: {str(e)}")
+
+    def fetch_rest_spielplan(self, liga_id: int, deadline: Optional[float] = None) -> bytes:
+        """LÃ¤dt die Roh-Antwort von /rest/competition/spielplan/id/{ligaId}"""
+        return self.upstream.get(
+            self.base_url + REST_SPIELPLAN_PATH.format(liga_id=liga_id),
+            headers={'Accept': 'application/json'},
+            deadline=deadline
+        )
+
+    def parse_schedule_from_rest_json(self, raw_content: bytes) -> Dict[str, any]:
+        """
+        Mappt die REST-Antwort auf das Spielplan-Format von parse_schedule_from_html
+
+        UnterstÃ¼tzt das aktuelle Format (data.matches[] mit homeTeam/guestTeam)
+        und das Ã¤ltere Format (data.spielplan[] mit heimteamname/gastteamname).
+
+        Args:
+            raw_content: JSON-Body der REST-Antwort
+
+        Returns:
+            Dictionary mit Spielplan-Daten
+        """
+        payload = json.loads(raw_content)
+        data = payload.get('data') or {}
+        liga_data = data.get('ligaData') or data
+
+        games = []
+        for match in data.get('matches') or []:
+            games.append(self._map_rest_match(match))
+        for entry in data.get('spielplan') or []:
+            games.append(self._map_legacy_spielplan_entry(entry))
+
+        return self.build_result(liga_data.get('liganame') or "Unbekannte Liga", games)
+
+    def _map_rest_match(self, match: Dict) -> Dict:
+        """Mappt ein Element aus data.matches[] auf das Spiel-Format"""
+        match_info = match.get('matchInfo') or {}
+        spielfeld = match_info.get('spielfeld') or {}
+        referees = []
+        for sr in match_info.get('srList') or []:
+            person = sr.get('personData') or {}
+            if person and not person.get('anonym'):
+                referees.append(f"{person.get('vorname', '')} {person.get('nachname', '')}".strip())
+        kickoff = self._parse_kickoff(match.get('kickoffDate'), match.get('kickoffTime'))
+
+        return {
+            "game_number": str(match.get('matchNo') or ''),
+            "game_day": str(match.get('matchDay') or ''),
+            "date": kickoff["date"],
+            "time": kickoff["time"],
+            "datetime_iso": kickoff["datetime_iso"],
+            "home_team": (match.get('homeTeam') or {}).get('teamname', ''),
+            "away_team": (match.get('guestTeam') or {}).get('teamname', ''),
+            "venue": spielfeld.get('bezeichnung', ''),
+            "referee": ", ".join(referees)
+        }
+
+    def _map_legacy_spielplan_entry(self, entry: Dict) -> Dict:
+        """Mappt ein Element aus data.spielplan[] (Ã¤lteres Format) auf das Spiel-Format"""
+        kickoff = self._parse_kickoff(entry.get('datum'), entry.get('uhrzeit'))
+
+        return {
+            "game_number": str(entry.get('nr') or ''),
+            "game_day": str(entry.get('tag') or ''),
+            "date": kickoff["date"],
+            "time": kickoff["time"],
+            "datetime_iso": kickoff["datetime_iso"],
+            "home_team": entry.get('heimteamname') or '',
+            "away_team": entry.get('gastteamname') or '',
+            "venue": entry.get('halle') or '',
+            "referee": ""
+        }
+
+    def _parse_kickoff(self, date_text: Optional[str], time_text: Optional[str]) -> Dict[str, str]:
+        """
+        Parst Datum und Zeit aus dem REST-Format "YYYY-MM-DD" / "HH:MM"
+
+        Returns:
+            Dictionary mit denselben Komponenten wie _parse_datetime
+        """
+        try:
+            dt = datetime.strptime(f"{date_text} {time_text or '00:00'}", "%Y-%m-%d %H:%M")
+            return {
+                "date": dt.strftime("%d.%m.%Y"),
+                "time": dt.strftime("%H:%M") if time_text else "",
+                "datetime_iso": dt.isoformat()
+            }
+        except (TypeError, ValueError):
+            return {
+                "date": date_text or "",
+                "time": time_text or "",
+                "datetime_iso": ""
+            }
 
-    def _extract_game_data(self, cells) -> Optional[Dict]:
+    def stream_schedule_from_html(self, html_content: str) -> Tuple[str, Iterator[Dict]]:
         """
-        Extrahiert Spieldaten aus Tabellenzellen
+        Parst HTML-Inhalt und liefert die Spiele einzeln, sobald sie extrahiert sind
 
         Args:
-            cells: Liste der Tabellenzellen (td-Elemente)
+            html_content: HTML-String mit der Spielplan-Tabelle
 
         Returns:
-            Dictionary mit Spieldaten oder None bei Fehlern
+            Tuple aus Liga-Informationen und einem Iterator Ã¼ber die Spieldaten
+        """
+        scanner = SportViewRowScanner(html_content)
+        rows = scanner.iter_rows()
+
+        # Bis zum Liga-Titel scannen (steht im Kopf der Seite)
+        leading_rows = []
+        for cell_texts in rows:
+            leading_rows.append(cell_texts)
+            if scanner.league_info is not None:
+                break
+
+        # Extrahiere Liga-Informationen aus dem Titel
+        league_info = self._clean_text(scanner.league_info) if scanner.league_info else "Unbekannte Liga"
+
+        return league_info, self._iter_games(itertools.chain(leading_rows, rows))
+
+    def _iter_games(self, rows: Iterator[List[str]]) -> Iterator[Dict]:
+        """Iteriert Ã¼ber alle Spielzeilen der Tabelle"""
+        for cell_texts in rows:
+            game_data = self._extract_game_data(cell_texts)
+            if game_data:
+                yield game_data
+
+    def _extract_game_data(self, cell_texts: List[str]) -> Optional[Dict]:
         """
+        Extrahiert Spieldaten aus den Zellen-Texten einer Tabellenzeile
+
+        Args:
+            cell_texts: Roh-Texte der Tabellenzellen (td-Elemente)
+
+        Returns:
+            Dictionary mit Spieldaten oder None, wenn es keine Spielzeile ist
+        """
+        # PrÃ¼fe ob es eine Spielzeile ist (mindestens 6 Zellen + erste Zelle ist Nummer)
+        if len(cell_texts) < 6:
+            return None
+
+        game_number = self._clean_text(cell_texts[0])
+        if not game_number.isdigit() or len(game_number) < 3:
+            return None
+
         try:
-            # Extrahiere die Daten aus den Zellen
-            game_number = self._clean_text(cells[0].get_text())
-            game_day = self._clean_text(cells[1].get_text())
-            date_time_text = self._clean_text(cells[2].get_text())
-            home_team = self._clean_text(cells[3].get_text())
-            away_team = self._clean_text(cells[4].get_text())
-            venue = self._clean_text(cells[5].get_text())
+            # Jede Zelle genau einmal bereinigen
+            game_day, date_time_text, home_team, away_team, venue = [
+                self._clean_text(text) for text in cell_texts[1:6]
+            ]
 
             # Schiedsrichter (falls vorhanden)
-            referee = ""
-            if len(cells) > 6:
-                referee = self._clean_text(cells[6].get_text())
+            referee = self._clean_text(cell_texts[6]) if len(cell_texts) > 6 else ""
 
             # PrÃ¼fe ob es gÃ¼ltige Spieldaten sind
-            if not game_number or not date_time_text or not home_team or not away_team:
+            if not date_time_text or not home_team or not away_team:
                 return None
 
             # Datum und Zeit parsen
@@ -153,11 +996,12 @@ class ScheduleParserService:
             return ""
 
         # Entferne HTML-Tags und Entities
-        text = re.sub(r'<[^>]+>', '', text)
-        text = text.replace('&nbsp;', ' ')
-        text = text.strip()
+        if '<' in text:
+            text = TAG_PATTERN.sub('', text)
+        if '&' in text:
+            text = text.replace('&nbsp;', ' ')
 
-        return text
+        return text.strip()
 
     def _parse_datetime(self, date_time_text: str) -> Dict[str, str]:
         """
@@ -171,7 +1015,7 @@ class ScheduleParserService:
         """
         try:
             # Regex fÃ¼r Datum und Zeit
-            match = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{4})\s+(\d{1,2}):(\d{2})', date_time_text)
+            match = DATETIME_PATTERN.search(date_time_text)
 
             if match:
                 day, month, year, hour, minute = match.groups()
@@ -198,12 +1042,470 @@ class ScheduleParserService:
                 "datetime_iso": ""
             }
 
+class Histogram:
+    """Kumulatives Histogramm im Prometheus-Format (Werte in Sekunden)"""
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class ServiceMetrics:
+    """Thread-sichere Metriken des Parser-Service fÃ¼r den /metrics Endpoint"""
+
+    PREFIX = 'schedule_parser'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.request_duration: Dict[str, Histogram] = {}
+        # (phase, source) -> Histogramm; source = html (Scraping) oder rest (JSON-API)
+        self.phase_duration: Dict[Tuple[str, str], Histogram] = {}
+        self.games_parsed = 0
+        self.upstream_bytes: Dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.in_flight = 0
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint: str, method: str, status: str, duration: float,
+                         bytes_in: int, bytes_out: int):
+        with self._lock:
+            self.in_flight -= 1
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_duration.setdefault(endpoint, Histogram()).observe(duration)
+            self.request_bytes += bytes_in
+            self.response_bytes += bytes_out
+
+    def request_aborted(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe_phase(self, phase: str, duration: float, source: str = 'html'):
+        with self._lock:
+            self.phase_duration.setdefault((phase, source), Histogram()).observe(duration)
+
+    def add_upstream_bytes(self, count: int, source: str = 'html'):
+        with self._lock:
+            self.upstream_bytes[source] = self.upstream_bytes.get(source, 0) + count
+
+    def add_games_parsed(self, count: int):
+        with self._lock:
+            self.games_parsed += count
+
+    def render(self, cache: 'ScheduleResultCache', upstream: Optional[UpstreamClient] = None,
+               admission: Optional[AdmissionController] = None, single_flight: Optional[SingleFlight] = None) -> str:
+        """Erzeugt das Prometheus Text-Format (Version 0.0.4)"""
+        p = self.PREFIX
+        lines = []
+
+        def header(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {metric_type}")
+
+        def histogram(name: str, labels: Tuple[str, ...], histograms: Dict):
+            for values, hist in sorted(histograms.items()):
+                if not isinstance(values, tuple):
+                    values = (values,)
+                label_str = ','.join(f'{label}="{value}"' for label, value in zip(labels, values))
+                for upper_bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f'{p}_{name}_bucket{{{label_str},le="{upper_bound}"}} {count}')
+                lines.append(f'{p}_{name}_bucket{{{label_str},le="+Inf"}} {hist.count}')
+                lines.append(f'{p}_{name}_sum{{{label_str}}} {hist.total:.6f}')
+                lines.append(f'{p}_{name}_count{{{label_str}}} {hist.count}')
+
+        with self._lock:
+            header('requests_total', 'counter', 'HTTP requests by endpoint, method and status')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'{p}_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            header('request_duration_seconds', 'histogram', 'End-to-end request latency by endpoint')
+            histogram('request_duration_seconds', ('endpoint',), self.request_duration)
+
+            header('phase_duration_seconds', 'histogram',
+                   'Latency of the upstream fetch, parse and serialize phases by source (html/rest)')
+            histogram('phase_duration_seconds', ('phase', 'source'), self.phase_duration)
+
+            header('games_parsed_total', 'counter', 'Games extracted from upstream schedules')
+            lines.append(f'{p}_games_parsed_total {self.games_parsed}')
+
+            header('upstream_bytes_total', 'counter', 'Bytes received from upstream by source (html/rest)')
+            for source, count in sorted(self.upstream_bytes.items()):
+                lines.append(f'{p}_upstream_bytes_total{{source="{source}"}} {count}')
+            header('request_bytes_total', 'counter', 'Request body bytes received from clients')
+            lines.append(f'{p}_request_bytes_total {self.request_bytes}')
+            header('response_bytes_total', 'counter', 'Response body bytes sent to clients')
+            lines.append(f'{p}_response_bytes_total {self.response_bytes}')
+
+            header('in_flight_requests', 'gauge', 'Requests currently being handled')
+            lines.append(f'{p}_in_flight_requests {self.in_flight}')
+
+            # Im Prefork-Modus hat jeder Worker eigene Metriken
+            header('worker_info', 'gauge', 'Process id of the worker that served this scrape')
+            lines.append(f'{p}_worker_info{{pid="{os.getpid()}"}} 1')
+
+        header('cache_hits_total', 'counter', 'Result cache hits')
+        lines.append(f'{p}_cache_hits_total {cache.hits}')
+        header('cache_misses_total', 'counter', 'Result cache misses')
+        lines.append(f'{p}_cache_misses_total {cache.misses}')
+        header('cache_entries', 'gauge', 'Schedules currently held in the result cache')
+        lines.append(f'{p}_cache_entries {len(cache)}')
+
+        if upstream is not None:
+            stats = upstream.stats()
+            header('upstream_requests_total', 'counter', 'Requests sent to upstream (incl. redirects)')
+            lines.append(f"{p}_upstream_requests_total {stats['requests_total']}")
+            header('upstream_connections_opened_total', 'counter', 'New upstream connections (TCP+TLS setup)')
+            lines.append(f"{p}_upstream_connections_opened_total {stats['connections_opened']}")
+            header('upstream_connections_reused_total', 'counter', 'Requests served on a pooled keep-alive connection')
+            lines.append(f"{p}_upstream_connections_reused_total {stats['connections_reused']}")
+            header('upstream_connection_reuse_ratio', 'gauge', 'Share of upstream requests on a reused connection')
+            lines.append(f"{p}_upstream_connection_reuse_ratio {stats['reuse_ratio']:.4f}")
+            header('upstream_connections_idle', 'gauge', 'Idle pooled upstream connections')
+            lines.append(f"{p}_upstream_connections_idle {stats['connections_idle']}")
+            header('upstream_timeouts_total', 'counter', 'Upstream connect/read timeouts and exceeded deadlines')
+            lines.append(f"{p}_upstream_timeouts_total {stats['timeouts']}")
+
+        if admission is not None:
+            stats = admission.stats()
+            header('admission_in_flight', 'gauge', 'Upstream fetches currently admitted')
+            lines.append(f"{p}_admission_in_flight {stats['in_flight']}")
+            header('admission_queued', 'gauge', 'Requests waiting for an upstream slot')
+            lines.append(f"{p}_admission_queued {stats['queued']}")
+            header('admission_admitted_total', 'counter', 'Upstream fetches admitted')
+            lines.append(f"{p}_admission_admitted_total {stats['admitted']}")
+            header('admission_rejected_total', 'counter', 'Requests rejected with 503 (queue full or wait timeout)')
+            lines.append(f"{p}_admission_rejected_total {stats['rejected']}")
+
+        if single_flight is not None:
+            header('coalesced_requests_total', 'counter', 'Requests that shared an in-flight fetch for the same source')
+            lines.append(f"{p}_coalesced_requests_total {single_flight.coalesced}")
+
+        return '\n'.join(lines) + '\n'
+
+
+class CachedSchedule:
+    """Geparster Spielplan plus bereits serialisierte/komprimierte Response-Bodies"""
+
+    def __init__(self, result: Dict, source: str = 'html'):
+        self.result = result
+        self.source = source
+        self.created_at = time.monotonic()
+        self.game_hashes = compute_game_hashes(result['games'])
+        if 'version' not in result:
+            result['version'] = compute_schedule_version(self.game_hashes)
+        self.version = result['version']
+        # (pretty, angefragte Encoding) -> (Response-Body, tatsÃ¤chliche Encoding)
+        self.bodies: Dict[Tuple[bool, str], Tuple[bytes, str]] = {}
+        # (since, pretty, angefragte Encoding) -> (Delta-Body, tatsÃ¤chliche Encoding)
+        self.delta_bodies: Dict[Tuple[str, bool, str], Tuple[bytes, str]] = {}
+        # normalisiertes Team -> (ETag, {angefragte Encoding: (ICS-Body, tatsÃ¤chliche Encoding)})
+        self.calendars: Dict[str, Tuple[str, Dict[str, Tuple[bytes, str]]]] = {}
+
+
+class ScheduleVersionHistory:
+    """
+    Merkt sich die letzten Versionen jedes Spielplans (Spiel-Hashes pro Version)
+
+    Ãœberlebt das Ablaufen von Cache-EintrÃ¤gen, damit Clients mit ?since=<version>
+    auch nach einem Neu-Parsen nur die geÃ¤nderten Spiele erhalten.
+    """
+
+    def __init__(self, depth: int = VERSION_HISTORY_DEPTH, max_keys: int = 1024):
+        self.depth = depth
+        self.max_keys = max_keys
+        self._versions: "OrderedDict[str, OrderedDict[str, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, key: str, entry: CachedSchedule):
+        with self._lock:
+            versions = self._versions.setdefault(key, OrderedDict())
+            self._versions.move_to_end(key)
+            versions[entry.version] = entry.game_hashes
+            versions.move_to_end(entry.version)
+            while len(versions) > self.depth:
+                versions.popitem(last=False)
+            while len(self._versions) > self.max_keys:
+                self._versions.popitem(last=False)
+
+    def get(self, key: str, version: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return self._versions.get(key, {}).get(version)
+
+    @staticmethod
+    def diff(entry: CachedSchedule, old_hashes: Dict[str, str]) -> Dict[str, List]:
+        """Vergleicht den aktuellen Spielplan mit einer frÃ¼heren Version"""
+        added, changed = [], []
+        for game in entry.result['games']:
+            old_hash = old_hashes.get(game['game_number'])
+            if old_hash is None:
+                added.append(game)
+            elif old_hash != entry.game_hashes[game['game_number']]:
+                changed.append(game)
+        removed = sorted(number for number in old_hashes if number not in entry.game_hashes)
+        return {"added": added, "changed": changed, "removed": removed}
+
+
+class ScheduleResultCache:
+    """Thread-sicherer LRU-Cache mit TTL fÃ¼r geparste SpielplÃ¤ne"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedSchedule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedSchedule]:
+        """Liefert einen gÃ¼ltigen Cache-Eintrag oder None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: Dict, source: str = 'html') -> CachedSchedule:
+        """Speichert ein Ergebnis und liefert den neuen Cache-Eintrag"""
+        entry = CachedSchedule(result, source)
+        if self.ttl <= 0:
+            return entry
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class ScheduleHTTPServer(ThreadingHTTPServer):
+    """HTTP-Server mit prozessweitem Parser und Ergebnis-Cache"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, cache_ttl: float = 300, cache_size: int = 256,
+                 base_url: str = BBB_BASE_URL, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 upstream: Optional[UpstreamClient] = None, listen_socket: Optional[socket.socket] = None,
+                 max_upstream: int = DEFAULT_MAX_UPSTREAM, max_queue: int = DEFAULT_MAX_QUEUE):
+        # Der Parser ist zustandslos und wird von allen Request-Threads geteilt
+        self.parser_service = ScheduleParserService(base_url=base_url, upstream=upstream)
+        self.request_timeout = request_timeout
+        self.result_cache = ScheduleResultCache(ttl=cache_ttl, max_entries=cache_size)
+        self.version_history = ScheduleVersionHistory()
+        self.metrics = ServiceMetrics()
+        # Backpressure: begrenzte Upstream-Fetches, gebÃ¼ndelte Fetches pro Quelle
+        self.admission = AdmissionController(max_upstream=max_upstream, max_queue=max_queue)
+        self.single_flight = SingleFlight()
+
+        if listen_socket is None:
+            super().__init__(server_address, handler_class)
+        else:
+            # Prefork-Worker: geerbten Listening-Socket des Supervisors verwenden
+            super().__init__(server_address, handler_class, bind_and_activate=False)
+            self.socket.close()
+            self.socket = listen_socket
+            self.server_address = listen_socket.getsockname()
+
+    def drain(self, timeout: float) -> bool:
+        """Wartet bis alle laufenden Requests beendet sind (nach shutdown())"""
+        drain_deadline = time.monotonic() + timeout
+        while self.metrics.in_flight > 0:
+            if time.monotonic() >= drain_deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+class PreforkSupervisor:
+    """
+    Startet N Worker-Prozesse, die sich einen Listening-Socket teilen
+
+    Das Parsen ist CPU-gebunden und durch den GIL auf einen Kern pro Prozess
+    begrenzt. Jeder Worker hat eigenen Parser, Cache und Upstream-Pool; der
+    Kernel verteilt eingehende Verbindungen auf die Worker.
+
+    Signale an den Supervisor:
+        SIGHUP:          Rolling Restart (neuer Worker starten, alter Worker beendet laufende Requests)
+        SIGTERM/SIGINT:  Alle Worker geordnet beenden
+    """
+
+    def __init__(self, server_factory, listen_socket: socket.socket, workers: int,
+                 drain_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        self.server_factory = server_factory
+        self.listen_socket = listen_socket
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.worker_pids: set = set()
+        self._stopping = False
+        self._restart_requested = False
+
+    def run(self):
+        """Startet die Worker und Ã¼berwacht sie bis zum Beenden"""
+        # Nicht-blockierend, damit Worker die sich um eine Verbindung "streiten" nicht hÃ¤ngen
+        self.listen_socket.setblocking(False)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+
+        for _ in range(self.workers):
+            self._spawn_worker()
+
+        while not self._stopping:
+            if self._restart_requested:
+                self._restart_requested = False
+                self._rolling_restart()
+
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+
+            if pid and pid in self.worker_pids:
+                # Unerwartet beendeter Worker -> ersetzen
+                self.worker_pids.discard(pid)
+                print(f"âš ï¸ Worker {pid} beendet, starte Ersatz...")
+                self._spawn_worker()
+            elif not pid:
+                time.sleep(0.2)
+
+        print("\nðŸ›‘ Server wird beendet...")
+        for pid in list(self.worker_pids):
+            self._stop_worker(pid)
+        self.listen_socket.close()
+
+    def _spawn_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.worker_pids.add(pid)
+
+    def _run_worker(self):
+        """Einstiegspunkt im Worker-Prozess (kehrt nie zurÃ¼ck)"""
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+            httpd = self.server_factory(self.listen_socket)
+
+            def stop(signum, frame):
+                # shutdown() blockiert bis serve_forever() endet -> nicht im Signal-Handler selbst
+                threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+            signal.signal(signal.SIGTERM, stop)
+            httpd.serve_forever()
+            httpd.drain(self.drain_timeout)
+        except Exception as e:
+            print(f"âŒ Worker {os.getpid()} abgestÃ¼rzt: {e}")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+    def _stop_worker(self, pid: int):
+        self.worker_pids.discard(pid)
+        try:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+
+    def _rolling_restart(self):
+        print(f"ðŸ”„ Rolling Restart von {len(self.worker_pids)} Worker(n)...")
+        for pid in list(self.worker_pids):
+            self._spawn_worker()
+            self._stop_worker(pid)
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _handle_restart(self, signum, frame):
+        self._restart_requested = True
+
+
 class ScheduleHTTPHandler(BaseHTTPRequestHandler):
     """HTTP Request Handler fÃ¼r den Spielplan-Service"""
 
-    def __init__(self, *args, **kwargs):
-        self.parser_service = ScheduleParserService()
-        super().__init__(*args, **kwargs)
+    # HTTP/1.1 fÃ¼r Chunked Transfer-Encoding im NDJSON-Modus
+    protocol_version = 'HTTP/1.1'
+
+    # Header und Body werden getrennt geschrieben - ohne TCP_NODELAY wartet der Body
+    # bei Keep-Alive auf das verzÃ¶gerte ACK des Clients (~40ms pro Request)
+    disable_nagle_algorithm = True
+
+    # Bekannte Endpoints fÃ¼r Metrik-Labels (alles andere -> "other")
+    METRIC_ENDPOINTS = ('/parse', '/schedule', '/calendar.ics', '/health', '/metrics', '/')
+
+    def __init__(self, request, client_address, server):
+        self.parser_service = server.parser_service
+        self.metrics = server.metrics
+        super().__init__(request, client_address, server)
+
+    def handle_one_request(self):
+        """Erfasst Dauer, Status und Bytes jedes Requests fÃ¼r /metrics"""
+        self._status_code = None
+        self._request_start = None
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._server_timing: List[str] = []
+        try:
+            super().handle_one_request()
+        finally:
+            if self._request_start is None:
+                pass  # Keep-Alive Verbindung ohne weiteren Request geschlossen
+            elif self._status_code is None:
+                self.metrics.request_aborted()
+            else:
+                path = urllib.parse.urlparse(getattr(self, 'path', '')).path
+                endpoint = path if path in self.METRIC_ENDPOINTS else 'other'
+                self.metrics.request_finished(endpoint, self.command or '-', str(self._status_code),
+                                              time.perf_counter() - self._request_start,
+                                              self._bytes_in, self._bytes_out)
+
+    def parse_request(self):
+        """Startet Zeitmessung und Deadline erst, wenn ein Request tatsÃ¤chlich eintrifft"""
+        self._request_start = time.perf_counter()
+        self.metrics.request_started()
+        self._deadline = time.monotonic() + self.server.request_timeout
+
+        if not super().parse_request():
+            return False
+
+        # Clients kÃ¶nnen eine kÃ¼rzere Deadline setzen (z.B. mobiles Timeout)
+        client_timeout = self.headers.get('X-Request-Timeout')
+        if client_timeout:
+            try:
+                self._deadline = min(self._deadline, time.monotonic() + max(0.0, float(client_timeout)))
+            except ValueError:
+                pass
+        return True
 
     def do_GET(self):
         """Handle GET requests"""
@@ -220,21 +1522,55 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
 
                 target_url = query_params['url'][0]
 
-                # Spielplan parsen
-                result = self.parser_service.parse_schedule_from_url(target_url)
+                # NDJSON-Streaming: Spiele zeilenweise senden
+                if self._wants_ndjson(query_params):
+                    self._send_ndjson_schedule(target_url)
+                    return
 
-                # JSON Response senden
-                self._send_json_response({
-                    "success": True,
-                    **result
-                })
+                # Spielplan parsen (oder aus dem Cache)
+                entry = self._get_schedule(target_url)
+
+                # JSON Response senden (304 / Delta wenn der Client eine Version kennt)
+                self._send_schedule_response(entry, target_url, query_params.get('since', [None])[0])
+
+            elif parsed_url.path == '/schedule':
+                # Spielplan Ã¼ber die JSON REST-API (gÃ¼nstiger als HTML-Scraping)
+                liga_id = query_params.get('ligaId', [''])[0]
+                if not liga_id.isdigit():
+                    self._send_error(400, "Numeric ligaId parameter is required. Usage: /schedule?ligaId=<LIGA_ID>")
+                    return
+
+                entry = self._get_rest_schedule(int(liga_id))
+
+                self._send_schedule_response(entry, f"rest:{liga_id}", query_params.get('since', [None])[0])
+
+            elif parsed_url.path == '/calendar.ics':
+                # iCalendar-Abo fÃ¼r ein Team (url= HTML-Spielplan oder ligaId= REST-Spielplan)
+                team = query_params.get('team', [''])[0].strip()
+                liga_id = query_params.get('ligaId', [''])[0]
+                if 'url' in query_params:
+                    cache_key = query_params['url'][0]
+                    entry = self._get_schedule(cache_key)
+                elif liga_id.isdigit():
+                    cache_key = f"rest:{liga_id}"
+                    entry = self._get_rest_schedule(int(liga_id))
+                else:
+                    self._send_error(400, "URL or ligaId parameter is required. "
+                                          "Usage: /calendar.ics?url=<TARGET_URL>&team=<TEAM>")
+                    return
+
+                self._send_calendar(entry, cache_key, team)
+
+            elif parsed_url.path == '/metrics':
+                self._send_metrics()
 
             elif parsed_url.path == '/health':
                 # Health check endpoint
                 self._send_json_response({
                     "status": "healthy",
                     "service": "Basketball Schedule Parser",
-                    "version": "1.0"
+                    "version": "1.0",
+                    "worker_pid": os.getpid()
                 })
 
             else:
@@ -249,7 +1585,35 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
                             "parameters": {
                                 "url": "URL zur HTML-Seite mit Spielplan (required)"
                             },
-                            "example": "/parse?url=http://example.com/schedule.html"
+                            "example": "/parse?url=http://example.com/schedule.html",
+                            "options": {
+                                "pretty": "1 = eingerÃ¼cktes JSON (Standard: kompakt)",
+                                "Accept-Encoding": "br (falls brotli installiert) oder gzip"
+                            }
+                        },
+                        "GET /parse?url=<TARGET_URL>&stream=1": {
+                            "description": "Stream schedule as NDJSON (also via 'Accept: application/x-ndjson')",
+                            "format": "Header-Zeile mit Liga-Info, dann eine Zeile pro Spiel, zuletzt eine Abschluss-Zeile"
+                        },
+                        "GET /schedule?ligaId=<LIGA_ID>": {
+                            "description": "Schedule from the BBB JSON REST API (same game format, no HTML scraping)",
+                            "parameters": {
+                                "ligaId": "Liga-ID (required)"
+                            },
+                            "example": "/schedule?ligaId=51933"
+                        },
+                        "Versionen (/parse, /schedule)": {
+                            "description": "Jede Antwort enthÃ¤lt 'version' und einen ETag",
+                            "If-None-Match": "304 Not Modified, wenn sich nichts geÃ¤ndert hat",
+                            "since": "?since=<version> liefert nur added/changed/removed Spiele"
+                        },
+                        "GET /calendar.ics?url=<TARGET_URL>&team=<TEAM>": {
+                            "description": "iCalendar subscription with one VEVENT per game of the team",
+                            "parameters": {
+                                "url": "URL zur HTML-Seite mit Spielplan (oder ligaId fÃ¼r die REST-API)",
+                                "team": "Teamname, exakt oder Teilstring (optional, sonst alle Spiele)"
+                            },
+                            "example": "/calendar.ics?ligaId=51933&team=Regensburg Baskets 2"
                         },
                         "POST /parse": {
                             "description": "Parse schedule from URL in JSON body",
@@ -257,11 +1621,20 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
                                 "url": "URL zur HTML-Seite mit Spielplan (required)"
                             }
                         },
+                        "Backpressure": {
+                            "description": "Begrenzte parallele Upstream-Fetches, gleiche URLs teilen sich einen Fetch",
+                            "503": "Service ausgelastet - erneut versuchen nach 'Retry-After' Sekunden"
+                        },
                         "GET /health": "Health check endpoint",
+                        "GET /metrics": "Prometheus metrics (requests, phase latencies, bytes, cache)",
                         "GET /": "API documentation (this page)"
                     }
                 })
 
+        except ServiceOverloaded as e:
+            self._send_error(503, str(e), headers={'Retry-After': str(e.retry_after)})
+        except UpstreamTimeout as e:
+            self._send_error(504, str(e))
         except Exception as e:
             self._send_error(500, str(e))
 
@@ -276,6 +1649,7 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
                     return
 
                 post_data = self.rfile.read(content_length)
+                self._bytes_in = len(post_data)
 
                 try:
                     request_data = json.loads(post_data.decode('utf-8'))
@@ -287,17 +1661,24 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
                     self._send_error(400, "URL field is required in JSON body")
                     return
 
-                # Spielplan parsen
-                result = self.parser_service.parse_schedule_from_url(request_data['url'])
+                if self._wants_ndjson({}) or request_data.get('stream'):
+                    self._send_ndjson_schedule(request_data['url'])
+                    return
 
-                # JSON Response senden
-                self._send_json_response({
-                    "success": True,
-                    **result
-                })
+                # Spielplan parsen (oder aus dem Cache)
+                entry = self._get_schedule(request_data['url'])
+
+                # JSON Response senden (304 / Delta wenn der Client eine Version kennt)
+                self._send_schedule_response(entry, request_data['url'], request_data.get('since'))
             else:
+                # Body wurde nicht gelesen -> Verbindung nicht wiederverwenden
+                self.close_connection = True
                 self._send_error(404, "Endpoint not found")
 
+        except ServiceOverloaded as e:
+            self._send_error(503, str(e), headers={'Retry-After': str(e.retry_after)})
+        except UpstreamTimeout as e:
+            self._send_error(504, str(e))
         except Exception as e:
             self._send_error(500, str(e))
 
@@ -306,51 +1687,641 @@ class ScheduleHTTPHandler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
-    def _send_json_response(self, data: dict, status_code: int = 200):
-        """Send JSON response"""
+    def _send_json_response(self, data: dict, status_code: int = 200,
+                            cache_entry: Optional[CachedSchedule] = None,
+                            body_cache: Optional[Dict] = None, body_cache_key: tuple = (),
+                            headers: Optional[Dict[str, str]] = None, etag: Optional[str] = None):
+        """
+        Send JSON response
+
+        Kompakt serialisiert (eingerÃ¼ckt nur mit ?pretty=1) und je nach
+        Accept-Encoding mit brotli/gzip komprimiert. Mit cache_entry werden
+        die fertigen Bodies im Ergebnis-Cache abgelegt und wiederverwendet
+        (body_cache/body_cache_key fÃ¼r abweichende Darstellungen wie Deltas).
+        Der ETag ist die Version des Eintrags (oder etag), fÃ¼r alle Encodings schwach.
+        """
+        pretty = self._wants_pretty()
+        encoding = self._negotiate_encoding()
+        body_key = body_cache_key + (pretty, encoding)
+        if cache_entry is not None and body_cache is None:
+            body_cache = cache_entry.bodies
+
+        serialize_start = time.thread_time()
+        serialize_wall_start = time.perf_counter()
+        cached_body = body_cache.get(body_key) if body_cache is not None else None
+        body_cached = cached_body is not None
+
+        if cached_body is None:
+            response_body = self._serialize_json(data, pretty)
+            if len(response_body) < MIN_COMPRESS_SIZE:
+                encoding = 'identity'
+            response_body = self._compress(response_body, encoding)
+            if body_cache is not None:
+                body_cache[body_key] = (response_body, encoding)
+        else:
+            response_body, encoding = cached_body
+
+        serialize_ms = (time.thread_time() - serialize_start) * 1000
+        if cache_entry is not None:
+            self.metrics.observe_phase('serialize', time.perf_counter() - serialize_wall_start,
+                                       cache_entry.source)
+        self._response_stats = (len(response_body), encoding, serialize_ms, body_cached)
+
         self.send_response(status_code)
         self.send_header('Content-type', 'application/json; charset=utf-8')
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        if cache_entry is not None:
+            self.send_header('ETag', self._format_etag(etag or cache_entry.version))
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.send_header('Content-Length', str(len(response_body)))
+        self.send_header('Server-Timing', ', '.join(self._server_timing + [f'serialize;dur={serialize_ms:.3f}']))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
 
-        response_json = json.dumps(data, ensure_ascii=False, indent=2)
-        self.wfile.write(response_json.encode('utf-8'))
+        self.wfile.write(response_body)
+        self._bytes_out += len(response_body)
+
+    def _send_schedule_response(self, entry: CachedSchedule, cache_key: str, since: Optional[str]):
+        """
+        Sendet einen Spielplan unter BerÃ¼cksichtigung der Client-Version
+
+        - If-None-Match oder ?since= entspricht der aktuellen Version -> 304 Not Modified
+        - ?since= ist eine bekannte Ã¤ltere Version -> nur added/changed/removed Spiele
+        - sonst -> vollstÃ¤ndiger Spielplan
+        """
+        if entry.version in self._client_etags() or since == entry.version:
+            self._send_not_modified(entry.version)
+            return
+
+        old_hashes = self.server.version_history.get(cache_key, since) if since else None
+        if old_hashes is None:
+            self._send_json_response({"success": True, **entry.result}, cache_entry=entry)
+            return
+
+        # Delta ist eine eigene Darstellung: nie unter dem ETag des vollstÃ¤ndigen
+        # Spielplans ausliefern, sonst revalidiert ein Cache den Teil-Body per 304
+        delta = ScheduleVersionHistory.diff(entry, old_hashes)
+        self._send_json_response({
+            "success": True,
+            "league": entry.result['league'],
+            "source": entry.result['source'],
+            "extracted_at": entry.result['extracted_at'],
+            "version": entry.version,
+            "since": since,
+            "delta": True,
+            "games_count": entry.result['games_count'],
+            **delta
+        }, cache_entry=entry, body_cache=entry.delta_bodies, body_cache_key=(since,),
+            headers={'Cache-Control': 'no-store'}, etag=f"{since}..{entry.version}")
+
+    def _send_calendar(self, entry: CachedSchedule, cache_key: str, team: str):
+        """
+        Sendet den Spielplan eines Teams als iCalendar
+
+        Das gerenderte ICS wird pro (Quelle, Team) am Cache-Eintrag abgelegt. Der ETag
+        hÃ¤ngt nur von den Spielen des Teams ab, sodass pollende Kalender-Clients
+        304 erhalten, solange sich an deren Spielen nichts Ã¤ndert - auch Ã¼ber
+        ein Neu-Parsen des Spielplans hinweg. Der ETag ist deshalb schwach: Bodies
+        mit gleichem ETag unterscheiden sich in DTSTAMP, Liga-Daten und Encoding.
+        Parallele Handler legen Kalender und Bodies per setdefault ab, sodass alle
+        dieselbe Instanz verwenden.
+        """
+        team_key = _normalize_team_name(team)
+        encoding = self._negotiate_encoding()
+
+        render_start = time.thread_time()
+        calendar = entry.calendars.get(team_key)
+        body_cached = calendar is not None
+        if calendar is None:
+            games = filter_games_for_team(entry.result['games'], team)
+            digest = hashlib.blake2b(f"ics:{team_key}".encode('utf-8'), digest_size=8)
+            for game in games:
+                digest.update(f"{game['game_number']}:{entry.game_hashes[game['game_number']]};".encode('utf-8'))
+            ics_body = render_schedule_ics(entry.result, games, team or None,
+                                           hashlib.blake2b(cache_key.encode('utf-8'), digest_size=6).hexdigest())
+            calendar = entry.calendars.setdefault(team_key, (digest.hexdigest(), {'identity': (ics_body, 'identity')}))
+
+        etag, bodies = calendar
+        if etag in self._client_etags():
+            self._send_not_modified(etag)
+            return
+
+        cached_body = bodies.get(encoding)
+        body_cached = body_cached and cached_body is not None
+        if cached_body is None:
+            ics_body = bodies['identity'][0]
+            actual_encoding = encoding if len(ics_body) >= MIN_COMPRESS_SIZE else 'identity'
+            cached_body = bodies.setdefault(encoding, (self._compress(ics_body, actual_encoding), actual_encoding))
+        response_body, encoding = cached_body
+        render_ms = (time.thread_time() - render_start) * 1000
+        self._response_stats = (len(response_body), encoding, render_ms, body_cached)
+
+        self.send_response(200)
+        self.send_header('Content-type', 'text/calendar; charset=utf-8')
+        self.send_header('Content-Disposition', 'inline; filename="spielplan.ics"')
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', self._format_etag(etag))
+        self.send_header('Cache-Control', f'max-age={int(self.server.result_cache.ttl)}')
+        self.send_header('Content-Length', str(len(response_body)))
+        self.send_header('Server-Timing', ', '.join(self._server_timing + [f'render;dur={render_ms:.3f}']))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+
+        self.wfile.write(response_body)
+        self._bytes_out += len(response_body)
+
+    def _client_etags(self) -> set:
+        """Versionen aus dem If-None-Match Header (ohne AnfÃ¼hrungszeichen und W/ PrÃ¤fix)"""
+        if_none_match = self.headers.get('If-None-Match', '')
+        return {tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')} - {''}
+
+    @staticmethod
+    def _format_etag(etag: str) -> str:
+        """Schwacher ETag: identity/gzip/br und ?pretty=1 liefern denselben Inhalt in anderen Bytes"""
+        return f'W/"{etag}"'
+
+    def _send_not_modified(self, etag: str):
+        """Sendet 304 Not Modified ohne Body"""
+        self.send_response(304)
+        self.send_header('ETag', self._format_etag(etag))
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+
+    def _store_schedule(self, cache_key: str, result: Dict, source: str = 'html') -> CachedSchedule:
+        """Legt ein frisch geparstes Ergebnis im Cache ab und merkt sich seine Version"""
+        entry = self.server.result_cache.put(cache_key, result, source=source)
+        self.server.version_history.record(cache_key, entry)
+        return entry
+
+    def _send_metrics(self):
+        """Sendet die Metriken im Prometheus Text-Format"""
+        response_body = self.metrics.render(self.server.result_cache, self.parser_service.upstream,
+                                            self.server.admission, self.server.single_flight).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(response_body)))
+        self.end_headers()
+
+        self.wfile.write(response_body)
+        self._bytes_out += len(response_body)
+
+    def _get_schedule(self, target_url: str) -> CachedSchedule:
+        """Liefert den Spielplan aus dem Ergebnis-Cache oder parst ihn neu (gebÃ¼ndelt pro URL)"""
+        entry = self.server.result_cache.get(target_url)
+        if entry is None:
+            entry = self.server.single_flight.do(target_url, lambda: self._load_schedule(target_url), self._deadline)
+        return entry
+
+    def _load_schedule(self, target_url: str) -> CachedSchedule:
+        html_content = self._fetch_upstream(self.parser_service.fetch_raw, target_url, 'html',
+                                            "Fehler beim Laden der URL").decode('utf-8', errors='ignore')
+        result = self._timed_parse(self.parser_service.parse_schedule_from_html, html_content, 'html')
+        return self._store_schedule(target_url, result)
+
+    def _get_rest_schedule(self, liga_id: int) -> CachedSchedule:
+        """Liefert den REST-Spielplan einer Liga aus dem Ergebnis-Cache oder lÃ¤dt ihn neu"""
+        cache_key = f"rest:{liga_id}"
+        entry = self.server.result_cache.get(cache_key)
+        if entry is None:
+            entry = self.server.single_flight.do(cache_key, lambda: self._load_rest_schedule(liga_id), self._deadline)
+        return entry
+
+    def _load_rest_schedule(self, liga_id: int) -> CachedSchedule:
+        raw_content = self._fetch_upstream(self.parser_service.fetch_rest_spielplan, liga_id, 'rest',
+                                           "Fehler beim Laden des REST-Spielplans")
+        result = self._timed_parse(self.parser_service.parse_schedule_from_rest_json, raw_content, 'rest')
+        return self._store_schedule(f"rest:{liga_id}", result, source='rest')
+
+    def _fetch_upstream(self, fetch, target, source: str, error_prefix: str) -> bytes:
+        """FÃ¼hrt einen Upstream-Fetch mit der Request-Deadline aus und erfasst Dauer und Bytes"""
+        queue_start = time.perf_counter()
+        self.server.admission.acquire(self._deadline)
+        fetch_start = time.perf_counter()
+        queue_ms = (fetch_start - queue_start) * 1000
+        if queue_ms >= 1:
+            self._server_timing.append(f'queue;dur={queue_ms:.3f}')
+        try:
+            raw_content = fetch(target, deadline=self._deadline)
+        except UpstreamTimeout as e:
+            raise UpstreamTimeout(f"{error_prefix}: {str(e)}")
+        except Exception as e:
+            raise Exception(f"{error_prefix}: {str(e)}")
+        finally:
+            fetch_duration = time.perf_counter() - fetch_start
+            self.server.admission.release(fetch_duration)
+            self.metrics.observe_phase('fetch', fetch_duration, source)
+            self._server_timing.append(f'fetch;dur={fetch_duration * 1000:.3f}')
+
+        self.metrics.add_upstream_bytes(len(raw_content), source)
+        return raw_content
+
+    def _timed_parse(self, parse, content, source: str) -> Dict:
+        """FÃ¼hrt das Parsing aus und erfasst Dauer, CPU-Zeit und Anzahl der Spiele"""
+        parse_start = time.perf_counter()
+        parse_cpu_start = time.thread_time()
+        result = parse(content)
+        parse_cpu_ms = (time.thread_time() - parse_cpu_start) * 1000
+
+        self.metrics.observe_phase('parse', time.perf_counter() - parse_start, source)
+        self.metrics.add_games_parsed(result['games_count'])
+        self._server_timing.append(f'parse;dur={parse_cpu_ms:.3f};desc="{source} parse CPU"')
+        return result
+
+    def _wants_pretty(self) -> bool:
+        """PrÃ¼ft ob eingerÃ¼cktes JSON angefordert wurde (?pretty=1)"""
+        query_params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        return query_params.get('pretty', [''])[0].lower() in ('1', 'true', 'yes')
+
+    def _negotiate_encoding(self) -> str:
+        """WÃ¤hlt die Content-Encoding anhand des Accept-Encoding Headers"""
+        accepted = {}
+        for part in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = part.strip().partition(';')
+            if not name:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+
+        if brotli is not None and accepted.get('br', 0) > 0:
+            return 'br'
+        if accepted.get('gzip', 0) > 0:
+            return 'gzip'
+        return 'identity'
+
+    @staticmethod
+    def _serialize_json(data: dict, pretty: bool) -> bytes:
+        """Serialisiert kompakt oder eingerÃ¼ckt nach UTF-8"""
+        if pretty:
+            return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def _compress(body: bytes, encoding: str) -> bytes:
+        """Komprimiert den Body mit der gewÃ¤hlten Content-Encoding"""
+        if encoding == 'br':
+            return brotli.compress(body, quality=5)
+        if encoding == 'gzip':
+            return gzip.compress(body, compresslevel=6)
+        return body
+
+    def _wants_ndjson(self, query_params: dict) -> bool:
+        """PrÃ¼ft ob der Client eine NDJSON-Stream-Antwort angefordert hat"""
+        if query_params.get('stream', [''])[0].lower() in ('1', 'true', 'yes'):
+            return True
+        return 'application/x-ndjson' in self.headers.get('Accept', '')
+
+    def _send_ndjson_schedule(self, target_url: str):
+        """
+        Sendet den Spielplan als NDJSON-Stream
+
+        Erste Zeile: Header-Objekt mit Liga-Informationen
+        Danach: eine kompakte JSON-Zeile pro Spiel, sobald es geparst ist
+        Letzte Zeile: Abschluss-Objekt mit der Anzahl der Spiele und der Version
+
+        Ein Cache-Miss lÃ¤uft wie beim JSON-Pfad Ã¼ber SingleFlight (SchlÃ¼ssel: URL):
+        der Leader streamt die Spiele direkt aus dem Parser und legt sie dabei im
+        Cache ab (tee), gleichzeitige Requests fÃ¼r dieselbe URL warten auf dieses
+        Ergebnis und spielen es danach ab - wie Cache-Treffer.
 
-    def _send_error(self, status_code: int, message: str):
+        Args:
+            target_url: URL zur HTML-Seite mit dem Spielplan
+        """
+        # Fehler beim Laden werden noch als normale JSON-Fehler gesendet
+        entry = self.server.result_cache.get(target_url)
+        if entry is None:
+            call, leader = self.server.single_flight.join(target_url)
+            if not leader:
+                entry = self.server.single_flight.wait(call, self._deadline)
+            else:
+                try:
+                    html_content = self._fetch_upstream(self.parser_service.fetch_raw, target_url, 'html',
+                                                        "Fehler beim Laden der URL").decode('utf-8', errors='ignore')
+                    league_info, games_iter = self.parser_service.stream_schedule_from_html(html_content)
+                except BaseException as e:
+                    self.server.single_flight.finish(target_url, call, error=e)
+                    raise
+                self._stream_ndjson_leader(target_url, call, league_info, games_iter)
+                return
+
+        chunked = self._start_ndjson_response()
+        header = {
+            "success": True,
+            "league": entry.result['league'],
+            "source": entry.result['source'],
+            "extracted_at": entry.result['extracted_at']
+        }
+        try:
+            games, connected = tee_ndjson_games(header, iter(entry.result['games']),
+                                                lambda data: self._write_ndjson_line(data, chunked))
+        except Exception as e:
+            games, connected = [], True
+            self._write_ndjson_line({"success": False, "error": str(e), "games_count": 0}, chunked)
+            entry = None
+        self._finish_ndjson_response(chunked, connected, entry, len(games))
+
+    def _stream_ndjson_leader(self, target_url: str, call: _FlightCall, league_info: str, games_iter: Iterator[Dict]):
+        """Streamt als SingleFlight-Leader die Spiele direkt aus dem Parser und cacht das Ergebnis"""
+        chunked = self._start_ndjson_response()
+        header = {
+            "success": True,
+            "league": league_info,
+            "source": "Deutscher Basketball-Bund e.V.",
+            "extracted_at": datetime.now().isoformat()
+        }
+
+        entry = None
+        games: List[Dict] = []
+        connected = True
+        try:
+            games, connected = tee_ndjson_games(header, games_iter,
+                                                lambda data: self._write_ndjson_line(data, chunked))
+
+            # VollstÃ¤ndig gestreamte SpielplÃ¤ne fÃ¼r Follower und spÃ¤tere Requests cachen
+            self.metrics.add_games_parsed(len(games))
+            result = self.parser_service.build_result(league_info, games)
+            result['extracted_at'] = header['extracted_at']
+            entry = self._store_schedule(target_url, result)
+            self.server.single_flight.finish(target_url, call, entry)
+        except Exception as e:
+            self.server.single_flight.finish(target_url, call, error=e)
+            if connected:
+                # Header sind bereits gesendet -> Fehler als letzte Zeile melden
+                self._write_ndjson_line({"success": False, "error": str(e), "games_count": len(games)}, chunked)
+        except BaseException as e:
+            self.server.single_flight.finish(target_url, call, error=e)
+            raise
+
+        self._finish_ndjson_response(chunked, connected, entry, len(games))
+
+    def _start_ndjson_response(self) -> bool:
+        """Sendet Status und Header des NDJSON-Streams -> ob chunked Ã¼bertragen wird"""
+        # HTTP/1.0 Clients kennen kein Chunked Encoding -> Verbindung schlieÃŸt den Stream
+        chunked = self.request_version != 'HTTP/1.0'
+
+        self.send_response(200)
+        self.send_header('Content-type', 'application/x-ndjson; charset=utf-8')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.close_connection = True
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.end_headers()
+        return chunked
+
+    def _finish_ndjson_response(self, chunked: bool, connected: bool, entry: Optional[CachedSchedule],
+                                games_count: int):
+        """Schreibt die Abschluss-Zeile (falls erfolgreich) und beendet den Stream"""
+        if not connected:
+            # Client hat die Verbindung geschlossen
+            self.close_connection = True
+            return
+        try:
+            if entry is not None:
+                self._write_ndjson_line({"done": True, "games_count": games_count, "version": entry.version},
+                                        chunked)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_ndjson_line(self, data: dict, chunked: bool):
+        """Schreibt ein Objekt als kompakte JSON-Zeile (optional als HTTP-Chunk)"""
+        line = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+        if chunked:
+            line = f"{len(line):X}\r\n".encode('ascii') + line + b"\r\n"
+        self.wfile.write(line)
+        self._bytes_out += len(line)
+        self.wfile.flush()
+
+    def _send_error(self, status_code: int, message: str, headers: Optional[Dict[str, str]] = None):
         """Send error response"""
         self._send_json_response({
             "success": False,
             "error": message,
             "status_code": status_code
-        }, status_code)
+        }, status_code, headers=headers)
+
+    def log_request(self, code='-', size='-'):
+        """Loggt Requests inkl. Bytes auf der Leitung und Serialisierungs-CPU"""
+        self._status_code = code.value if hasattr(code, 'value') else code
+        stats = getattr(self, '_response_stats', None)
+        if stats is None:
+            self.log_message('"%s" %s %s', self.requestline, str(code), str(size))
+            return
+
+        self._response_stats = None
+        size, encoding, serialize_ms, body_cached = stats
+        self.log_message('"%s" %s %dB %s serialize=%.2fms%s', self.requestline, str(code),
+                         size, encoding, serialize_ms, ' (cached body)' if body_cached else '')
 
     def log_message(self, format, *args):
         """Override to customize logging"""
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [{self.address_string()}] {format % args}")
 
-def start_server(port: int = 8000, host: str = 'localhost'):
+# Parser-Instanz pro Bulk-Worker-Prozess (wird im Initializer einmal aufgebaut)
+_bulk_parser_service: Optional[ScheduleParserService] = None
+
+_BULK_WARMUP_HTML = """
+<table class="sportView"><tr>
+<td class="sportItemEven">1000</td><td class="sportItemEven">1</td>
+<td class="sportItemEven">01.01.2025 10:00</td><td class="sportItemEven">Heim&nbsp;1</td>
+<td class="sportItemEven">Gast 1</td><td class="sportItemEven">Halle</td>
+</tr></table>
+"""
+
+
+def _init_bulk_worker(base_url: str = BBB_BASE_URL):
+    """Initializer der Worker-Prozesse: Parser aufbauen und einmal aufwÃ¤rmen"""
+    global _bulk_parser_service
+    _bulk_parser_service = ScheduleParserService(base_url=base_url)
+    _bulk_parser_service.parse_schedule_from_html(_BULK_WARMUP_HTML)
+
+
+def _parse_bulk_document(path: str) -> Dict:
+    """Parst ein gespeichertes HTML-Dokument (lÃ¤uft im Worker-Prozess)"""
+    if _bulk_parser_service is None:
+        _init_bulk_worker()
+
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            html_content = f.read().decode('utf-8', errors='ignore')
+        result = _bulk_parser_service.parse_schedule_from_html(html_content)
+    except Exception as e:
+        return {"file": path, "success": False, "error": str(e)}
+
+    return {
+        "file": path,
+        "success": True,
+        "parse_ms": round((time.perf_counter() - start) * 1000, 3),
+        "worker_pid": os.getpid(),
+        **result
+    }
+
+
+def parse_documents_bulk(paths: List[str], workers: Optional[int] = None,
+                         base_url: str = BBB_BASE_URL) -> Iterator[Dict]:
+    """
+    Parst viele gespeicherte Spielplan-Seiten parallel in einem Prozess-Pool
+
+    Die Worker bekommen nur Dateipfade und lesen die Dokumente selbst, die
+    Ergebnisse werden in Fertigstellungs-Reihenfolge geliefert. Pro Worker sind
+    hÃ¶chstens BULK_MAX_PENDING_PER_WORKER AuftrÃ¤ge offen, damit der Speicher
+    auch bei tausenden Dateien begrenzt bleibt.
+
+    Args:
+        paths: Pfade zu HTML-Dateien
+        workers: Anzahl Worker-Prozesse (Standard: Anzahl CPU-Kerne, 1 = ohne Pool)
+        base_url: Basis-URL fÃ¼r den Parser in den Workern
+
+    Yields:
+        Ergebnis-Dictionary pro Datei (mit "file" und "success")
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) <= 1:
+        # Kein Pool-Overhead (Prozessstart, Pickling) fÃ¼r einzelne Dateien oder einen Kern
+        _init_bulk_worker(base_url)
+        for path in paths:
+            yield _parse_bulk_document(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_bulk_worker,
+                             initargs=(base_url,)) as executor:
+        remaining = iter(paths)
+        pending = set()
+        for path in itertools.islice(remaining, workers * BULK_MAX_PENDING_PER_WORKER):
+            pending.add(executor.submit(_parse_bulk_document, path))
+
+        while pending:
+            done = next(as_completed(pending))
+            pending.remove(done)
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.add(executor.submit(_parse_bulk_document, next_path))
+            yield done.result()
+
+
+def run_parse_dir(directory: str, output: str = '-', workers: Optional[int] = None,
+                  base_url: str = BBB_BASE_URL) -> int:
+    """
+    Parst alle gespeicherten Spielplan-Seiten eines Verzeichnisses nach NDJSON
+
+    Jede fertige Datei wird sofort als eine JSON-Zeile geschrieben; die
+    Zusammenfassung geht nach stderr, damit stdout reines NDJSON bleibt.
+
+    Args:
+        directory: Verzeichnis mit HTML-Dateien (rekursiv, siehe BULK_FILE_PATTERNS)
+        output: Ausgabedatei oder '-' fÃ¼r stdout
+        workers: Anzahl Worker-Prozesse (Standard: Anzahl CPU-Kerne)
+        base_url: Basis-URL fÃ¼r den Parser
+
+    Returns:
+        Anzahl fehlgeschlagener Dateien
+    """
+    paths = sorted({
+        path
+        for pattern in BULK_FILE_PATTERNS
+        for path in glob.glob(os.path.join(directory, '**', pattern), recursive=True)
+    })
+    workers = workers or os.cpu_count() or 1
+    print(f"ðŸ“‚ {len(paths)} Dateien in {directory}, {workers} Worker", file=sys.stderr)
+
+    out = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    documents = games = failed = 0
+    try:
+        for result in parse_documents_bulk(paths, workers=workers, base_url=base_url):
+            out.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')) + '\n')
+            out.flush()
+            documents += 1
+            if result['success']:
+                games += result['games_count']
+            else:
+                failed += 1
+                print(f"âŒ {result['file']}: {result['error']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    duration = time.perf_counter() - start
+    print(f"âœ… {documents} Dateien, {games} Spiele, {failed} Fehler in {duration:.2f}s "
+          f"({documents / duration if duration else 0:.1f} Dateien/s)", file=sys.stderr)
+    return failed
+
+
+def start_server(port: int = 8000, host: str = 'localhost', cache_ttl: float = 300, cache_size: int = 256,
+                 base_url: str = BBB_BASE_URL, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 upstream_connections: int = UPSTREAM_MAX_CONNECTIONS_PER_HOST, workers: int = 1,
+                 max_upstream: int = DEFAULT_MAX_UPSTREAM, max_queue: int = DEFAULT_MAX_QUEUE):
     """
     Start the HTTP server
 
     Args:
         port: Port number (default: 8000)
         host: Host address (default: localhost)
+        cache_ttl: Lebensdauer gecachter SpielplÃ¤ne in Sekunden (0 = kein Cache)
+        cache_size: Maximale Anzahl gecachter SpielplÃ¤ne
+        base_url: Basis-URL der BBB REST-API fÃ¼r /schedule
+        request_timeout: Gesamt-Deadline pro Request in Sekunden (inkl. Upstream-Fetch)
+        upstream_connections: Maximale parallele Upstream-Verbindungen pro Host (pro Worker)
+        workers: Anzahl der Worker-Prozesse (>1 = Prefork-Modus, nur auf POSIX-Systemen)
+        max_upstream: Maximale parallele Upstream-Fetches (pro Worker)
+        max_queue: Maximale Anzahl auf einen Upstream-Platz wartender Requests, darÃ¼ber 503 (pro Worker)
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, ScheduleHTTPHandler)
+
+    def make_server(listen_socket: Optional[socket.socket] = None) -> ScheduleHTTPServer:
+        return ScheduleHTTPServer(server_address, ScheduleHTTPHandler, cache_ttl=cache_ttl, cache_size=cache_size,
+                                  base_url=base_url, request_timeout=request_timeout,
+                                  upstream=UpstreamClient(max_connections_per_host=upstream_connections),
+                                  listen_socket=listen_socket, max_upstream=max_upstream, max_queue=max_queue)
+
+    if workers > 1 and not hasattr(os, 'fork'):
+        print("âš ï¸ Prefork-Modus wird auf diesem System nicht unterstÃ¼tzt, starte mit einem Prozess")
+        workers = 1
+
+    httpd = make_server() if workers == 1 else None
 
     print(f"ðŸ€ Basketball Schedule Parser Service")
     print(f"ðŸ“¡ Server gestartet auf http://{host}:{port}")
+    if workers > 1:
+        print(f"âš™ï¸ Prefork-Modus: {workers} Worker (SIGHUP = Rolling Restart)")
     print(f"")
     print(f"ðŸ“– API Endpoints:")
     print(f"  GET  http://{host}:{port}/parse?url=<TARGET_URL>")
+    print(f"  GET  http://{host}:{port}/parse?url=<TARGET_URL>&stream=1 (NDJSON)")
+    print(f"  GET  http://{host}:{port}/schedule?ligaId=<LIGA_ID> (REST-API statt HTML)")
+    print(f"  GET  http://{host}:{port}/calendar.ics?url=<TARGET_URL>&team=<TEAM> (iCalendar-Abo)")
     print(f"  POST http://{host}:{port}/parse (JSON body mit 'url' field)")
     print(f"  GET  http://{host}:{port}/health")
+    print(f"  GET  http://{host}:{port}/metrics (Prometheus)")
     print(f"  GET  http://{host}:{port}/ (API Documentation)")
     print(f"")
     print(f"ðŸ’¡ Beispiel:")
@@ -359,12 +2330,180 @@ def start_server(port: int = 8000, host: str = 'localhost'):
     print(f"ðŸ›‘ DrÃ¼cke Ctrl+C zum Beenden...")
     print(f"")
 
+    if workers > 1:
+        listen_socket = socket.create_server(server_address, backlog=128)
+        PreforkSupervisor(make_server, listen_socket, workers, drain_timeout=request_timeout).run()
+        return
+
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nðŸ›‘ Server wird beendet...")
         httpd.shutdown()
 
+def parse_with_bs4(service: ScheduleParserService, html_content: str) -> Tuple[str, List[Dict]]:
+    """
+    Referenz-Parsing mit BeautifulSoup (frÃ¼herer Ansatz)
+
+    DOM aufbauen, find_all('tr'/'td'), get_text() pro Zelle - die Zeilen laufen
+    durch dieselbe Spiel-Extraktion wie beim Row-Scanner.
+
+    Returns:
+        Tuple aus Liga-Informationen und Spieldaten
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    title_cell = soup.find('td', class_='sportViewTitle')
+    league_info = service._clean_text(title_cell.get_text()) if title_cell else "Unbekannte Liga"
+    games = []
+    for row in soup.find_all('tr'):
+        game_data = service._extract_game_data([cell.get_text() for cell in row.find_all('td')])
+        if game_data:
+            games.append(game_data)
+    return league_info, games
+
+
+def check_scanner_parity(service: ScheduleParserService, directory: str) -> List[str]:
+    """
+    Vergleicht Row-Scanner und BeautifulSoup auf gespeicherten Spielplan-Seiten
+
+    Args:
+        service: Parser-Service
+        directory: Verzeichnis mit gespeicherten Seiten (alle Dateien)
+
+    Returns:
+        Pfade der Dateien, bei denen Liga oder Spiel-Liste abweichen
+    """
+    mismatches = []
+    for path in sorted(glob.glob(os.path.join(directory, '*'))):
+        with open(path, 'rb') as f:
+            html_content = f.read().decode('utf-8', errors='ignore')
+        league_info, games = service.stream_schedule_from_html(html_content)
+        if (league_info, list(games)) != parse_with_bs4(service, html_content):
+            mismatches.append(path)
+    return mismatches
+
+
+def run_microbenchmark(rows: int = 500, repeat: int = 5):
+    """
+    Misst die CPU-Kosten pro Spielzeile
+
+    Vergleicht den Row-Scanner mit dem frÃ¼heren BeautifulSoup-Ansatz
+    (DOM aufbauen, find_all('tr'/'td'), get_text() pro Zelle), falls bs4 installiert ist.
+
+    Args:
+        rows: Anzahl der generierten Spielzeilen
+        repeat: Anzahl der Messungen (bester Wert zÃ¤hlt)
+    """
+    row_template = (
+        '<tr>\n'
+        '<td class="sportItemEven" align="center">{nr}</td>\n'
+        '<td class="sportItemEven" align="center">{tag}</td>\n'
+        '<td class="sportItemEven"><span>12.10.2025 12:00</span></td>\n'
+        '<td class="sportItemEven">DJK Neustadt a. d. Waldnaab&nbsp;1</td>\n'
+        '<td class="sportItemEven">Regensburg Baskets 2</td>\n'
+        '<td class="sportItemEven">Gymnasium</td>\n'
+        '<td class="sportItemEven">&nbsp;</td>\n'
+        '</tr>\n'
+    )
+    test_html = (
+        '<table><tr><td class="sportViewTitle">Spielplan - Microbenchmark</td></tr></table>\n'
+        '<table class="sportView">\n'
+        + ''.join(row_template.format(nr=1000 + i, tag=i % 22 + 1) for i in range(rows))
+        + '</table>\n'
+    )
+
+    def measure(parse) -> float:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.process_time()
+            games_count = parse()
+            best = min(best, time.process_time() - start)
+        assert games_count == rows, f"{games_count} statt {rows} Spielen geparst"
+        return best * 1_000_000 / rows
+
+    service = ScheduleParserService()
+    scanner_us = measure(lambda: service.parse_schedule_from_html(test_html)['games_count'])
+    print(f"ðŸ“Š Microbenchmark ({rows} Spielzeilen, bester von {repeat} LÃ¤ufen)")
+    print(f"   Row-Scanner:   {scanner_us:8.2f} Âµs/Spiel")
+
+    if BeautifulSoup is None:
+        print("   BeautifulSoup: nicht installiert (pip install beautifulsoup4 fÃ¼r den Vergleich)")
+        return
+
+    bs4_us = measure(lambda: len(parse_with_bs4(service, test_html)[1]))
+    print(f"   BeautifulSoup: {bs4_us:8.2f} Âµs/Spiel")
+    print(f"   Faktor:        {bs4_us / scanner_us:8.1f}x")
+
+def check_ndjson_streaming(service: ScheduleParserService, html: str, delay: float = 0.05) -> bool:
+    """
+    Smoke-Test fÃ¼r den NDJSON-Stream: Zeilen gehen raus, bevor das Parsing fertig ist
+
+    Die Spiele kommen Ã¼ber einen verzÃ¶gerten Generator. Wird er nach dem ersten
+    Spiel weiter abgefragt, mÃ¼ssen Header-Zeile und erste Spiel-Zeile bereits
+    geschrieben sein - ein gepufferter Stream wÃ¼rde erst nach dem letzten Spiel
+    schreiben.
+
+    Returns:
+        True wenn Header und erstes Spiel vor dem Ende des Parsings geschrieben wurden
+    """
+    league_info, games = service.stream_schedule_from_html(html)
+    lines: List[Dict] = []
+    written_while_parsing: List[int] = []
+
+    def slow_games():
+        for game in games:
+            yield game
+            written_while_parsing.append(len(lines))
+            time.sleep(delay)
+
+    header = {"success": True, "league": league_info}
+    collected, _ = tee_ndjson_games(header, slow_games(), lines.append)
+    return bool(collected) and written_while_parsing[0] >= 2 and lines[1] == collected[0]
+
+
+def compare_sources(liga_id: int, base_url: str = BBB_BASE_URL, repeat: int = 3):
+    """
+    Vergleicht HTML-Scraping und JSON REST-API fÃ¼r dieselbe Liga
+
+    Misst pro Quelle Latenz des Upstream-Fetches, Parse-CPU, Bytes und Anzahl der Spiele.
+
+    Args:
+        liga_id: Liga-ID
+        base_url: Basis-URL von basketball-bund.net
+        repeat: Anzahl der Messungen (bester Wert zÃ¤hlt)
+    """
+    service = ScheduleParserService(base_url=base_url)
+    html_url = service.base_url + HTML_SPIELPLAN_PATH.format(liga_id=liga_id)
+
+    sources = {
+        'html': (lambda: service.fetch_raw(html_url),
+                 lambda raw: service.parse_schedule_from_html(raw.decode('utf-8', errors='ignore'))),
+        'rest': (lambda: service.fetch_rest_spielplan(liga_id),
+                 service.parse_schedule_from_rest_json),
+    }
+
+    print(f"ðŸ“Š Quellen-Vergleich fÃ¼r Liga {liga_id} (bester von {repeat} LÃ¤ufen)")
+    measurements = {}
+    for source, (fetch, parse) in sources.items():
+        best_fetch = best_cpu = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            raw_content = fetch()
+            best_fetch = min(best_fetch, time.perf_counter() - start)
+
+            cpu_start = time.process_time()
+            result = parse(raw_content)
+            best_cpu = min(best_cpu, time.process_time() - cpu_start)
+
+        measurements[source] = (best_fetch, best_cpu)
+        print(f"   {source.upper():4s}: Fetch {best_fetch * 1000:8.1f} ms | Parse-CPU {best_cpu * 1000:7.2f} ms | "
+              f"{len(raw_content):8d} Bytes | {result['games_count']} Spiele")
+
+    html_fetch, html_cpu = measurements['html']
+    rest_fetch, rest_cpu = measurements['rest']
+    print(f"   Ersparnis REST: Latenz {(html_fetch - rest_fetch) * 1000:+.1f} ms, "
+          f"Parse-CPU {(html_cpu - rest_cpu) * 1000:+.2f} ms")
+
 def main():
     """Main function"""
     import argparse
@@ -372,11 +2511,41 @@ def main():
     parser = argparse.ArgumentParser(description='Basketball Schedule Parser Service')
     parser.add_argument('--port', type=int, default=8000, help='Port number (default: 8000)')
     parser.add_argument('--host', default='localhost', help='Host address (default: localhost)')
+    parser.add_argument('--cache-ttl', type=float, default=300, help='Result cache TTL in seconds, 0 disables (default: 300)')
+    parser.add_argument('--cache-size', type=int, default=256, help='Max cached schedules (default: 256)')
     parser.add_argument('--test', action='store_true', help='Run test with sample data')
+    parser.add_argument('--base-url', default=BBB_BASE_URL, help=f'BBB base URL for REST requests (default: {BBB_BASE_URL})')
+    parser.add_argument('--request-timeout', type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                        help=f'Overall deadline per request in seconds (default: {DEFAULT_REQUEST_TIMEOUT:g})')
+    parser.add_argument('--upstream-connections', type=int, default=UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+                        help=f'Max concurrent upstream connections per host (default: {UPSTREAM_MAX_CONNECTIONS_PER_HOST})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of prefork worker processes sharing the port (default: 1)')
+    parser.add_argument('--max-upstream', type=int, default=DEFAULT_MAX_UPSTREAM,
+                        help=f'Max concurrent upstream fetches per worker (default: {DEFAULT_MAX_UPSTREAM})')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f'Max requests waiting for an upstream slot before 503 (default: {DEFAULT_MAX_QUEUE})')
+    parser.add_argument('--compare', type=int, metavar='LIGA_ID',
+                        help='Compare latency and parse CPU of HTML scraping vs. the JSON REST API for one Liga')
+    parser.add_argument('--parse-dir', metavar='DIR',
+                        help='Parse all saved schedule pages (*.html, *.htm, *.jsp) in DIR to NDJSON and exit')
+    parser.add_argument('--output', default='-', metavar='FILE',
+                        help='NDJSON output file for --parse-dir (default: stdout)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Worker processes for --parse-dir (default: number of CPU cores)')
+    parser.add_argument('--microbench', type=int, nargs='?', const=500, metavar='ROWS',
+                        help='Measure per-row parse cost on ROWS synthetic games (default: 500)')
 
     args = parser.parse_args()
 
-    if args.test:
+    if args.parse_dir:
+        failed = run_parse_dir(args.parse_dir, args.output, args.parse_workers, args.base_url)
+        sys.exit(1 if failed else 0)
+    elif args.microbench:
+        run_microbenchmark(args.microbench)
+    elif args.compare:
+        compare_sources(args.compare, args.base_url)
+    elif args.test:
         # Test mode
         print("ðŸ§ª Test Mode - Parsing sample HTML...")
         service = ScheduleParserService()
@@ -399,9 +2568,27 @@ def main():
         result = service.parse_schedule_from_html(test_html)
         print("âœ… Test erfolgreich!")
         print(json.dumps(result, ensure_ascii=False, indent=2))
+
+        if not check_ndjson_streaming(service, test_html):
+            print("âŒ NDJSON-Stream: Header und erstes Spiel wurden erst nach dem Parsing geschrieben")
+            sys.exit(1)
+        print("âœ… NDJSON-Stream: Header und erstes Spiel vor Ende des Parsings geschrieben")
+
+        if BeautifulSoup is None:
+            print("âš ï¸ Scanner-ParitÃ¤t: BeautifulSoup nicht installiert - Ã¼bersprungen")
+        else:
+            fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bbb')
+            mismatches = check_scanner_parity(service, fixtures_dir)
+            if mismatches:
+                print(f"âŒ Scanner-ParitÃ¤t: Abweichung zu BeautifulSoup in {', '.join(mismatches)}")
+                sys.exit(1)
+            print(f"âœ… Scanner-ParitÃ¤t: identische Spiele wie BeautifulSoup ({fixtures_dir})")
     else:
         # Server mode
-        start_server(args.port, args.host)
+        start_server(args.port, args.host, cache_ttl=args.cache_ttl, cache_size=args.cache_size,
+                     base_url=args.base_url, request_timeout=args.request_timeout,
+                     upstream_connections=args.upstream_connections, workers=args.workers,
+                     max_upstream=args.max_upstream, max_queue=args.max_queue)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
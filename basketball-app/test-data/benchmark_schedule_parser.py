@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Benchmark für den Basketball Schedule Parser
+Erzeugt synthetische sportView-Spielplanseiten (10 bis 5.000 Spiele) und misst
+Parse-Durchsatz, Speicherbedarf und den HTTP-Service unter Last - komplett lokal,
+ohne Netzwerkzugriff auf basketball-bund.net.
+
+Verwendung:
+    python benchmark_schedule_parser.py                      # Parser-Benchmark (Standard-Größen)
+    python benchmark_schedule_parser.py --sizes 10 500 5000  # eigene Größen
+    python benchmark_schedule_parser.py --server             # zusätzlich Lasttest gegen den HTTP-Service
+    python benchmark_schedule_parser.py --server --json results.json
+
+Datum: Oktober 2025
+"""
+
+import json
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+import http.client
+import urllib.parse
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Tuple
+
+from basketball_schedule_parser import (
+    ScheduleParserService,
+    ScheduleHTTPServer,
+    ScheduleHTTPHandler,
+    UpstreamClient,
+)
+
+DEFAULT_SIZES = [10, 100, 500, 1000, 5000]
+
+# Teamnamen mit Umlauten, ß und Leerzeichen wie auf basketball-bund.net
+TEAM_NAMES = [
+    "DJK Neustadt a. d. Waldnaab", "Regensburg Baskets", "TSV 1880 Schwandorf", "TV Fürth 1860",
+    "SG Weißenburg/Gunzenhausen", "BBC Bayreuth", "TuS Groß-Umstadt", "Münchner Basketball Akademie",
+    "Würzburg Baskets Akademie", "ESV Flügelrad Nürnberg", "Post SV Nürnberg", "TSV Kösching",
+]
+VENUES = ["Gymnasium", "Dreifachturnhalle Süd", "Sporthalle am Schloßpark", "Mehrzweckhalle", ""]
+REFEREES = ["Müller, J.", "Schön / Weiß", "Özdemir, A.", "Übel, K."]
+
+PAGE_HEADER = """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
+<html><head><title>Spielplan</title>
+<script type="text/javascript">var rows = "<tr><td>1234</td></tr>";</script>
+<style>td.sportItemEven {{ background: #eee; }}</style>
+</head><body>
+<table id="SpielplanList0" class="sportView" cellspacing="1" cellpadding="0" border="0" width="100%">
+<tr><td><table width="100%"><tr>
+<td align="left" valign="top" class="sportViewTitle">{title}</td>
+<td width="10" align="right" valign="top" class="sportViewTitle"><nobr>&nbsp;</nobr></td>
+</tr></table></td></tr>
+</table>
+<!-- this code has been generated from <header> custom tag (twlist.tld) -->
+<table width="100%" style="clear: left" cellpadding="0" cellspacing="1" border="0" class="sportView"><tr>
+"""
+HEADER_CELL = ('<td class="sportViewDivItem" width="90px"><table cellspacing="0" cellpadding="0" height="100%">'
+               '<tr><td class="sportViewHeader">{label}&nbsp;</td></tr></table></td>\n')
+PAGE_FOOTER = "</table>\n</body></html>\n"
+
+
+def generate_schedule_html(games: int, seed: int = 42) -> Tuple[str, List[Dict]]:
+    """
+    Erzeugt eine realistische sportView-Spielplanseite
+
+    Enthalten sind Umlaute, &nbsp;-Auffüllung, fehlende Schiedsrichter-Zellen,
+    Kommentare/Skripte sowie Nicht-Spielzeilen (Spieltag-Trenner, spielfrei, Leerzeilen).
+
+    Args:
+        games: Anzahl der Spielzeilen
+        seed: Seed für reproduzierbare Seiten
+
+    Returns:
+        Tuple aus HTML und den erwarteten Spielen (game_number, home_team, away_team, referee)
+    """
+    rng = random.Random(seed)
+    teams = [f"{name} {rng.randint(1, 3)}" for name in TEAM_NAMES]
+    kickoff = datetime(2025, 9, 27, 10, 0)
+
+    parts = [PAGE_HEADER.format(title=f"Spielplan - Benchmark Bezirksliga ({games} Spiele; Liganr.: 9999)")]
+    parts.extend(HEADER_CELL.format(label=label)
+                 for label in ("Nr.", "Tag", "Datum", "Heim", "Gast", "Spielhalle", "Schiedsrichter"))
+    parts.append("</tr>\n")
+
+    expected = []
+    for index in range(games):
+        game_day = index // 6 + 1
+        if index % 6 == 0:
+            # Nicht-Spielzeilen: Spieltag-Trenner, gelegentlich spielfrei und Leerzeilen
+            parts.append(f'<tr><td class="sportViewDivItem" colspan="7"><b>{game_day}. Spieltag</b></td></tr>\n')
+            if game_day % 4 == 0:
+                parts.append(f'<tr><td class="sportItemOdd">&nbsp;</td><td class="sportItemOdd">{game_day}</td>'
+                             f'<td class="sportItemOdd">spielfrei</td><td class="sportItemOdd">{teams[0]}</td>'
+                             f'<td class="sportItemOdd">&nbsp;</td><td class="sportItemOdd">&nbsp;</td></tr>\n')
+            if game_day % 7 == 0:
+                parts.append('<tr><td colspan="7">&nbsp;</td></tr>\n<!-- <tr><td>9999</td></tr> -->\n')
+            kickoff += timedelta(days=7)
+
+        home, away = rng.sample(teams, 2)
+        start = kickoff + timedelta(hours=2 * (index % 6))
+        game_number = str(1000 + index)
+        css = "sportItemEven" if index % 2 == 0 else "sportItemOdd"
+        venue = rng.choice(VENUES)
+        has_referee_cell = index % 4 != 3
+        referee = rng.choice(REFEREES) if has_referee_cell and index % 3 == 0 else ""
+
+        cells = [
+            f'<td class="{css}" align="center"><NOBR>&nbsp;{game_number}&nbsp;</NOBR></td>',
+            f'<td class="{css}" align="center"><NOBR>{game_day}</NOBR></td>',
+            f'<td class="{css}"><NOBR>&nbsp;{start:%d.%m.%Y %H:%M}&nbsp;</NOBR></td>',
+            f'<td class="{css}"><div style="padding-left: 2px; padding-right: 2px;">{home.replace(" ", "&nbsp;", 1)}</div></td>',
+            f'<td class="{css}"><div style="padding-left: 2px; padding-right: 2px;">{away}</div></td>',
+            f'<td class="{css}">{venue or "&nbsp;"}</td>',
+        ]
+        if has_referee_cell:
+            cells.append(f'<td class="{css}">{referee or "&nbsp;"}</td>')
+        parts.append("<tr>\n\t" + "\n\t".join(cells) + "\n</tr>\n")
+
+        expected.append({"game_number": game_number, "home_team": home, "away_team": away, "referee": referee})
+
+    parts.append(PAGE_FOOTER)
+    return "".join(parts), expected
+
+
+def verify_parse(service: ScheduleParserService, html_content: str, expected: List[Dict]):
+    """Prüft, dass der Parser genau die erwarteten Spiele liefert (sonst sind Messwerte wertlos)"""
+    result = service.parse_schedule_from_html(html_content)
+    assert result["games_count"] == len(expected), \
+        f"{result['games_count']} statt {len(expected)} Spielen geparst"
+    for game, want in zip(result["games"], expected):
+        for field, value in want.items():
+            # &nbsp; innerhalb eines Namens bleibt (wie früher mit BeautifulSoup) als \xa0 erhalten
+            parsed = ' '.join(game[field].split())
+            assert parsed == value, f"Spiel {want['game_number']}: {field}={game[field]!r} statt {value!r}"
+
+
+def bench_parse(sizes: List[int], repeat: int = 5) -> List[Dict]:
+    """
+    Misst Durchsatz und Speicherbedarf von parse_schedule_from_html
+
+    Args:
+        sizes: Anzahl der Spiele pro generierter Seite
+        repeat: Anzahl der Messungen (bester Wert zählt)
+
+    Returns:
+        Liste mit Messergebnissen pro Größe
+    """
+    service = ScheduleParserService()
+    results = []
+
+    print(f"📊 Parser-Benchmark (bester von {repeat} Läufen)")
+    print(f"   {'Spiele':>7} {'HTML':>9} {'ms/Seite':>10} {'µs/Spiel':>10} {'Spiele/s':>11} {'Peak-RAM':>10}")
+
+    for size in sizes:
+        html_content, expected = generate_schedule_html(size)
+        verify_parse(service, html_content, expected)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            service.parse_schedule_from_html(html_content)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+
+        # Speicher separat messen - tracemalloc verfälscht die Laufzeit
+        tracemalloc.start()
+        service.parse_schedule_from_html(html_content)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        row = {
+            "games": size,
+            "html_bytes": len(html_content.encode("utf-8")),
+            "best_ms": best * 1000,
+            "median_ms": statistics.median(timings) * 1000,
+            "us_per_game": best * 1_000_000 / size,
+            "games_per_second": size / best,
+            "peak_memory_bytes": peak_bytes,
+        }
+        results.append(row)
+        print(f"   {size:>7} {row['html_bytes'] / 1024:>7.1f}KB {row['best_ms']:>10.2f} "
+              f"{row['us_per_game']:>10.2f} {row['games_per_second']:>11,.0f} {peak_bytes / 1024:>8.1f}KB")
+
+    return results
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """Liefert generierte Spielplanseiten: /spielplan?games=N (optional mit künstlicher Latenz)"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    pages: Dict[int, bytes] = {}
+    latency = 0.0
+
+    def do_GET(self):
+        query_params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        games = int(query_params.get('games', ['100'])[0])
+        body = self.pages.get(games)
+        if body is None:
+            body = self.pages.setdefault(games, generate_schedule_html(games)[0].encode('utf-8'))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietScheduleHTTPHandler(ScheduleHTTPHandler):
+    """Service-Handler ohne Request-Log (die Ausgabe würde die Messung dominieren)"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_in_thread(server) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_load(host: str, port: int, path: str, requests: int, concurrency: int) -> Dict:
+    """
+    Lastgenerator: concurrency Threads mit je einer Keep-Alive Verbindung
+
+    Returns:
+        Durchsatz, Latenz-Perzentile und Status-Codes
+    """
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        local_latencies, local_statuses = [], {}
+        for _ in iter(lambda: next(counter, None), None):
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=60)
+                status = 0
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "requests_per_second": requests / duration,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def bench_server(games: int = 500, requests: int = 500, concurrency: int = 8,
+                 upstream_latency: float = 0.0) -> List[Dict]:
+    """
+    Lasttest gegen den HTTP-Service mit lokalem Stub-Upstream
+
+    Zwei Szenarien: mit Ergebnis-Cache (typischer Betrieb) und ohne Cache
+    (jeder Request lädt und parst neu - misst den Fetch- und Parse-Pfad).
+
+    Args:
+        games: Anzahl der Spiele auf der Stub-Seite
+        requests: Anzahl der Requests pro Szenario
+        concurrency: Anzahl paralleler Clients
+        upstream_latency: Künstliche Antwortzeit des Stub-Upstreams in Sekunden
+    """
+    StubUpstreamHandler.latency = upstream_latency
+    upstream = ThreadingHTTPServer(('127.0.0.1', 0), StubUpstreamHandler)
+    upstream.daemon_threads = True
+    _start_in_thread(upstream)
+    target_url = f"http://127.0.0.1:{upstream.server_address[1]}/spielplan?games={games}"
+
+    print(f"")
+    print(f"🌐 Server-Lasttest ({games} Spiele, {requests} Requests, {concurrency} Clients, "
+          f"Upstream-Latenz {upstream_latency * 1000:.0f}ms)")
+
+    results = []
+    for scenario, cache_ttl in (("cache", 300), ("no-cache", 0)):
+        server = ScheduleHTTPServer(('127.0.0.1', 0), QuietScheduleHTTPHandler, cache_ttl=cache_ttl,
+                                    upstream=UpstreamClient())
+        _start_in_thread(server)
+        host, port = server.server_address[:2]
+        path = f"/parse?url={urllib.parse.quote(target_url, safe='')}"
+
+        # Aufwärmen: Verbindungen aufbauen, Cache füllen
+        run_load(host, port, path, concurrency, concurrency)
+        row = {"scenario": scenario, "games": games, **run_load(host, port, path, requests, concurrency)}
+        results.append(row)
+
+        server.shutdown()
+        server.server_close()
+        server.parser_service.upstream.close()
+
+        print(f"   {scenario:<9} {row['requests_per_second']:>8.1f} req/s   p50 {row['p50_ms']:>7.2f}ms   "
+              f"p95 {row['p95_ms']:>7.2f}ms   p99 {row['p99_ms']:>7.2f}ms   Status {row['statuses']}")
+
+    upstream.shutdown()
+    upstream.server_close()
+    return results
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark for the Basketball Schedule Parser')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f'Games per generated page (default: {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--repeat', type=int, default=5, help='Parse runs per size, best counts (default: 5)')
+    parser.add_argument('--server', action='store_true', help='Also load-test the HTTP service against a stub upstream')
+    parser.add_argument('--games', type=int, default=500, help='Games on the stub upstream page (default: 500)')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per load-test scenario (default: 500)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel load-test clients (default: 8)')
+    parser.add_argument('--upstream-latency', type=float, default=0.0,
+                        help='Artificial stub upstream latency in seconds (default: 0)')
+    parser.add_argument('--dump-html', type=int, metavar='GAMES',
+                        help='Print a generated page with GAMES games and exit')
+    parser.add_argument('--json', metavar='FILE', help='Write all results as JSON (for comparing runs)')
+
+    args = parser.parse_args()
+
+    if args.dump_html:
+        print(generate_schedule_html(args.dump_html)[0])
+        return
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "parse": bench_parse(args.sizes, args.repeat),
+    }
+    if args.server:
+        report["server"] = bench_server(args.games, args.requests, args.concurrency, args.upstream_latency)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"")
+        print(f"💾 Ergebnisse gespeichert: {args.json}")
+
+
+if __name__ == "__main__":
+    main()